@@ -0,0 +1,86 @@
+"""Compare ranking engines on synthetic catalogs.
+
+    python -m benchmarks.bench_scoring --sizes 1000 100000 1000000
+"""
+import argparse
+import random
+import statistics
+import time
+from typing import Dict, List
+
+from mcp_tools.job_catalog import JobCatalog
+from mcp_tools.ranking import ENGINES, get_engine
+
+def _synthetic_catalog(size: int, vocab: List[str], skills_per_job: int, rng: random.Random) -> JobCatalog:
+    return JobCatalog.from_jobs(
+        {
+            "id": f"job-{i}",
+            "title": f"Engineer {i}",
+            "skills": rng.sample(vocab, skills_per_job),
+            "location": "Remote",
+            "description": "",
+        }
+        for i in range(size)
+    )
+
+def _rank_sets(catalog: JobCatalog, job_skills: List[List[str]], skills: List[str], top_k: int):
+    # The original per-request path: build both sets for every job, intersect.
+    scored = []
+    for posting_id, skill_list in enumerate(job_skills):
+        job_set = {s.strip().lower() for s in skill_list}
+        user_set = {s.strip().lower() for s in skills}
+        score = len(job_set.intersection(user_set))
+        if score > 0:
+            scored.append((posting_id, score))
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return scored[:top_k]
+
+def _time_queries(fn, queries, top_k: int) -> Dict[str, float]:
+    latencies = []
+    for skills in queries:
+        started = time.perf_counter()
+        fn(skills, top_k)
+        latencies.append(time.perf_counter() - started)
+    return {
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p95_ms": sorted(latencies)[int(0.95 * (len(latencies) - 1))] * 1000,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000, 1_000_000])
+    parser.add_argument("--vocab", type=int, default=2000, help="distinct skills in the catalog")
+    parser.add_argument("--skills-per-job", type=int, default=8)
+    parser.add_argument("--skills-per-query", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    # semantic needs a vectors model and embeds every synthetic posting.
+    parser.add_argument("--engines", nargs="+", default=[n for n in ENGINES if n != "semantic"])
+    args = parser.parse_args()
+    engines = {name: get_engine(name) for name in args.engines}
+
+    rng = random.Random(args.seed)
+    vocab = [f"skill-{i}" for i in range(args.vocab)]
+    queries = [rng.sample(vocab, args.skills_per_query) for _ in range(args.queries)]
+
+    print(f"{'postings':>10} {'engine':>8} {'mean ms':>10} {'p95 ms':>10}")
+    for size in args.sizes:
+        catalog = _synthetic_catalog(size, vocab, args.skills_per_job, rng)
+        job_skills = [catalog.posting(p)["skills"] for p in range(len(catalog))]
+        for rank in engines.values():
+            rank(catalog, queries[0], args.top_k)  # build derived structures outside the timing
+
+        runners = {
+            "sets": lambda s, k: _rank_sets(catalog, job_skills, s, k),
+            **{
+                name: (lambda s, k, rank=rank: rank(catalog, s, k))
+                for name, rank in engines.items()
+            },
+        }
+        for name, run in runners.items():
+            timing = _time_queries(run, queries, args.top_k)
+            print(f"{size:>10} {name:>8} {timing['mean_ms']:>10.3f} {timing['p95_ms']:>10.3f}")
+
+if __name__ == "__main__":
+    main()
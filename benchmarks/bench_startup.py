@@ -0,0 +1,74 @@
+"""Measure cold import time of the entry-point modules in fresh interpreters.
+
+    python -m benchmarks.bench_startup --runs 5 --max-seconds 1.5
+
+Exits non-zero when any module's median import time exceeds --max-seconds,
+so an import-latency regression (e.g. an eager spacy.load) fails loudly.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import List
+
+MODULES = [
+    "mcp_tools.resume_parser",
+    "mcp_tools.job_recommender",
+    "mcp_tools.server",
+    "web.main",
+]
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _import_seconds(module: str) -> float:
+    code = (
+        "import time; started = time.perf_counter(); "
+        f"import {module}; "
+        "print(time.perf_counter() - started)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=_ROOT, check=True, capture_output=True, text=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+def _model_load_seconds() -> float:
+    code = (
+        "import time; from mcp_tools.resume_parser import get_nlp; "
+        "started = time.perf_counter(); get_nlp(); "
+        "print(time.perf_counter() - started)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=_ROOT, check=True, capture_output=True, text=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument("--max-seconds", type=float, default=None)
+    parser.add_argument("--model-load", action="store_true", help="also time the first get_nlp() call")
+    args = parser.parse_args()
+
+    failed: List[str] = []
+    print(f"{'module':<28} {'median s':>9} {'max s':>9}")
+    for module in args.modules:
+        samples = [_import_seconds(module) for _ in range(args.runs)]
+        median = statistics.median(samples)
+        print(f"{module:<28} {median:>9.3f} {max(samples):>9.3f}")
+        if args.max_seconds is not None and median > args.max_seconds:
+            failed.append(module)
+
+    if args.model_load:
+        samples = [_model_load_seconds() for _ in range(args.runs)]
+        print(f"{'get_nlp() first call':<28} {statistics.median(samples):>9.3f} {max(samples):>9.3f}")
+
+    if failed:
+        print(f"import time above {args.max_seconds}s: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Deterministic synthetic job catalogs and resumes for benchmarking.
+
+    python -m benchmarks.corpus jobs --size 100000 --out /tmp/bench/jobs_db
+    python -m benchmarks.corpus resumes --count 50 --out /tmp/bench/resumes
+
+The same --seed always produces byte-identical files, so timings from
+different commits are measured on the same data.
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from mcp_tools.resume_parser import DEFAULT_SKILL_ALIASES, DEFAULT_SKILLS_DB
+
+LOCATIONS = [
+    "Remote", "Bangalore", "Pune", "Chennai", "Hyderabad", "Mumbai",
+    "Delhi NCR", "Remote / Flexible", "Berlin", "London", "New York",
+]
+TITLE_LEVELS = ["Junior", "", "Senior", "Lead", "Staff"]
+TITLE_ROLES = [
+    "Software Engineer", "Data Analyst", "Backend Developer", "Frontend Developer",
+    "DevOps Engineer", "ML Engineer", "Data Engineer", "Full Stack Developer",
+]
+FILLER = (
+    "worked closely with product and design teams to deliver features on time "
+    "improved reliability of internal services and reduced operational toil "
+    "mentored new hires and reviewed code across several repositories "
+    "owned the roadmap for reporting dashboards used by the business"
+).split()
+
+def skill_vocabulary(size: int) -> List[str]:
+    """The default skills first, then a synthetic long tail up to ``size``."""
+    return list(DEFAULT_SKILLS_DB) + [f"skill-{i}" for i in range(max(0, size - len(DEFAULT_SKILLS_DB)))]
+
+def _zipf_weights(n: int) -> List[float]:
+    # A few skills appear everywhere, most are rare, like real postings.
+    return [1.0 / (rank + 1) for rank in range(n)]
+
+def generate_jobs(count: int, seed: int = 0, vocab_size: int = 5000) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    vocab = skill_vocabulary(vocab_size)
+    weights = _zipf_weights(len(vocab))
+    for i in range(count):
+        skills = list(dict.fromkeys(rng.choices(vocab, weights=weights, k=rng.randint(3, 12))))
+        location = rng.choice(LOCATIONS)
+        title = " ".join(filter(None, [rng.choice(TITLE_LEVELS), rng.choice(TITLE_ROLES)]))
+        yield {
+            "id": f"job-{i}",
+            "title": title,
+            "skills": skills,
+            "location": location,
+            "remote": location.startswith("Remote") or rng.random() < 0.1,
+            "description": " ".join(rng.choices(FILLER, k=rng.randint(10, 40))),
+        }
+
+def write_jobs_db(
+    out_dir: str,
+    count: int,
+    seed: int = 0,
+    vocab_size: int = 5000,
+    shard_size: int = 100_000,
+    compress: bool = False,
+) -> List[str]:
+    """Write ``count`` postings as JSONL shards of ``shard_size`` lines."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths: List[str] = []
+    f = None
+    try:
+        for i, job in enumerate(generate_jobs(count, seed, vocab_size)):
+            if i % shard_size == 0:
+                if f is not None:
+                    f.close()
+                name = f"jobs-{i // shard_size:05d}.jsonl" + (".gz" if compress else "")
+                paths.append(os.path.join(out_dir, name))
+                # mtime=0 keeps gzip output identical between runs.
+                f = (
+                    gzip.GzipFile(paths[-1], "wb", mtime=0) if compress
+                    else open(paths[-1], "wb")
+                )
+            f.write(json.dumps(job, separators=(",", ":")).encode("utf-8") + b"\n")
+    finally:
+        if f is not None:
+            f.close()
+    return paths
+
+def generate_resume_lines(rng: random.Random, lines: int) -> List[str]:
+    """A resume of roughly ``lines`` lines with contacts and known skills."""
+    vocab = list(DEFAULT_SKILLS_DB) + list(DEFAULT_SKILL_ALIASES)
+    name = f"Candidate {rng.randint(1000, 9999)}"
+    out = [
+        name,
+        f"{name.lower().replace(' ', '.')}@example.com  +91 98{rng.randint(10000000, 99999999)}",
+        "Skills: " + ", ".join(rng.sample(vocab, rng.randint(3, 10))),
+    ]
+    while len(out) < lines:
+        words = rng.choices(FILLER, k=rng.randint(8, 14))
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words)), rng.choice(vocab))
+        out.append(" ".join(words).capitalize() + ".")
+    return out
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def make_pdf(lines: Sequence[str], lines_per_page: int = 50) -> bytes:
+    """A minimal text PDF (Helvetica, one content stream per page)."""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    font_id = 3 + 2 * len(pages)
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [{}] /Count {} >>".format(
+            " ".join(f"{3 + 2 * i} 0 R" for i in range(len(pages))), len(pages)
+        ),
+    ]
+    for i, page in enumerate(pages):
+        content = "BT /F1 10 Tf 50 770 Td 14 TL " + " ".join(
+            f"({_pdf_escape(line)}) '" for line in page
+        ) + " ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(content.encode('latin-1'))} >>\nstream\n{content}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+def generate_resumes(
+    count: int, seed: int = 0, lengths: Sequence[int] = (20, 80, 300)
+) -> Iterator[Tuple[str, int, List[str]]]:
+    """``(name, length, lines)`` for ``count`` resumes cycling through ``lengths``."""
+    rng = random.Random(seed)
+    for i in range(count):
+        length = lengths[i % len(lengths)]
+        yield f"resume-{i:04d}-{length}", length, generate_resume_lines(rng, length)
+
+def write_resumes(
+    out_dir: str,
+    count: int,
+    seed: int = 0,
+    lengths: Sequence[int] = (20, 80, 300),
+    formats: Sequence[str] = ("txt", "pdf"),
+) -> List[str]:
+    os.makedirs(out_dir, exist_ok=True)
+    paths: List[str] = []
+    for name, _, lines in generate_resumes(count, seed, lengths):
+        if "txt" in formats:
+            paths.append(os.path.join(out_dir, name + ".txt"))
+            with open(paths[-1], "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        if "pdf" in formats:
+            paths.append(os.path.join(out_dir, name + ".pdf"))
+            with open(paths[-1], "wb") as f:
+                f.write(make_pdf(lines))
+    return paths
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    jobs = commands.add_parser("jobs", help="write a synthetic jobs_db of JSONL shards")
+    jobs.add_argument("--size", type=int, default=100_000)
+    jobs.add_argument("--vocab", type=int, default=5000, help="distinct skills")
+    jobs.add_argument("--shard-size", type=int, default=100_000)
+    jobs.add_argument("--gzip", action="store_true")
+    resumes = commands.add_parser("resumes", help="write synthetic text and PDF resumes")
+    resumes.add_argument("--count", type=int, default=30)
+    resumes.add_argument("--lengths", type=int, nargs="+", default=[20, 80, 300], help="lines per resume")
+    resumes.add_argument("--formats", nargs="+", default=["txt", "pdf"], choices=["txt", "pdf"])
+    for sub in (jobs, resumes):
+        sub.add_argument("--out", required=True)
+        sub.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "jobs":
+        paths = write_jobs_db(args.out, args.size, args.seed, args.vocab, args.shard_size, args.gzip)
+        print(f"Wrote {args.size} postings in {len(paths)} shard(s) to {args.out}")
+    else:
+        paths = write_resumes(args.out, args.count, args.seed, args.lengths, args.formats)
+        print(f"Wrote {len(paths)} resume file(s) to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Compare the PDF backends' speed and text yield on a corpus of PDFs.
+
+    python -m benchmarks.pdf_backends --corpus ~/resumes --output pdf-backends.json
+    python -m benchmarks.pdf_backends --backends pypdf2 pdftotext
+
+Every installed backend (or those given) extracts every PDF under --corpus
+(synthetic resumes when omitted). Per backend it reports failures, time per
+document and per page, characters extracted, and the skills found in the
+text compared with all backends together on each document, which is the yield
+that matters for matching. Use it to choose the PDF_BACKENDS order.
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+from benchmarks.corpus import generate_resumes, make_pdf
+from benchmarks.suite import _percentile
+from mcp_tools.pdf_backends import BACKENDS, available_backends
+from mcp_tools.resume_parser import _extract_skills
+
+def load_corpus(directory: str) -> List[Tuple[str, bytes]]:
+    paths = sorted(glob.glob(os.path.join(directory, "**", "*.pdf"), recursive=True))
+    documents = []
+    for path in paths:
+        with open(path, "rb") as f:
+            documents.append((os.path.relpath(path, directory), f.read()))
+    return documents
+
+def synthetic_corpus(count: int, seed: int) -> List[Tuple[str, bytes]]:
+    return [(name + ".pdf", make_pdf(lines)) for name, _, lines in generate_resumes(count, seed)]
+
+def extract(name: str, data: bytes, max_pages: int) -> Tuple[str, int]:
+    """All text of ``data`` with one backend (no fallback) and its page count."""
+    document = BACKENDS[name][1](data)
+    try:
+        pages = document.page_count if max_pages <= 0 else min(document.page_count, max_pages)
+        return "\n".join(document.extract(0, pages)), pages
+    finally:
+        document.close()
+
+def run_backend(
+    name: str, documents: Sequence[Tuple[str, bytes]], max_pages: int
+) -> Dict[str, Dict[str, Any]]:
+    per_document: Dict[str, Dict[str, Any]] = {}
+    for path, data in documents:
+        started = time.perf_counter()
+        try:
+            text, pages = extract(name, data, max_pages)
+        except Exception as e:
+            per_document[path] = {"error": f"{type(e).__name__}: {e}"}
+            continue
+        per_document[path] = {
+            "seconds": time.perf_counter() - started,
+            "pages": pages,
+            "chars": len(text),
+            "skills": set(_extract_skills(text)),
+        }
+    return per_document
+
+def summarize(
+    runs: Dict[str, Dict[str, Dict[str, Any]]], documents: Sequence[Tuple[str, bytes]]
+) -> Dict[str, Any]:
+    # A document's reference skill set is the union over backends, so the
+    # yield says how much of what could be found each backend found.
+    reference = {
+        path: set().union(*(r[path].get("skills", set()) for r in runs.values()))
+        for path, _ in documents
+    }
+    summary: Dict[str, Any] = {}
+    for name, per_document in runs.items():
+        ok = [(path, r) for path, r in per_document.items() if "error" not in r]
+        latencies = sorted(r["seconds"] for _, r in ok)
+        pages = sum(r["pages"] for _, r in ok)
+        seconds = sum(latencies)
+        # Failed documents count as zero yield.
+        yields = [
+            0.0 if "error" in r else len(r["skills"]) / len(reference[path])
+            for path, r in per_document.items() if reference[path]
+        ]
+        summary[name] = {
+            "documents": len(per_document),
+            "failures": len(per_document) - len(ok),
+            "errors": sorted({r["error"] for r in per_document.values() if "error" in r})[:5],
+            "seconds": seconds,
+            "p50_ms": _percentile(latencies, 0.50) * 1000 if latencies else None,
+            "p90_ms": _percentile(latencies, 0.90) * 1000 if latencies else None,
+            "ms_per_page": seconds / pages * 1000 if pages else None,
+            "chars": sum(r["chars"] for _, r in ok),
+            "skill_yield": statistics.fmean(yields) if yields else None,
+        }
+    return summary
+
+def _fmt(value: Any, spec: str) -> str:
+    return "-" if value is None else format(value, spec)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="directory searched recursively for *.pdf")
+    parser.add_argument("--synthetic", type=int, default=30, help="resumes to generate without --corpus")
+    parser.add_argument("--backends", nargs="+", help="default: every installed backend")
+    parser.add_argument("--max-pages", type=int, default=int(os.getenv("PDF_MAX_PAGES", "100")))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the summary as JSON")
+    args = parser.parse_args()
+
+    names = available_backends(args.backends or list(BACKENDS))
+    missing = sorted(set(args.backends or ()) - set(names))
+    if missing:
+        print(f"Not installed, skipped: {', '.join(missing)}", file=sys.stderr)
+    if not names:
+        sys.exit("No PDF backend is installed")
+    documents = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.synthetic, args.seed)
+    if not documents:
+        sys.exit(f"No PDFs found under {args.corpus}")
+
+    runs = {name: run_backend(name, documents, args.max_pages) for name in names}
+    summary = summarize(runs, documents)
+    print(
+        f"{'backend':<10} {'docs':>5} {'failed':>6} {'p50 ms':>9} {'p90 ms':>9} "
+        f"{'ms/page':>8} {'chars':>10} {'skill yield':>11}"
+    )
+    for name, stats in summary.items():
+        print(
+            f"{name:<10} {stats['documents']:>5} {stats['failures']:>6} "
+            f"{_fmt(stats['p50_ms'], '>9.2f')} {_fmt(stats['p90_ms'], '>9.2f')} "
+            f"{_fmt(stats['ms_per_page'], '>8.2f')} {stats['chars']:>10} "
+            f"{_fmt(stats['skill_yield'], '>11.1%')}"
+        )
+        for error in stats["errors"]:
+            print(f"    {error}", file=sys.stderr)
+
+    if args.output:
+        report = {
+            "corpus": args.corpus or f"synthetic:{args.synthetic}:{args.seed}",
+            "documents": len(documents),
+            "max_pages": args.max_pages,
+            "created_at": time.time(),
+            "backends": summary,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Benchmark the pipeline stages on a synthetic corpus and save the results.
+
+    python -m benchmarks.suite --sizes 1000 100000 --output bench.json
+    python -m benchmarks.suite --output new.json --compare bench.json
+
+Each stage reports throughput, latency percentiles and the peak Python heap
+(tracemalloc) of a separate, smaller run. The JSON output carries the git
+commit and parameters; --compare prints the change per stage against an
+earlier file and exits non-zero when a stage got slower than --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Every parse should do the full work, not hit the parse cache.
+os.environ.setdefault("RESUME_CACHE_SIZE", "0")
+
+from benchmarks.corpus import generate_resumes, make_pdf, skill_vocabulary, write_jobs_db
+from mcp_tools.jobs_db import load_catalog
+from mcp_tools.ranking import ENGINES
+from mcp_tools.resume_parser import _extract_skills, parse_resume_bytes
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * (len(sorted_values) - 1) + 0.5))]
+
+def _peak_bytes(fn: Callable[[Any], Any], items: Sequence[Any]) -> int:
+    tracemalloc.start()
+    try:
+        for item in items:
+            fn(item)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def measure(
+    fn: Callable[[Any], Any], items: Sequence[Any], memory_items: int = 5, warmup: bool = True
+) -> Dict[str, Any]:
+    """Time ``fn`` over ``items`` one call at a time.
+
+    An untimed first call (``warmup``) keeps one-off costs such as model
+    loading or lazily built indexes out of the percentiles.
+    """
+    if warmup and items:
+        fn(items[0])
+    latencies: List[float] = []
+    started = time.perf_counter()
+    for item in items:
+        t = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - t)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "ops": len(items),
+        "seconds": elapsed,
+        "ops_per_second": len(items) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p90_ms": _percentile(latencies, 0.90) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "peak_bytes": _peak_bytes(fn, items[:memory_items]),
+    }
+
+def _run_stage(results: Dict[str, Any], name: str, run: Callable[[], Dict[str, Any]]) -> None:
+    try:
+        results[name] = run()
+    except Exception as e:  # e.g. no spaCy model installed; keep the other stages
+        results[name] = {"error": f"{type(e).__name__}: {e}"}
+    stats = results[name]
+    if "error" in stats:
+        print(f"{name:<34} ERROR {stats['error']}", file=sys.stderr)
+    else:
+        print(
+            f"{name:<34} {stats['ops_per_second']:>10.1f}/s "
+            f"p50 {stats['p50_ms']:>8.3f}ms p99 {stats['p99_ms']:>8.3f}ms "
+            f"peak {stats['peak_bytes'] / 1e6:>7.2f}MB"
+        )
+
+def catalog_stages(args: argparse.Namespace, results: Dict[str, Any], size: int) -> None:
+    with tempfile.TemporaryDirectory(prefix="bench-jobs-") as db_dir:
+        write_jobs_db(db_dir, size, seed=args.seed, vocab_size=args.vocab)
+
+        def load(_: Any) -> None:
+            load_catalog(db_dir, workers=args.load_workers)
+
+        _run_stage(
+            results,
+            f"catalog_load[{size}]",
+            lambda: measure(load, [None] * args.load_runs, memory_items=1, warmup=False),
+        )
+        catalog = load_catalog(db_dir, workers=args.load_workers)
+
+    rng = random.Random(args.seed)
+    vocab = skill_vocabulary(args.vocab)
+    queries = [rng.sample(vocab[:500], args.skills_per_query) for _ in range(args.queries)]
+    for name in args.engines:
+        rank = ENGINES[name]
+        _run_stage(
+            results,
+            f"recommend[{name}][{size}]",
+            lambda: measure(lambda q: rank(catalog, q, args.top_k), queries),
+        )
+
+def resume_stages(args: argparse.Namespace, results: Dict[str, Any]) -> None:
+    resumes = list(generate_resumes(args.resumes, seed=args.seed, lengths=args.resume_lengths))
+    for length in args.resume_lengths:
+        texts = ["\n".join(lines) for _, n, lines in resumes if n == length]
+        pdfs = [make_pdf(lines) for _, n, lines in resumes if n == length]
+        _run_stage(results, f"extract_skills[{length} lines]", lambda: measure(_extract_skills, texts))
+        _run_stage(
+            results,
+            f"parse_resume_txt[{length} lines]",
+            lambda: measure(lambda t: parse_resume_bytes(t.encode("utf-8"), ".txt"), texts),
+        )
+        _run_stage(
+            results,
+            f"parse_resume_pdf[{length} lines]",
+            lambda: measure(lambda data: parse_resume_bytes(data, ".pdf"), pdfs),
+        )
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=_ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> bool:
+    """Print per-stage changes; True when any stage regressed past ``threshold``."""
+    regressed = False
+    print(f"\n{'stage':<34} {'base p50':>10} {'new p50':>10} {'change':>8}")
+    for name, stats in current["stages"].items():
+        base = baseline.get("stages", {}).get(name)
+        if not base or "error" in base or "error" in stats:
+            continue
+        change = stats["p50_ms"] / base["p50_ms"] - 1 if base["p50_ms"] else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(f"{name:<34} {base['p50_ms']:>10.3f} {stats['p50_ms']:>10.3f} {change:>+7.1%}{flag}")
+    return regressed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--vocab", type=int, default=5000)
+    parser.add_argument("--engines", nargs="+", default=[n for n in ENGINES if n != "semantic"])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--skills-per-query", type=int, default=8)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--load-runs", type=int, default=3)
+    parser.add_argument("--load-workers", type=int, default=1)
+    parser.add_argument("--resumes", type=int, default=60)
+    parser.add_argument("--resume-lengths", type=int, nargs="+", default=[20, 80, 300])
+    parser.add_argument("--skip-resumes", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench-results.json")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed p50 slowdown, e.g. 0.10")
+    args = parser.parse_args()
+
+    stages: Dict[str, Any] = {}
+    for size in args.sizes:
+        catalog_stages(args, stages, size)
+    if not args.skip_resumes:
+        resume_stages(args, stages)
+
+    report = {
+        "commit": _git_commit(),
+        "created_at": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        # ru_maxrss is KiB on Linux.
+        "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        "stages": stages,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional
+
+from .job_recommender import recommend_jobs
+from .metrics import record_timings, timed_call
+from .resume_parser import cache_parse, get_cached_parse, parse_resume_bytes_batch
+
+logger = logging.getLogger(__name__)
+
+class QueueFull(Exception):
+    pass
+
+class AnalysisQueue:
+    """In-process queue of resume analyses drained by a pool of worker threads.
+
+    Each worker takes up to ``batch_size`` queued resumes at once and parses
+    them with one ``parse_resume_bytes_batch`` call on ``executor`` (so one
+    ``nlp.pipe`` pass), then ranks jobs for each. Finished jobs are kept for
+    polling until ``max_results`` newer ones push them out.
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        workers: int = 2,
+        batch_size: int = 8,
+        max_pending: int = 256,
+        max_results: int = 1024,
+        top_k: int = 5,
+    ) -> None:
+        self.executor = executor
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_results = max_results
+        self.top_k = top_k
+        self._queue: "queue.Queue[str]" = queue.Queue(maxsize=max_pending)
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._payloads: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._started_at = time.monotonic()
+        self._busy_seconds = 0.0
+        self._waits: deque = deque(maxlen=1000)
+        self._counters = {"submitted": 0, "completed": 0, "failed": 0, "batches": 0}
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._started_at = time.monotonic()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"analysis-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+    def submit(self, data: bytes, ext: str, file_name: Optional[str] = None) -> str:
+        job_id = uuid.uuid4().hex
+        job = {"id": job_id, "status": "queued", "file_name": file_name, "submitted_at": time.time()}
+        with self._lock:
+            self._jobs[job_id] = job
+            self._payloads[job_id] = (data, ext, file_name)
+            self._trim()
+        try:
+            self._queue.put_nowait(job_id)
+        except queue.Full:
+            with self._lock:
+                self._jobs.pop(job_id, None)
+                self._payloads.pop(job_id, None)
+            raise QueueFull("Analysis queue is full")
+        with self._lock:
+            self._counters["submitted"] += 1
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def _trim(self) -> None:
+        # Forget the oldest finished jobs; queued/running ones are never dropped.
+        excess = len(self._jobs) - self.max_results
+        if excess <= 0:
+            return
+        for job_id in [j for j, job in self._jobs.items() if job["status"] in ("done", "failed")][:excess]:
+            del self._jobs[job_id]
+
+    def _next_batch(self) -> List[str]:
+        try:
+            batch = [self._queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            if not batch:
+                continue
+            started = time.monotonic()
+            try:
+                self._run_batch(batch)
+            except Exception:
+                logger.exception("Resume analysis batch failed")
+            finally:
+                with self._lock:
+                    self._busy_seconds += time.monotonic() - started
+
+    def _run_batch(self, job_ids: List[str]) -> None:
+        now = time.time()
+        with self._lock:
+            items = [self._payloads.pop(job_id) for job_id in job_ids]
+            for job_id in job_ids:
+                job = self._jobs[job_id]
+                job["status"] = "running"
+                self._waits.append(now - job["submitted_at"])
+            self._counters["batches"] += 1
+
+        # Cache lookups stay in this process so they are shared by all the
+        # executor's workers; only the misses are sent to be parsed.
+        parsed: List[Optional[Dict[str, Any]]] = [get_cached_parse(*item) for item in items]
+        misses = [i for i, profile in enumerate(parsed) if profile is None]
+        if misses:
+            try:
+                results, timings = self.executor.submit(
+                    timed_call,
+                    parse_resume_bytes_batch,
+                    [items[i] for i in misses],
+                    use_cache=False,
+                ).result()
+                record_timings(timings)
+            except Exception as e:
+                results = [{"error": f"{type(e).__name__}: {e}"} for _ in misses]
+            for i, profile in zip(misses, results):
+                parsed[i] = profile
+                cache_parse(items[i][0], items[i][1], profile)
+
+        for job_id, profile in zip(job_ids, parsed):
+            update: Dict[str, Any] = {"finished_at": time.time()}
+            if "error" in profile:
+                update.update(status="failed", error=profile["error"])
+            else:
+                raw_text = profile.pop("raw_text", None)
+                try:
+                    jobs = recommend_jobs(
+                        profile.get("skills", []), top_k=self.top_k, text=raw_text
+                    )
+                    update.update(status="done", profile=profile, recommendations=jobs)
+                except Exception as e:
+                    update.update(status="failed", error=f"{type(e).__name__}: {e}")
+            with self._lock:
+                self._jobs[job_id].update(update)
+                self._counters["completed" if update["status"] == "done" else "failed"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits)
+            counters = dict(self._counters)
+            busy_seconds = self._busy_seconds
+        uptime = max(time.monotonic() - self._started_at, 1e-9)
+        return {
+            **counters,
+            "pending": self._queue.qsize(),
+            "workers": self.workers,
+            "batch_size": self.batch_size,
+            "queue_latency_avg_seconds": sum(waits) / len(waits) if waits else 0.0,
+            "queue_latency_p95_seconds": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+            "worker_utilization": min(1.0, busy_seconds / (uptime * max(self.workers, 1))),
+        }
@@ -0,0 +1,93 @@
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .job_catalog import JobCatalog
+from .job_filters import PostingSelection
+
+# Upper bound on the int64 cells of one candidates x postings score block
+# (32 MiB); blocks are tiled over both axes to stay within it.
+_MAX_SCORE_CELLS = 1 << 22
+# Candidates scored per pass over the postings.
+_MAX_BLOCK_CANDIDATES = 1024
+
+def batch_top_postings(
+    catalog: JobCatalog,
+    skills_batch: Sequence[Iterable[str]],
+    top_k: int,
+    max_cells: int = _MAX_SCORE_CELLS,
+    allowed: Optional[PostingSelection] = None,
+) -> List[List[Tuple[int, int]]]:
+    """Top-k ``(posting_id, overlap)`` pairs for every candidate in the batch.
+
+    Both sides stay sparse: for each skill in the batch, the candidates
+    listing it add one to the postings in its posting list, a block of
+    candidates by a span of postings at a time. Only the score block and
+    each candidate's running top-k are dense, so memory stays bounded by
+    ``max_cells`` whatever the catalog and vocabulary size. Ordering
+    matches ``top_postings``: higher overlap first, then catalog order.
+    ``allowed`` restricts the postings.
+    """
+    query_ids = [catalog.lookup_skills(skills) for skills in skills_batch]
+    results: List[List[Tuple[int, int]]] = [[] for _ in query_ids]
+    vocab = sorted({skill_id for ids in query_ids for skill_id in ids})
+    if not vocab or top_k <= 0:
+        return results
+
+    lists = [np.frombuffer(catalog.postings[s], dtype=np.intc) for s in vocab]
+    if allowed is not None:
+        lists = [ids[allowed.mask[ids]] for ids in lists]
+    # Postings sharing at least one batch skill, renumbered 0..n-1; the
+    # posting lists become sorted positions in that numbering.
+    rows = np.unique(np.concatenate(lists))
+    n = len(rows)
+    if not n:
+        return results
+    columns = [np.searchsorted(rows, posting_ids) for posting_ids in lists]
+    # The transposed side: which candidates list each batch skill, sorted.
+    column = {skill_id: j for j, skill_id in enumerate(vocab)}
+    holders: List[List[int]] = [[] for _ in vocab]
+    for i, ids in enumerate(query_ids):
+        for skill_id in ids:
+            holders[column[skill_id]].append(i)
+    candidates = [np.asarray(c, dtype=np.intp) for c in holders]
+
+    k = min(top_k, n)
+    block = max(1, min(len(query_ids), _MAX_BLOCK_CANDIDATES, max_cells))
+    span = max(1, min(n, max_cells // block))
+    # Keys fold the score with the reversed row, so earlier postings win
+    # ties and the row is recoverable: row = n - 1 - key % n.
+    tie_break = np.arange(n - 1, -1, -1, dtype=np.int64)
+
+    for b0 in range(0, len(query_ids), block):
+        b1 = min(b0 + block, len(query_ids))
+        members = [
+            (c[np.searchsorted(c, b0):np.searchsorted(c, b1)] - b0, cols)
+            for c, cols in zip(candidates, columns)
+        ]
+        members = [(c, cols) for c, cols in members if len(c)]
+        best = np.full((b1 - b0, 0), -1, dtype=np.int64)
+        for r0 in range(0, n, span):
+            r1 = min(r0 + span, n)
+            keys = np.zeros((b1 - b0, r1 - r0), dtype=np.int64)
+            for c, cols in members:
+                cols = cols[np.searchsorted(cols, r0):np.searchsorted(cols, r1)] - r0
+                if len(cols):
+                    keys[np.ix_(c, cols)] += 1
+            keys *= n
+            keys += tie_break[r0:r1]
+            if keys.shape[1] > k:
+                keys = np.take_along_axis(
+                    keys, np.argpartition(-keys, k - 1, axis=1)[:, :k], axis=1
+                )
+            best = np.concatenate([best, keys], axis=1)
+            if best.shape[1] > k:
+                best = np.take_along_axis(
+                    best, np.argpartition(-best, k - 1, axis=1)[:, :k], axis=1
+                )
+        best = -np.sort(-best, axis=1)
+        for offset, keys in enumerate(best):
+            results[b0 + offset] = [
+                (int(rows[n - 1 - key % n]), int(key // n)) for key in keys.tolist() if key >= n
+            ]
+    return results
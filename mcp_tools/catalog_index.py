@@ -0,0 +1,247 @@
+"""Prebuilt, memory-mapped job catalog index.
+
+    python -m mcp_tools.catalog_index build-index [--db-dir jobs_db] [--output PATH]
+
+compiles the JSON shards into one binary file holding the interned skills,
+the per-posting skill lists, the inverted lists, the text columns and the
+remote flag the job filters use.
+``load_index`` maps that file read-only and wraps it in a ``JobCatalog``
+without copying, so opening it takes roughly constant time and every
+process on the host shares the same page-cache pages.
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .catalog_reloader import Snapshot, snapshot_dir
+from .job_catalog import _SIDE_FIELDS, JobCatalog
+from .job_filters import remote_flags
+from .jobs_db import load_catalog
+
+_MAGIC = b"JRCATIDX"
+_FORMAT_VERSION = 1
+# magic, format version, header length
+_PREAMBLE = struct.Struct("<8sIQ")
+_ALIGN = 8
+
+class _StringColumn(Sequence):
+    """Read-only strings stored as one UTF-8 blob plus an offsets array."""
+
+    def __init__(self, offsets: memoryview, data: memoryview, present: Optional[memoryview] = None) -> None:
+        self._offsets = offsets
+        self._data = data
+        self._present = present
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if self._present is not None and not self._present[i]:
+            return None
+        return str(self._data[self._offsets[i]:self._offsets[i + 1]], "utf-8")
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        # Full scans (building derived structures) skip __getitem__'s checks.
+        data, offsets, present = self._data, self._offsets, self._present
+        for i in range(len(offsets) - 1):
+            if present is not None and not present[i]:
+                yield None
+            else:
+                yield str(data[offsets[i]:offsets[i + 1]], "utf-8")
+
+class _ExtrasColumn:
+    """Read-only ``{posting_id: extra fields}`` backed by a column of JSON."""
+
+    def __init__(self, column: _StringColumn) -> None:
+        self._column = column
+
+    def get(self, posting_id: int, default: Any = None) -> Any:
+        value = self._column[posting_id]
+        return json.loads(value) if value else default
+
+    def items(self) -> Iterable[Tuple[int, Dict[str, Any]]]:
+        for posting_id in range(len(self._column)):
+            extra = self.get(posting_id)
+            if extra:
+                yield posting_id, extra
+
+def _string_table(values: Iterable[Optional[str]]) -> Tuple[array, bytes, bytearray]:
+    offsets = array("q", [0])
+    blob = bytearray()
+    present = bytearray()
+    for value in values:
+        present.append(value is not None)
+        if value is not None:
+            blob += value.encode("utf-8")
+        offsets.append(len(blob))
+    return offsets, bytes(blob), present
+
+def _sections(catalog: JobCatalog) -> Dict[str, Tuple[str, bytes]]:
+    inverted_offsets = array("q", [0])
+    inverted_data = array("i")
+    for posting_ids in catalog.postings:
+        inverted_data.extend(posting_ids)
+        inverted_offsets.append(len(inverted_data))
+
+    sections: Dict[str, Tuple[str, bytes]] = {
+        "skill_offsets": ("q", catalog.skill_offsets.tobytes()),
+        "skill_data": ("i", catalog.skill_data.tobytes()),
+        "inverted_offsets": ("q", inverted_offsets.tobytes()),
+        "inverted_data": ("i", inverted_data.tobytes()),
+    }
+    offsets, blob, _ = _string_table(catalog.skill_names)
+    sections["skill_names.offsets"] = ("q", offsets.tobytes())
+    sections["skill_names.data"] = ("B", blob)
+    # Side values that are not strings (numeric ids) travel with the extras,
+    # which posting() merges back in.
+    moved: Dict[int, Dict[str, Any]] = {}
+    for field in _SIDE_FIELDS:
+        column = catalog.columns[field]
+        for posting_id, value in enumerate(column):
+            if value is not None and not isinstance(value, str):
+                moved.setdefault(posting_id, {})[field] = value
+        offsets, blob, present = _string_table(
+            value if isinstance(value, str) else None for value in column
+        )
+        sections[f"{field}.offsets"] = ("q", offsets.tobytes())
+        sections[f"{field}.data"] = ("B", blob)
+        sections[f"{field}.present"] = ("B", bytes(present))
+
+    def extras(posting_id: int) -> str:
+        extra = catalog.extras.get(posting_id)
+        if posting_id in moved:
+            extra = {**moved[posting_id], **(extra or {})}
+        return json.dumps(extra, ensure_ascii=False) if extra else ""
+
+    offsets, blob, _ = _string_table(extras(p) for p in range(len(catalog)))
+    sections["extras.offsets"] = ("q", offsets.tobytes())
+    sections["extras.data"] = ("B", blob)
+    # Saves decoding every posting's extras to build the remote filter.
+    sections["remote_flags"] = ("B", remote_flags(catalog).tobytes())
+    return sections
+
+def write_index(catalog: JobCatalog, path: str, source: Snapshot = ()) -> None:
+    """Write ``catalog`` to ``path`` atomically (temp file, then rename).
+
+    ``source`` is the ``snapshot_dir`` of the shards it was built from, so
+    readers can tell whether the index is still current.
+    """
+    sections = _sections(catalog)
+    directory: Dict[str, List[Any]] = {}
+    position = 0
+    for name, (typecode, data) in sections.items():
+        directory[name] = [position, len(data), typecode]
+        position += len(data) + (-len(data)) % _ALIGN
+    header = json.dumps({
+        "postings": len(catalog),
+        "skills": len(catalog.skill_names),
+        "source": [list(entry) for entry in source],
+        "sections": directory,
+    }).encode("utf-8")
+    header += b" " * ((-(_PREAMBLE.size + len(header))) % _ALIGN)
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".catalog-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_PREAMBLE.pack(_MAGIC, _FORMAT_VERSION, len(header)))
+            f.write(header)
+            for _, data in sections.values():
+                f.write(data)
+                f.write(b"\0" * ((-len(data)) % _ALIGN))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+def _read_header(buffer) -> Tuple[Dict[str, Any], int]:
+    magic, version, header_len = _PREAMBLE.unpack_from(buffer, 0)
+    if magic != _MAGIC or version != _FORMAT_VERSION:
+        raise ValueError("Not a job catalog index (or an unsupported format version)")
+    start = _PREAMBLE.size
+    header = json.loads(bytes(buffer[start:start + header_len]))
+    return header, start + header_len
+
+def read_index_source(path: str) -> Snapshot:
+    """The shard snapshot an index was built from, without mapping it all."""
+    with open(path, "rb") as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size:
+            raise ValueError(f"Truncated job catalog index: {path}")
+        _, _, header_len = _PREAMBLE.unpack(preamble)
+        header, _ = _read_header(preamble + f.read(header_len))
+    return tuple(tuple(entry) for entry in header["source"])
+
+def load_index(path: str) -> JobCatalog:
+    """Map ``path`` read-only and expose it as a (read-only) ``JobCatalog``."""
+    with open(path, "rb") as f:
+        buffer = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    header, base = _read_header(buffer)
+
+    def section(name: str) -> memoryview:
+        offset, length, typecode = header["sections"][name]
+        start = base + offset
+        return buffer[start:start + length].cast(typecode)
+
+    def strings(name: str, nullable: bool = True) -> _StringColumn:
+        present = section(f"{name}.present") if nullable else None
+        return _StringColumn(section(f"{name}.offsets"), section(f"{name}.data"), present)
+
+    catalog = JobCatalog()
+    catalog.skill_names = list(strings("skill_names", nullable=False))
+    catalog.skill_ids = {name: i for i, name in enumerate(catalog.skill_names)}
+    catalog.skill_offsets = section("skill_offsets")
+    catalog.skill_data = section("skill_data")
+    inverted_offsets = section("inverted_offsets")
+    inverted_data = section("inverted_data")
+    catalog.postings = [
+        inverted_data[inverted_offsets[i]:inverted_offsets[i + 1]]
+        for i in range(len(catalog.skill_names))
+    ]
+    catalog.columns = {field: strings(field) for field in _SIDE_FIELDS}
+    catalog.extras = _ExtrasColumn(strings("extras", nullable=False))
+    if "remote_flags" in header["sections"]:
+        catalog.derived["remote_flags"] = np.frombuffer(section("remote_flags"), dtype=bool)
+    return catalog
+
+def build_index(db_dir: str, output: str, workers: Optional[int] = None) -> JobCatalog:
+    source = snapshot_dir(db_dir)
+    catalog = load_catalog(db_dir, workers=workers)
+    write_index(catalog, output, source)
+    return catalog
+
+def default_index_path(db_dir: str) -> str:
+    # A dot file, so shard discovery and the reloader's snapshot ignore it.
+    return os.path.join(db_dir, ".catalog.idx")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Job catalog index tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build-index", help="compile jobs_db shards into one index file")
+    build.add_argument("--db-dir", default=os.getenv("JOBS_DB_DIR", "jobs_db"))
+    build.add_argument("--output", help="index path (default: JOBS_INDEX_PATH or <db-dir>/.catalog.idx)")
+    build.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    output = args.output or os.getenv("JOBS_INDEX_PATH") or default_index_path(args.db_dir)
+    started = time.perf_counter()
+    catalog = build_index(args.db_dir, output, workers=args.workers)
+    print(
+        f"Wrote {output}: {len(catalog)} postings, {len(catalog.skill_names)} skills, "
+        f"{os.path.getsize(output)} bytes in {time.perf_counter() - started:.2f}s"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import logging
+import os
+import threading
+from typing import Callable, Optional, Tuple
+
+try:
+    import watchfiles
+except ImportError:  # pragma: no cover - optional, pulled in by uvicorn[standard]
+    watchfiles = None
+
+logger = logging.getLogger(__name__)
+
+Snapshot = Tuple[Tuple[str, int, int], ...]
+
+def snapshot_dir(path: str) -> Snapshot:
+    entries = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                st = entry.stat()
+                entries.append((entry.name, st.st_mtime_ns, st.st_size))
+    except FileNotFoundError:
+        pass
+    return tuple(sorted(entries))
+
+class CatalogReloader:
+    """Watches a directory and calls ``on_change`` from a background thread.
+
+    ``mode`` is "auto" (inotify through watchfiles when installed, else mtime
+    polling), "inotify", "poll" or "off".
+    """
+
+    def __init__(
+        self,
+        path: str,
+        on_change: Callable[[], None],
+        mode: str = "auto",
+        interval: float = 2.0,
+    ) -> None:
+        self.path = path
+        self.on_change = on_change
+        self.mode = mode
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last = snapshot_dir(path)
+
+    @property
+    def backend(self) -> str:
+        if self.mode == "auto":
+            return "inotify" if watchfiles is not None else "poll"
+        return self.mode
+
+    def start(self) -> None:
+        if self.backend == "off" or self._thread is not None:
+            return
+        if self.backend == "inotify" and watchfiles is None:
+            raise RuntimeError("inotify watching requires the 'watchfiles' package")
+        target = self._watch_inotify if self.backend == "inotify" else self._watch_poll
+        self._stop.clear()
+        self._thread = threading.Thread(target=target, name="catalog-reloader", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _check(self) -> None:
+        current = snapshot_dir(self.path)
+        if current == self._last:
+            return
+        self._last = current
+        try:
+            self.on_change()
+        except Exception:
+            logger.exception("Reloading jobs DB from %s failed", self.path)
+
+    def _watch_poll(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._check()
+
+    def _watch_inotify(self) -> None:
+        for _ in watchfiles.watch(self.path, stop_event=self._stop, recursive=False):
+            self._check()
@@ -0,0 +1,137 @@
+import heapq
+import sys
+from array import array
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+_SIDE_FIELDS = ("id", "title", "location", "description")
+# Side fields that are always text (filters and embeddings read them).
+_TEXT_FIELDS = ("title", "location", "description")
+
+def normalize_skill(skill: str) -> str:
+    return str(skill).strip().lower()
+
+def normalize_skills(skills: Iterable[str]) -> FrozenSet[str]:
+    normalized = (normalize_skill(s) for s in skills)
+    return frozenset(s for s in normalized if s)
+
+def top_postings(counts: Dict[int, int], top_k: int) -> List[Tuple[int, int]]:
+    # Ties keep catalog order, like the stable sort this replaces.
+    return heapq.nlargest(top_k, counts.items(), key=lambda item: (item[1], -item[0]))
+
+class JobCatalog:
+    """Column-oriented job postings with interned skills and an inverted index.
+
+    Skills are interned to small integer ids. Each posting's skill ids live in
+    one CSR buffer (``skill_offsets``/``skill_data``), the inverted index maps
+    a skill id to an array of posting ids, and the text fields sit in side
+    tables that are only turned back into dicts for the final top-k.
+    """
+
+    def __init__(self) -> None:
+        self.skill_ids: Dict[str, int] = {}
+        self.skill_names: List[str] = []
+        self.skill_offsets = array("q", [0])
+        self.skill_data = array("i")
+        self.postings: List[array] = []
+        self.columns: Dict[str, List[Any]] = {f: [] for f in _SIDE_FIELDS}
+        self.extras: Dict[int, Dict[str, Any]] = {}
+        # Structures built lazily from the columns (e.g. bitsets); they are
+        # dropped together with the catalog when a reload swaps it out.
+        self.derived: Dict[str, Any] = {}
+        self.version = 0
+        # Identifies the source files the catalog was loaded from, the same
+        # in every process that loads them; None when built from memory.
+        self.fingerprint: Optional[str] = None
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[Dict[str, Any]]) -> "JobCatalog":
+        catalog = cls()
+        for job in jobs:
+            catalog.add(job)
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self.skill_offsets) - 1
+
+    @property
+    def index_entries(self) -> int:
+        return len(self.skill_data)
+
+    def intern_skill(self, skill: str) -> int:
+        skill_id = self.skill_ids.get(skill)
+        if skill_id is None:
+            skill_id = len(self.skill_names)
+            self.skill_ids[skill] = skill_id
+            self.skill_names.append(skill)
+            self.postings.append(array("i"))
+        return skill_id
+
+    def lookup_skills(self, skills: Iterable[str]) -> List[int]:
+        ids = (self.skill_ids.get(s) for s in normalize_skills(skills))
+        return [i for i in ids if i is not None]
+
+    def add(self, job: Dict[str, Any]) -> int:
+        posting_id = len(self)
+        # dict.fromkeys de-duplicates while keeping the posting's own order.
+        skills = dict.fromkeys(
+            s for s in (normalize_skill(x) for x in job.get("skills", [])) if s
+        )
+        for skill in skills:
+            skill_id = self.intern_skill(skill)
+            self.skill_data.append(skill_id)
+            self.postings[skill_id].append(posting_id)
+        self.skill_offsets.append(len(self.skill_data))
+
+        for field in _SIDE_FIELDS:
+            value = job.get(field)
+            if value is not None and field in _TEXT_FIELDS:
+                value = str(value)
+                if field == "location":
+                    value = sys.intern(value)
+            # ``id`` is kept as given: callers look postings up by it.
+            self.columns[field].append(value)
+
+        extra = {k: v for k, v in job.items() if k not in _SIDE_FIELDS and k != "skills"}
+        if extra:
+            self.extras[posting_id] = extra
+        return posting_id
+
+    def extend(self, other: "JobCatalog") -> None:
+        offset = len(self)
+        remap = array("i", (self.intern_skill(name) for name in other.skill_names))
+        base = len(self.skill_data)
+        self.skill_data.extend(remap[skill_id] for skill_id in other.skill_data)
+        self.skill_offsets.extend(base + o for o in other.skill_offsets[1:])
+        for skill_id, posting_ids in enumerate(other.postings):
+            self.postings[remap[skill_id]].extend(p + offset for p in posting_ids)
+        for field in _SIDE_FIELDS:
+            self.columns[field].extend(other.columns[field])
+        for posting_id, extra in other.extras.items():
+            self.extras[posting_id + offset] = extra
+
+    def posting_skill_ids(self, posting_id: int) -> array:
+        start = self.skill_offsets[posting_id]
+        end = self.skill_offsets[posting_id + 1]
+        return self.skill_data[start:end]
+
+    def posting(self, posting_id: int, **fields: Any) -> Dict[str, Any]:
+        job: Dict[str, Any] = {}
+        for field in _SIDE_FIELDS:
+            value = self.columns[field][posting_id]
+            if value is not None:
+                job[field] = value
+            if field == "title":
+                job["skills"] = [
+                    self.skill_names[s] for s in self.posting_skill_ids(posting_id)
+                ]
+        job.update(self.extras.get(posting_id, ()))
+        job.update(fields)
+        return job
+
+    def match_counts(self, skills: Iterable[str]) -> Dict[int, int]:
+        # Only postings sharing at least one skill are ever touched.
+        counts: Dict[int, int] = {}
+        for skill_id in self.lookup_skills(skills):
+            for posting_id in self.postings[skill_id]:
+                counts[posting_id] = counts.get(posting_id, 0) + 1
+        return counts
@@ -0,0 +1,204 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .job_catalog import JobCatalog
+
+FILTER_FIELDS = ("location", "remote", "title_keyword")
+# Recent word-filter selections kept per catalog; forms tend to repeat them.
+_SELECTION_CACHE_SIZE = 32
+
+_TOKEN = re.compile(r"[\w+#]+")
+_build_lock = threading.Lock()
+
+def _tokens(text: Optional[str]) -> List[str]:
+    return _TOKEN.findall(text.lower()) if text else []
+
+def _is_truthy(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+def normalize_filters(filters: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Validated filters with empty values dropped; ``{}`` means no filtering.
+
+    ``location`` and ``title_keyword`` match when every word of the filter
+    appears in the posting's location or title; ``remote`` is a boolean.
+    """
+    if not filters:
+        return {}
+    unknown = set(filters) - set(FILTER_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"Unknown job filter(s) {', '.join(sorted(unknown))} "
+            f"(choose from {', '.join(FILTER_FIELDS)})"
+        )
+    normalized: Dict[str, Any] = {}
+    for field in ("location", "title_keyword"):
+        words = _tokens(str(filters.get(field) or ""))
+        if words:
+            normalized[field] = " ".join(words)
+    if filters.get("remote") is not None and filters.get("remote") != "":
+        normalized["remote"] = _is_truthy(filters["remote"])
+    return normalized
+
+class PostingSelection:
+    """The postings that passed the job filters.
+
+    ``ids`` are sorted posting ids and ``mask`` the same set as a dense
+    boolean vector over the catalog; engines use whichever suits them, and
+    the mask is built at most once per selection.
+    """
+
+    __slots__ = ("ids", "_mask", "_size")
+
+    def __init__(self, ids: np.ndarray, size: int, mask: Optional[np.ndarray] = None) -> None:
+        self.ids = ids
+        self._size = size
+        self._mask = mask
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def mask(self) -> np.ndarray:
+        if self._mask is None:
+            mask = np.zeros(self._size, dtype=bool)
+            mask[self.ids] = True
+            self._mask = mask
+        return self._mask
+
+def _intersect(a: np.ndarray, b: np.ndarray, size: int) -> np.ndarray:
+    # Both sorted. A short list is binary-searched into the other; past that
+    # a dense mask of the longer one is cheaper than the searches.
+    if len(a) > len(b):
+        a, b = b, a
+    if not len(a):
+        return a
+    if len(a) * 64 < size:
+        pos = np.minimum(np.searchsorted(b, a), len(b) - 1)
+        return a[b[pos] == a]
+    mask = np.zeros(size, dtype=bool)
+    mask[b] = True
+    return a[mask[a]]
+
+def _word_lists(column) -> Dict[str, np.ndarray]:
+    # Locations and titles repeat across postings: tokenize each distinct
+    # value once, then hand its postings to every word it contains.
+    by_value: Dict[str, List[int]] = {}
+    for posting_id, value in enumerate(column):
+        if value:
+            by_value.setdefault(value, []).append(posting_id)
+    by_word: Dict[str, List[List[int]]] = {}
+    for value, posting_ids in by_value.items():
+        for word in set(_tokens(value)):
+            by_word.setdefault(word, []).append(posting_ids)
+    return {
+        word: np.sort(np.fromiter(
+            (p for ids in groups for p in ids), dtype=np.intc, count=sum(map(len, groups))
+        ))
+        for word, groups in by_word.items()
+    }
+
+def remote_flags(catalog: JobCatalog) -> np.ndarray:
+    """Whether each posting counts as remote, as a boolean vector.
+
+    An explicit ``remote`` field wins over the location text. Catalogs
+    loaded from an index file carry the vector precomputed.
+    """
+    flags = catalog.derived.get("remote_flags")
+    if flags is not None:
+        return flags
+    flags = np.zeros(len(catalog), dtype=bool)
+    remote_locations: Dict[str, bool] = {}
+    for posting_id, location in enumerate(catalog.columns["location"]):
+        if location:
+            is_remote = remote_locations.get(location)
+            if is_remote is None:
+                is_remote = remote_locations[location] = "remote" in _tokens(location)
+            flags[posting_id] = is_remote
+    for posting_id, extra in catalog.extras.items():
+        if extra.get("remote") is not None:
+            flags[posting_id] = _is_truthy(extra["remote"])
+    catalog.derived["remote_flags"] = flags
+    return flags
+
+class _AttributeIndex:
+    """Sorted posting-id lists per location word, title word and remote flag."""
+
+    def __init__(self, catalog: JobCatalog) -> None:
+        self.size = len(catalog)
+        self.words = {
+            "location": _word_lists(catalog.columns["location"]),
+            "title_keyword": _word_lists(catalog.columns["title"]),
+        }
+        remote_mask = remote_flags(catalog)
+        # Both sides of the remote flag are fixed per catalog, so a
+        # remote-only filter costs nothing per query.
+        self._recent: "OrderedDict[Tuple[Tuple[str, Any], ...], PostingSelection]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.remote = {
+            True: PostingSelection(
+                np.flatnonzero(remote_mask).astype(np.intc), self.size, remote_mask
+            ),
+            False: PostingSelection(
+                np.flatnonzero(~remote_mask).astype(np.intc), self.size, ~remote_mask
+            ),
+        }
+
+    def select(self, filters: Dict[str, Any]) -> PostingSelection:
+        key = tuple(sorted(filters.items()))
+        with self._lock:
+            selection = self._recent.get(key)
+            if selection is not None:
+                self._recent.move_to_end(key)
+                return selection
+        selection = self._select(filters)
+        with self._lock:
+            self._recent[key] = selection
+            while len(self._recent) > _SELECTION_CACHE_SIZE:
+                self._recent.popitem(last=False)
+        return selection
+
+    def _select(self, filters: Dict[str, Any]) -> PostingSelection:
+        parts = [
+            self.words[field].get(word, np.empty(0, dtype=np.intc))
+            for field in ("location", "title_keyword") if field in filters
+            for word in filters[field].split()
+        ]
+        if not parts:
+            return self.remote[filters["remote"]]
+        # Intersect the shortest lists first so the working set only shrinks.
+        parts.sort(key=len)
+        selected = parts[0]
+        for posting_ids in parts[1:]:
+            if not len(selected):
+                break
+            selected = _intersect(selected, posting_ids, self.size)
+        if "remote" in filters and len(selected):
+            selected = selected[self.remote[filters["remote"]].mask[selected]]
+        return PostingSelection(selected, self.size)
+
+def get_attribute_index(catalog: JobCatalog) -> _AttributeIndex:
+    """The catalog's attribute index, built once (the reloader builds it
+    before swapping a new catalog in, so requests normally find it)."""
+    index = catalog.derived.get("attributes")
+    if index is None:
+        with _build_lock:
+            index = catalog.derived.get("attributes")
+            if index is None:
+                index = _AttributeIndex(catalog)
+                catalog.derived["attributes"] = index
+    return index
+
+def filter_postings(
+    catalog: JobCatalog, filters: Optional[Mapping[str, Any]]
+) -> Optional[PostingSelection]:
+    """The postings passing ``filters``, or None when unfiltered."""
+    filters = normalize_filters(filters)
+    if not filters:
+        return None
+    return get_attribute_index(catalog).select(filters)
@@ -1,40 +1,326 @@
+import hashlib
 import json
+import logging
 import os
-from typing import List, Dict, Any
+import threading
+import time
+from typing import List, Dict, Any, FrozenSet, Optional
+
+from .batch_scoring import batch_top_postings
+from .catalog_index import default_index_path, load_index, read_index_source
+from .catalog_reloader import CatalogReloader, snapshot_dir
+from .job_catalog import JobCatalog, normalize_skills
+from .job_filters import filter_postings, get_attribute_index, normalize_filters
+from .jobs_db import iter_jobs, load_catalog
+from .metrics import Sampled, stage
+from .ranking import OVERLAP_ENGINES, TEXT_ENGINES, RankFn, get_engine
+from .result_cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+_BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_JOBS_DB_DIR = os.getenv("JOBS_DB_DIR", os.path.join(_BASE_DIR, "jobs_db"))
+_JOBS_DB_WORKERS = os.getenv("JOBS_DB_WORKERS")
+# Written by `python -m mcp_tools.catalog_index build-index`; used instead
+# of the shards whenever it was built from their current contents.
+_JOBS_INDEX_PATH = os.getenv("JOBS_INDEX_PATH") or default_index_path(_JOBS_DB_DIR)
+_JOB_SCORING_ENGINE = os.getenv("JOB_SCORING_ENGINE", "index")
+_JOBS_DB_WATCH = os.getenv("JOBS_DB_WATCH", "auto")
+_JOBS_DB_POLL_INTERVAL = float(os.getenv("JOBS_DB_POLL_INTERVAL", "2.0"))
+_RECOMMEND_CACHE_SIZE = int(os.getenv("RECOMMEND_CACHE_SIZE", "1024"))
+_RECOMMEND_CACHE_TTL = float(os.getenv("RECOMMEND_CACHE_TTL", "600"))
+# SQLite file shared by every process serving the same jobs DB; unset keeps
+# the cache per-process.
+_RECOMMEND_CACHE_PATH = os.getenv("RECOMMEND_CACHE_PATH")
+_RECOMMEND_CACHE_DISK_MAX_ENTRIES = int(os.getenv("RECOMMEND_CACHE_DISK_MAX_ENTRIES", "100000"))
+
+_GENERIC_JOB: Dict[str, Any] = {
+    "id": "generic-it",
+    "title": "General IT / Software Role",
+    "skills": [],
+    "location": "Remote / Flexible",
+    "match_score": 0,
+    "description": "Generic software/IT role – your skills may be applicable across multiple positions."
+}
+
+_catalog: Optional[JobCatalog] = None
+_catalog_lock = threading.Lock()
+_reloader: Optional[CatalogReloader] = None
+_reload_stats: Dict[str, Any] = {
+    "reloads": 0,
+    "reload_failures": 0,
+    "last_reload_seconds": None,
+    "last_reload_at": None,
+    "source": None,
+}
+
+# recommend_jobs results by (skills, top_k, filters, engine, catalog
+# fingerprint). The in-memory tier is per-process; with RECOMMEND_CACHE_PATH
+# the web app and the MCP server also share a SQLite tier. The fingerprint
+# in the key keeps a reloaded catalog from serving old results in any of
+# them, and reloads also drop this process's in-memory entries.
+_result_cache = ResultCache(
+    max_entries=_RECOMMEND_CACHE_SIZE,
+    ttl=_RECOMMEND_CACHE_TTL,
+    disk_path=_RECOMMEND_CACHE_PATH,
+    disk_max_entries=_RECOMMEND_CACHE_DISK_MAX_ENTRIES,
+)
+
+for _name, _stat, _kind, _doc in (
+    ("hits", "memory_hits", "counter",
+     "recommend_jobs calls answered from the in-memory result cache."),
+    ("disk_hits", "disk_hits", "counter",
+     "recommend_jobs calls answered from the shared result cache."),
+    ("misses", "misses", "counter", "recommend_jobs calls that had to rank."),
+    ("evictions", "memory_evictions", "counter",
+     "Result cache entries evicted to stay within RECOMMEND_CACHE_SIZE."),
+    ("entries", "memory_entries", "gauge", "Entries in this process's result cache."),
+):
+    # stats() only copies counters; it never touches SQLite.
+    Sampled(
+        f"job_recommender_result_cache_{_name}" + ("_total" if _kind == "counter" else ""),
+        _doc,
+        _kind,
+        lambda _stat=_stat: _result_cache.stats()[_stat],
+    )
+
+for _name, _stat, _kind, _doc in (
+    ("reloads_total", "reloads", "counter", "Jobs DB reloads swapped in."),
+    ("reload_failures_total", "reload_failures", "counter",
+     "Jobs DB reloads that failed; the previous catalog stayed in use."),
+    ("last_reload_seconds", "last_reload_seconds", "gauge",
+     "Duration of the last successful reload, from load to swap."),
+    ("last_reload_timestamp_seconds", "last_reload_at", "gauge",
+     "Unix time of the last successful reload."),
+):
+    Sampled(
+        f"job_recommender_catalog_{_name}",
+        _doc,
+        _kind,
+        lambda _stat=_stat: _reload_stats[_stat] or 0,
+    )
+
+for _name, _size, _doc in (
+    ("version", lambda c: c.version, "Version of the catalog in use: reloads since startup."),
+    ("postings", len, "Job postings in the catalog in use."),
+    ("skills", lambda c: len(c.skill_names), "Distinct skills in the catalog in use."),
+    ("index_entries", lambda c: c.index_entries, "Posting-skill pairs in the inverted index."),
+):
+    # Reads whatever catalog is loaded; a scrape never triggers the load.
+    Sampled(
+        f"job_recommender_catalog_{_name}",
+        _doc,
+        "gauge",
+        lambda _size=_size: _size(_catalog) if _catalog is not None else 0,
+    )
 
 def _load_jobs_db() -> List[Dict[str, Any]]:
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    jobs_path = os.path.join(base_dir, "jobs_db", "sample_job.json")
-
-    if not os.path.exists(jobs_path):
-        raise FileNotFoundError(f"Jobs DB not found at {jobs_path}")
-
-    with open(jobs_path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-def _score_job(skills: List[str], job: Dict[str, Any]) -> int:
-    job_skills = {s.strip().lower() for s in job.get("skills", [])}
-    user_skills = {s.strip().lower() for s in skills}
-    return len(job_skills.intersection(user_skills))
-
-def recommend_jobs(skills: List[str], top_k: int = 5) -> List[Dict[str, Any]]:
-    jobs = _load_jobs_db()
-    scored = []
-
-    for job in jobs:
-        score = _score_job(skills, job)
-        if score > 0:
-            scored.append({**job, "match_score": score})
-
-    if not scored:
-        return [{
-            "id": "generic-it",
-            "title": "General IT / Software Role",
-            "skills": [],
-            "location": "Remote / Flexible",
-            "match_score": 0,
-            "description": "Generic software/IT role – your skills may be applicable across multiple positions."
-        }]
-
-    scored.sort(key=lambda j: j["match_score"], reverse=True)
-    return scored[:top_k]
\ No newline at end of file
+    return list(iter_jobs(_JOBS_DB_DIR))
+
+def _build_catalog() -> JobCatalog:
+    # Taken before loading: a shard written meanwhile changes the snapshot,
+    # so the reloader loads again and the fingerprint catches up.
+    source = snapshot_dir(_JOBS_DB_DIR)
+    fingerprint = hashlib.sha256(repr(source).encode()).hexdigest()[:24]
+    if os.path.isfile(_JOBS_INDEX_PATH):
+        try:
+            if read_index_source(_JOBS_INDEX_PATH) == source:
+                catalog = load_index(_JOBS_INDEX_PATH)
+                catalog.fingerprint = fingerprint
+                _reload_stats["source"] = "index"
+                return catalog
+            logger.warning(
+                "Catalog index %s is older than %s; loading the shards instead "
+                "(rerun build-index to refresh it)", _JOBS_INDEX_PATH, _JOBS_DB_DIR,
+            )
+        except (OSError, ValueError):
+            logger.exception("Unreadable catalog index %s; loading the shards", _JOBS_INDEX_PATH)
+
+    workers = int(_JOBS_DB_WORKERS) if _JOBS_DB_WORKERS else None
+    catalog = load_catalog(_JOBS_DB_DIR, workers=workers)
+    catalog.fingerprint = fingerprint
+    _reload_stats["source"] = "shards"
+    return catalog
+
+def get_catalog() -> JobCatalog:
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                catalog = _build_catalog()
+                get_attribute_index(catalog)
+                _catalog = catalog
+    return _catalog
+
+def _warm_derived(previous: Optional[JobCatalog], catalog: JobCatalog) -> None:
+    # Build what requests would otherwise build on first use, here in the
+    # reloader thread while requests still use the previous catalog. The
+    # attribute index is cheap and every filtered request needs it.
+    get_attribute_index(catalog)
+    # The semantic index only when semantic ranking is in use: not every
+    # deployment needs it.
+    in_use = previous is not None and "semantic" in previous.derived
+    if not in_use and _JOB_SCORING_ENGINE != "semantic":
+        return
+    from .semantic_index import get_semantic_index
+
+    try:
+        get_semantic_index(catalog)
+    except Exception:
+        logger.exception("Could not build the semantic index for the reloaded catalog")
+
+def reload_catalog() -> JobCatalog:
+    """Rebuild the catalog off to the side, then swap it in with one assignment.
+
+    Callers that already hold the previous catalog keep using it until they
+    finish, so no request ever sees a half-built index.
+    """
+    global _catalog
+    started = time.perf_counter()
+    try:
+        catalog = _build_catalog()
+    except Exception:
+        _reload_stats["reload_failures"] += 1
+        raise
+    _warm_derived(_catalog, catalog)
+    with _catalog_lock:
+        previous = _catalog
+        catalog.version = previous.version + 1 if previous is not None else 0
+        _catalog = catalog
+    # The shared tier keys on the fingerprint, so it needs no clearing.
+    _result_cache.clear(disk=False)
+    _reload_stats["reloads"] += 1
+    _reload_stats["last_reload_seconds"] = time.perf_counter() - started
+    _reload_stats["last_reload_at"] = time.time()
+    logger.info(
+        "Reloaded jobs DB: %d postings in %.3fs",
+        len(catalog), _reload_stats["last_reload_seconds"],
+    )
+    return catalog
+
+def start_catalog_reloader() -> CatalogReloader:
+    global _reloader
+    if _reloader is None:
+        get_catalog()
+        _reloader = CatalogReloader(
+            _JOBS_DB_DIR,
+            reload_catalog,
+            mode=_JOBS_DB_WATCH,
+            interval=_JOBS_DB_POLL_INTERVAL,
+        )
+        _reloader.start()
+    return _reloader
+
+def stop_catalog_reloader() -> None:
+    global _reloader
+    if _reloader is not None:
+        _reloader.stop()
+        _reloader = None
+
+def get_catalog_stats() -> Dict[str, Any]:
+    catalog = get_catalog()
+    return {
+        "version": catalog.version,
+        "postings": len(catalog),
+        "skills": len(catalog.skill_names),
+        "index_entries": catalog.index_entries,
+        "watch_backend": _reloader.backend if _reloader is not None else "off",
+        **_reload_stats,
+    }
+
+def get_result_cache_stats() -> Dict[str, Any]:
+    return _result_cache.stats()
+
+def _result_key(
+    catalog: JobCatalog, query: FrozenSet[str], top_k: int, engine: str, filters: Dict[str, Any]
+) -> str:
+    # Catalogs built in memory have no fingerprint; their version only means
+    # something in this process, which is fine as long as nothing is shared.
+    source = catalog.fingerprint or f"{os.getpid()}:{catalog.version}"
+    parts = [sorted(query), top_k, sorted(filters.items()), engine, source]
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+def recommend_jobs(
+    skills: List[str],
+    top_k: int = 5,
+    engine: Optional[str] = None,
+    text: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Top-k postings for ``skills``.
+
+    ``text`` is the resume text; engines in ``TEXT_ENGINES`` rank against it
+    instead of the skill list, the others ignore it. ``filters`` (location,
+    remote, title_keyword) narrow the postings before any scoring; a
+    filtered query with no match returns ``[]`` rather than the generic job.
+
+    Results are cached per skill set (order, case and duplicates ignored),
+    except for text engines ranking against ``text``.
+    """
+    with stage("recommend"):
+        engine = engine or _JOB_SCORING_ENGINE
+        rank = get_engine(engine)
+        filters = normalize_filters(filters)
+        catalog = get_catalog()
+        if engine in TEXT_ENGINES and text:
+            return _recommend_jobs(catalog, rank, skills, top_k, engine, text, filters)
+
+        # Rank the normalized set itself, so a hit always matches what a
+        # fresh ranking of the same key would return.
+        query = normalize_skills(skills)
+        key = _result_key(catalog, query, top_k, engine, filters)
+        jobs = _result_cache.get(key)
+        if jobs is None:
+            jobs = _recommend_jobs(catalog, rank, sorted(query), top_k, engine, None, filters)
+            _result_cache.put(key, jobs)
+        return jobs
+
+def _recommend_jobs(
+    catalog: JobCatalog,
+    rank: RankFn,
+    skills: List[str],
+    top_k: int,
+    engine: str,
+    text: Optional[str],
+    filters: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    allowed = filter_postings(catalog, filters)
+    if allowed is not None and not len(allowed):
+        return []
+    if text:
+        matches = rank(catalog, skills, top_k, allowed=allowed, text=text)
+    else:
+        matches = rank(catalog, skills, top_k, allowed=allowed)
+
+    if not matches:
+        return [] if allowed is not None else [dict(_GENERIC_JOB)]
+
+    if engine in OVERLAP_ENGINES:
+        return [
+            catalog.posting(posting_id, match_score=score)
+            for posting_id, score in matches
+        ]
+    query = set(catalog.lookup_skills(skills))
+    return [
+        catalog.posting(
+            posting_id,
+            match_score=sum(1 for s in catalog.posting_skill_ids(posting_id) if s in query),
+            rank_score=round(score, 4),
+        )
+        for posting_id, score in matches
+    ]
+
+def recommend_jobs_batch(
+    skills_batch: List[List[str]],
+    top_k: int = 5,
+    filters: Optional[Dict[str, Any]] = None,
+) -> List[List[Dict[str, Any]]]:
+    with stage("recommend_batch"):
+        catalog = get_catalog()
+        allowed = filter_postings(catalog, filters)
+        fallback = [] if allowed is not None else [dict(_GENERIC_JOB)]
+        return [
+            [catalog.posting(posting_id, match_score=score) for posting_id, score in matches]
+            or [dict(job) for job in fallback]
+            for matches in batch_top_postings(catalog, skills_batch, top_k, allowed=allowed)
+        ]
@@ -0,0 +1,70 @@
+import gzip
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, IO, Iterator, List, Optional
+
+from .job_catalog import JobCatalog
+
+SHARD_SUFFIXES = (".jsonl", ".jsonl.gz", ".json", ".json.gz")
+
+def shard_paths(db_dir: str) -> List[str]:
+    if not os.path.isdir(db_dir):
+        raise FileNotFoundError(f"Jobs DB not found at {db_dir}")
+    names = sorted(
+        name for name in os.listdir(db_dir)
+        if not name.startswith(".") and name.endswith(SHARD_SUFFIXES)
+    )
+    return [os.path.join(db_dir, name) for name in names]
+
+def _open_shard(path: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+def iter_shard(path: str) -> Iterator[Dict[str, Any]]:
+    with _open_shard(path) as f:
+        if path.endswith((".jsonl", ".jsonl.gz")):
+            # JSON Lines: one posting in memory at a time.
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_no}: invalid JSON ({e})") from e
+        else:
+            # Legacy single-array shards such as sample_job.json.
+            yield from json.load(f)
+
+def iter_jobs(db_dir: str) -> Iterator[Dict[str, Any]]:
+    for path in shard_paths(db_dir):
+        yield from iter_shard(path)
+
+def load_shard(path: str) -> JobCatalog:
+    return JobCatalog.from_jobs(iter_shard(path))
+
+def load_catalog(db_dir: str, workers: Optional[int] = None) -> JobCatalog:
+    paths = shard_paths(db_dir)
+    if not paths:
+        raise FileNotFoundError(f"No job shards ({', '.join(SHARD_SUFFIXES)}) in {db_dir}")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(paths))
+
+    if workers <= 1:
+        return JobCatalog.from_jobs(iter_jobs(db_dir))
+
+    catalog = JobCatalog()
+    # Spawned, not forked: this runs in the reloader thread of servers that
+    # have other threads, and a fork could inherit a lock another one holds.
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        # map() yields in shard order, so posting ids stay deterministic.
+        for partial in pool.map(load_shard, paths):
+            catalog.extend(partial)
+    return catalog
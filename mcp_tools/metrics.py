@@ -0,0 +1,185 @@
+"""Stage timings exported as Prometheus histograms.
+
+``with stage("spacy"):`` times a block. The duration goes into the
+``job_recommender_stage_seconds`` histogram and, when a collector is active
+for the current request (see ``collect_timings``), into that request's
+list of timings, which the web app turns into a ``Server-Timing`` header.
+
+Work running in a pool worker cannot see the caller's collector or update
+the parent's histograms, so it is wrapped in ``timed_call``: the worker only
+collects its timings and returns them with the result, and the caller
+hands them to ``record_timings``.
+
+With ``METRICS_ENABLED=0`` ``stage`` returns a shared no-op context manager
+and nothing is recorded.
+"""
+import bisect
+import contextlib
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+Timings = List[Tuple[str, float]]
+
+class Histogram:
+    """A labelled Prometheus histogram kept in process memory."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {k: list(v) for k, v in self._series.items()}
+        for label_values, values in sorted(series.items()):
+            labels = ",".join(
+                f'{name}="{_escape(value)}"' for name, value in zip(self.labels, label_values)
+            )
+            prefix = labels + "," if labels else ""
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative:.0f}')
+            cumulative += values[len(self.buckets)]
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {cumulative:.0f}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {values[-1]}")
+            lines.append(f"{self.name}_count{suffix} {cumulative:.0f}")
+        return lines
+
+class Sampled:
+    """A counter or gauge read from ``read()`` at scrape time.
+
+    For values another component already keeps, such as cache counters.
+    """
+
+    def __init__(self, name: str, documentation: str, kind: str, read: Callable[[], float]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.read = read
+        REGISTRY.append(self)
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            f"{self.name} {self.read()}",
+        ]
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+REGISTRY: List[Union[Histogram, Sampled]] = []
+
+STAGE_SECONDS = Histogram(
+    "job_recommender_stage_seconds",
+    "Time spent in each resume/recommendation pipeline stage.",
+    labels=("stage",),
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "job_recommender_http_request_seconds",
+    "Web request latency by route.",
+    labels=("method", "route", "status"),
+)
+MCP_TOOL_SECONDS = Histogram(
+    "job_recommender_mcp_tool_seconds",
+    "MCP tool call latency.",
+    labels=("tool", "status"),
+)
+
+# (timings list, whether stages also update this process's histograms)
+_collector: ContextVar[Optional[Tuple[Timings, bool]]] = ContextVar("_collector", default=None)
+
+class _Stage:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> "_Stage":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        elapsed = time.perf_counter() - self.started
+        collector = _collector.get()
+        if collector is None or collector[1]:
+            STAGE_SECONDS.observe(elapsed, self.name)
+        if collector is not None:
+            collector[0].append((self.name, elapsed))
+
+_NOOP = contextlib.nullcontext()
+
+def stage(name: str):
+    return _Stage(name) if METRICS_ENABLED else _NOOP
+
+@contextlib.contextmanager
+def collect_timings(observe: bool = True) -> Iterator[Timings]:
+    """Gather the stage timings of the enclosed block (and its awaits)."""
+    timings: Timings = []
+    token = _collector.set((timings, observe))
+    try:
+        yield timings
+    finally:
+        _collector.reset(token)
+
+def timed_call(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[Any, Timings]:
+    """Run ``fn`` in a pool worker and return ``(result, timings)``."""
+    if not METRICS_ENABLED:
+        return fn(*args, **kwargs), []
+    with collect_timings(observe=False) as timings:
+        return fn(*args, **kwargs), timings
+
+def record_timings(timings: Timings) -> None:
+    """Account for timings returned by ``timed_call`` in this process."""
+    collector = _collector.get()
+    for name, elapsed in timings:
+        STAGE_SECONDS.observe(elapsed, name)
+        if collector is not None:
+            collector[0].append((name, elapsed))
+
+def server_timing(timings: Timings, total: Optional[float] = None) -> str:
+    """``Server-Timing`` header value; repeated stages are summed."""
+    totals: Dict[str, float] = {}
+    for name, elapsed in timings:
+        totals[name] = totals.get(name, 0.0) + elapsed
+    if total is not None:
+        totals["total"] = total
+    return ", ".join(f"{name};dur={elapsed * 1000:.2f}" for name, elapsed in totals.items())
+
+def render_prometheus() -> str:
+    lines: List[str] = []
+    for histogram in REGISTRY:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,24 @@
+from typing import Optional
+
+from .tiered_cache import TieredCache
+
+class ParseCache(TieredCache):
+    """Parsed resumes keyed by content hash; entries never expire.
+
+    The in-process LRU holds ``max_entries`` parses. The optional SQLite
+    tier at ``disk_path`` holds ``disk_max_entries``, survives restarts, and
+    is shared by every process pointing at the same file.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        disk_path: Optional[str] = None,
+        disk_max_entries: int = 10000,
+    ) -> None:
+        super().__init__(
+            "parses",
+            max_entries=max_entries,
+            disk_path=disk_path,
+            disk_max_entries=disk_max_entries,
+        )
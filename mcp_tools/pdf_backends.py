@@ -0,0 +1,201 @@
+"""Interchangeable PDF text extractors.
+
+Each backend opens a document (raw bytes or a path) and extracts the text
+of a range of pages. ``PDF_BACKENDS`` lists the backends to use, in order;
+ones that are not installed are skipped, and when a backend fails on a
+document the remaining pages are extracted with the next one.
+
+    pypdf2     PyPDF2 (pure Python, a core dependency)
+    pypdf      pypdf, PyPDF2's maintained successor
+    pdfminer   pdfminer.six
+    pdftotext  poppler's pdftotext/pdfinfo commands in a subprocess
+
+``python -m benchmarks.pdf_backends`` compares their speed and text yield.
+"""
+import importlib.util
+import io
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+Source = Union[bytes, str]
+
+_PDF_BACKENDS = os.getenv("PDF_BACKENDS", "pypdf2,pypdf,pdfminer,pdftotext")
+_PDFTOTEXT_TIMEOUT = float(os.getenv("PDFTOTEXT_TIMEOUT", "60"))
+
+def _as_file(source: Source):
+    return io.BytesIO(source) if isinstance(source, bytes) else open(source, "rb")
+
+class PdfDocument:
+    """An open document; ``extract(start, stop)`` returns one string per page."""
+
+    page_count: int
+
+    def extract(self, start: int, stop: int) -> List[str]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+class _ReaderDocument(PdfDocument):
+    """PyPDF2 and pypdf share the ``PdfReader`` API."""
+
+    def __init__(self, reader_cls, source: Source) -> None:
+        self._reader = reader_cls(io.BytesIO(source) if isinstance(source, bytes) else source)
+        self.page_count = len(self._reader.pages)
+
+    def extract(self, start: int, stop: int) -> List[str]:
+        pages = self._reader.pages
+        return [pages[i].extract_text() or "" for i in range(start, stop)]
+
+def _open_pypdf2(source: Source) -> PdfDocument:
+    from PyPDF2 import PdfReader
+
+    return _ReaderDocument(PdfReader, source)
+
+def _open_pypdf(source: Source) -> PdfDocument:
+    from pypdf import PdfReader
+
+    return _ReaderDocument(PdfReader, source)
+
+class _PdfminerDocument(PdfDocument):
+    def __init__(self, source: Source) -> None:
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfparser import PDFParser
+        from pdfminer.pdftypes import resolve1
+
+        self._source = source
+        with _as_file(source) as f:
+            document = PDFDocument(PDFParser(f))
+            self.page_count = int(resolve1(document.catalog["Pages"])["Count"])
+
+    def extract(self, start: int, stop: int) -> List[str]:
+        from pdfminer.high_level import extract_text
+
+        with _as_file(self._source) as f:
+            text = extract_text(f, page_numbers=range(start, stop), maxpages=stop)
+        # pdfminer ends every page with a form feed.
+        pages = text.split("\f")
+        return (pages + [""] * (stop - start))[:stop - start]
+
+class _PdftotextDocument(PdfDocument):
+    def __init__(self, source: Source) -> None:
+        self._tmp: Optional[str] = None
+        if isinstance(source, bytes):
+            fd, self._tmp = tempfile.mkstemp(suffix=".pdf")
+            with os.fdopen(fd, "wb") as f:
+                f.write(source)
+            source = self._tmp
+        self._path = source
+        try:
+            info = self._run("pdfinfo", self._path)
+            match = re.search(r"^Pages:\s+(\d+)", info, re.MULTILINE)
+            if match is None:
+                raise ValueError(f"pdfinfo reported no page count for {self._path}")
+            self.page_count = int(match.group(1))
+        except BaseException:
+            self.close()
+            raise
+
+    @staticmethod
+    def _run(*args: str) -> str:
+        out = subprocess.run(
+            args, capture_output=True, check=True, timeout=_PDFTOTEXT_TIMEOUT
+        )
+        return out.stdout.decode("utf-8", errors="replace")
+
+    def extract(self, start: int, stop: int) -> List[str]:
+        text = self._run(
+            "pdftotext", "-q", "-enc", "UTF-8", "-f", str(start + 1), "-l", str(stop), self._path, "-"
+        )
+        # Like pdfminer, every page ends with a form feed.
+        pages = text.split("\f")
+        return (pages + [""] * (stop - start))[:stop - start]
+
+    def close(self) -> None:
+        if self._tmp is not None:
+            os.unlink(self._tmp)
+            self._tmp = None
+
+def _has_module(name: str) -> Callable[[], bool]:
+    # find_spec does not import the package, so checking stays cheap.
+    return lambda: importlib.util.find_spec(name) is not None
+
+# name -> (is it installed, open a document)
+BACKENDS: Dict[str, Tuple[Callable[[], bool], Callable[[Source], PdfDocument]]] = {
+    "pypdf2": (_has_module("PyPDF2"), _open_pypdf2),
+    "pypdf": (_has_module("pypdf"), _open_pypdf),
+    "pdfminer": (_has_module("pdfminer"), _PdfminerDocument),
+    "pdftotext": (
+        lambda: bool(shutil.which("pdftotext") and shutil.which("pdfinfo")), _PdftotextDocument
+    ),
+}
+
+def available_backends(names: Optional[Sequence[str]] = None) -> List[str]:
+    """The installed backends among ``names`` (default: PDF_BACKENDS), in order."""
+    if names is None:
+        names = [n.strip().lower() for n in _PDF_BACKENDS.split(",") if n.strip()]
+    unknown = [n for n in names if n not in BACKENDS]
+    if unknown:
+        raise ValueError(
+            f"Unknown PDF backend(s) {', '.join(unknown)} (choose from {', '.join(BACKENDS)})"
+        )
+    return [n for n in names if BACKENDS[n][0]()]
+
+class BackendChain(PdfDocument):
+    """A document read with the first backend that works, falling back per range.
+
+    A backend that fails to open the document or to extract a page range is
+    dropped for the rest of the document, and the same range is retried
+    with the next one. The last backend's error is raised when none is left.
+    """
+
+    def __init__(self, source: Source, names: Sequence[str]) -> None:
+        if not names:
+            raise RuntimeError("No PDF backend is installed (see PDF_BACKENDS)")
+        self._source = source
+        self._names = list(names)
+        self._document: Optional[PdfDocument] = None
+        self.backend = ""
+        self._next()
+        self.page_count = self._document.page_count
+
+    def _next(self, error: Optional[BaseException] = None) -> None:
+        while True:
+            if self._document is not None:
+                self._document.close()
+                self._document = None
+            if not self._names:
+                raise error
+            name = self._names.pop(0)
+            try:
+                self._document = BACKENDS[name][1](self._source)
+                self.backend = name
+                return
+            except Exception as e:
+                logger.warning("PDF backend %s could not open the document: %s", name, e)
+                error = e
+
+    def extract(self, start: int, stop: int) -> List[str]:
+        while True:
+            try:
+                return self._document.extract(start, stop)
+            except Exception as e:
+                logger.warning(
+                    "PDF backend %s failed on pages %d-%d: %s", self.backend, start + 1, stop, e
+                )
+                self._next(e)
+
+    def close(self) -> None:
+        if self._document is not None:
+            self._document.close()
+            self._document = None
+
+def open_pdf(source: Source, names: Optional[Sequence[str]] = None) -> BackendChain:
+    return BackendChain(source, available_backends(names))
@@ -0,0 +1,208 @@
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .job_catalog import JobCatalog, top_postings
+from .job_filters import PostingSelection
+
+# (catalog, skills, top_k, allowed=None) -> [(posting_id, score)]; ``allowed``
+# is the PostingSelection of postings that passed the job filters.
+RankFn = Callable[..., List[Tuple[int, float]]]
+
+def top_k_from_scores(scores: np.ndarray, top_k: int) -> List[Tuple[int, int]]:
+    """Top-k of a dense per-posting score vector, ordered like ``top_postings``."""
+    posting_ids = np.flatnonzero(scores)
+    if not len(posting_ids) or top_k <= 0:
+        return []
+    values = scores[posting_ids].astype(np.int64)
+    k = min(top_k, len(posting_ids))
+    # Reversed rank as the low-order part of the key: earlier postings win ties.
+    keys = values * len(posting_ids) + np.arange(len(posting_ids) - 1, -1, -1)
+    top = np.argpartition(-keys, k - 1)[:k]
+    top = top[np.argsort(-keys[top])]
+    return [(int(posting_ids[i]), int(values[i])) for i in top]
+
+def _restrict(posting_ids: np.ndarray, allowed: Optional[PostingSelection]) -> np.ndarray:
+    # The dense mask makes restricting a posting list a single gather.
+    return posting_ids if allowed is None else posting_ids[allowed.mask[posting_ids]]
+
+def rank_index(
+    catalog: JobCatalog,
+    skills: Iterable[str],
+    top_k: int,
+    allowed: Optional[PostingSelection] = None,
+) -> List[Tuple[int, int]]:
+    if allowed is None:
+        return top_postings(catalog.match_counts(skills), top_k)
+    lists = [
+        _restrict(np.frombuffer(catalog.postings[skill_id], dtype=np.intc), allowed)
+        for skill_id in catalog.lookup_skills(skills)
+    ]
+    if not lists:
+        return []
+    return top_k_from_scores(np.bincount(np.concatenate(lists), minlength=len(catalog)), top_k)
+
+def _skill_bitsets(catalog: JobCatalog) -> np.ndarray:
+    bitsets = catalog.derived.get("bitsets")
+    if bitsets is None:
+        words = max(1, (len(catalog.skill_names) + 63) // 64)
+        skill_ids = np.frombuffer(catalog.skill_data, dtype=np.intc)
+        offsets = np.frombuffer(catalog.skill_offsets, dtype=np.int64)
+        rows = np.repeat(np.arange(len(catalog)), np.diff(offsets))
+        bitsets = np.zeros((len(catalog), words), dtype=np.uint64)
+        np.bitwise_or.at(
+            bitsets,
+            (rows, skill_ids // 64),
+            np.left_shift(np.uint64(1), (skill_ids % 64).astype(np.uint64)),
+        )
+        catalog.derived["bitsets"] = bitsets
+    return bitsets
+
+def rank_bitset(
+    catalog: JobCatalog,
+    skills: Iterable[str],
+    top_k: int,
+    allowed: Optional[PostingSelection] = None,
+) -> List[Tuple[int, int]]:
+    # Every posting is a fixed-width bitset over the catalog's skill ids, so
+    # overlap is an AND plus a popcount, vectorized across the whole catalog.
+    skill_ids = catalog.lookup_skills(skills)
+    if not skill_ids:
+        return []
+    bitsets = _skill_bitsets(catalog)
+    query = np.zeros(bitsets.shape[1], dtype=np.uint64)
+    for skill_id in skill_ids:
+        query[skill_id // 64] |= np.uint64(1) << np.uint64(skill_id % 64)
+    words = np.flatnonzero(query)
+    if allowed is None or len(allowed) * 2 > len(catalog):
+        # For a broad filter, scoring every row and masking beats the gather.
+        scores = np.bitwise_count(bitsets[:, words] & query[words]).sum(axis=1)
+        if allowed is not None:
+            scores[~allowed.mask] = 0
+        return top_k_from_scores(scores, top_k)
+    # Gather only the allowed rows' query words, not whole rows.
+    scores = np.bitwise_count(bitsets[np.ix_(allowed.ids, words)] & query[words]).sum(axis=1)
+    return [(int(allowed.ids[i]), score) for i, score in top_k_from_scores(scores, top_k)]
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+def _bm25_weights(catalog: JobCatalog, k1: float, b: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-skill IDF, per-posting length norm and per-skill score upper bound.
+
+    Skills are binary per posting (tf = 1), so a posting's BM25 contribution
+    for a skill is ``idf[skill] * norm[posting]`` and both factors can be
+    computed once per catalog.
+    """
+    key = ("bm25", k1, b)
+    weights = catalog.derived.get(key)
+    if weights is None:
+        skill_ids = np.frombuffer(catalog.skill_data, dtype=np.intc)
+        offsets = np.frombuffer(catalog.skill_offsets, dtype=np.int64)
+        lengths = np.diff(offsets).astype(np.float64)
+        avg_length = lengths.mean() if len(lengths) and lengths.mean() > 0 else 1.0
+        norms = (k1 + 1) / (1 + k1 * (1 - b + b * lengths / avg_length))
+
+        n_skills = len(catalog.skill_names)
+        df = np.bincount(skill_ids, minlength=n_skills).astype(np.float64)
+        idf = np.log1p((len(catalog) - df + 0.5) / (df + 0.5))
+        max_norm = np.zeros(n_skills)
+        rows = np.repeat(np.arange(len(catalog)), np.diff(offsets))
+        np.maximum.at(max_norm, skill_ids, norms[rows])
+        weights = (idf, norms, idf * max_norm)
+        catalog.derived[key] = weights
+    return weights
+
+def rank_bm25(
+    catalog: JobCatalog,
+    skills: Iterable[str],
+    top_k: int,
+    allowed: Optional[PostingSelection] = None,
+    k1: float = BM25_K1,
+    b: float = BM25_B,
+) -> List[Tuple[int, float]]:
+    skill_ids = catalog.lookup_skills(skills)
+    if not skill_ids or top_k <= 0:
+        return []
+    idf, norms, upper = _bm25_weights(catalog, k1, b)
+
+    # MaxScore, term at a time: take skills by decreasing upper bound. Once
+    # the bounds of the skills still to come add up to less than the current
+    # k-th best score, no unseen posting can enter the top-k, so the rest of
+    # the lists are only probed for the candidates already collected.
+    terms = sorted(skill_ids, key=lambda s: upper[s], reverse=True)
+    # Bounds of the skills after each one, summed from the tail so the last
+    # is exactly zero rather than a float residue.
+    remaining_after = np.cumsum([0.0] + [upper[s] for s in terms[:0:-1]])[::-1]
+    cand_ids = np.empty(0, dtype=np.intc)
+    cand_scores = np.empty(0, dtype=np.float64)
+    essential = True
+    for skill_id, remaining in zip(terms, remaining_after):
+        posting_ids = _restrict(np.frombuffer(catalog.postings[skill_id], dtype=np.intc), allowed)
+        if essential:
+            merged, inverse = np.unique(
+                np.concatenate([cand_ids, posting_ids]), return_inverse=True
+            )
+            cand_scores = np.bincount(
+                inverse,
+                weights=np.concatenate([cand_scores, idf[skill_id] * norms[posting_ids]]),
+                minlength=len(merged),
+            )
+            cand_ids = merged.astype(np.intc)
+        elif len(cand_ids) and len(posting_ids):
+            # Posting lists are sorted by id, so membership is a binary search.
+            pos = np.minimum(np.searchsorted(posting_ids, cand_ids), len(posting_ids) - 1)
+            hit = posting_ids[pos] == cand_ids
+            cand_scores[hit] += idf[skill_id] * norms[cand_ids[hit]]
+
+        if len(cand_scores) >= top_k:
+            threshold = np.partition(cand_scores, -top_k)[-top_k]
+            # Strict comparisons keep ties, which are broken by catalog order.
+            essential = essential and remaining >= threshold
+            keep = cand_scores + remaining >= threshold
+            cand_ids, cand_scores = cand_ids[keep], cand_scores[keep]
+
+    order = np.lexsort((cand_ids, -cand_scores))[:top_k]
+    return [(int(cand_ids[i]), float(cand_scores[i])) for i in order]
+
+def rank_semantic(
+    catalog: JobCatalog,
+    skills: Iterable[str],
+    top_k: int,
+    allowed: Optional[PostingSelection] = None,
+    text: Optional[str] = None,
+) -> List[Tuple[int, float]]:
+    # Cosine similarity of word-vector embeddings, so "postgres" can still
+    # find a "sql" posting. ``text`` (e.g. the whole resume) replaces the
+    # skill list as the query when given.
+    from .semantic_index import embed_texts, get_semantic_index
+
+    query = text if text else " ".join(skills)
+    if not query.strip():
+        return []
+    index = get_semantic_index(catalog)
+    return index.search(embed_texts([query])[0], top_k, allowed=allowed)
+
+ENGINES: Dict[str, RankFn] = {
+    "index": rank_index,
+    "bitset": rank_bitset,
+    "bm25": rank_bm25,
+    # With binary skills and no length normalization BM25 reduces to plain IDF.
+    "idf": partial(rank_bm25, b=0.0),
+    "semantic": rank_semantic,
+}
+
+# Engines whose score is the raw skill overlap; the others report overlap as
+# ``match_score`` and their own score as ``rank_score``.
+OVERLAP_ENGINES = frozenset({"index", "bitset"})
+# Engines that can rank against free text (a resume) rather than skills.
+TEXT_ENGINES = frozenset({"semantic"})
+
+def get_engine(name: str) -> RankFn:
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown ranking engine '{name}' (choose from {', '.join(ENGINES)})"
+        ) from None
@@ -0,0 +1,30 @@
+import time
+from typing import Callable, Optional
+
+from .tiered_cache import TieredCache
+
+class ResultCache(TieredCache):
+    """Computed results, each kept at most ``ttl`` seconds.
+
+    The in-process LRU holds ``max_entries`` results and is per-process.
+    The optional SQLite tier at ``disk_path`` holds ``disk_max_entries`` and
+    is shared by every process pointing at the same file (web workers, the
+    MCP server), so keys must mean the same thing in all of them.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 600.0,
+        disk_path: Optional[str] = None,
+        disk_max_entries: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(
+            "results",
+            max_entries=max_entries,
+            ttl=ttl,
+            disk_path=disk_path,
+            disk_max_entries=disk_max_entries,
+            clock=clock,
+        )
@@ -1,12 +1,65 @@
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
 import os
 import re
-from typing import Dict, Any
+import signal
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from PyPDF2 import PdfReader
-import spacy
+from .metrics import stage
+from .parse_cache import ParseCache
+from .pdf_backends import PdfDocument, available_backends, open_pdf
+from .skill_matcher import SkillMatcher
+
+logger = logging.getLogger(__name__)
 
 _SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
-nlp = spacy.load(_SPACY_MODEL)
+# "tokens" loads the model without its trained pipes and only tokenizes,
+# which is all parse_resume needs; "full" runs the whole pipeline.
+_SPACY_MODE = os.getenv("SPACY_MODE", "tokens")
+_TOKENS_ONLY_EXCLUDE = [
+    "tok2vec", "tagger", "morphologizer", "parser", "senter",
+    "attribute_ruler", "lemmatizer", "ner", "transformer",
+]
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+def get_nlp():
+    """Load the spaCy model on first use instead of at import time."""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+
+                if _SPACY_MODE == "tokens":
+                    _nlp = spacy.load(_SPACY_MODEL, exclude=_TOKENS_ONLY_EXCLUDE)
+                else:
+                    _nlp = spacy.load(_SPACY_MODEL)
+    return _nlp
+
+def __getattr__(name: str):
+    # Keeps `resume_parser.nlp` working for callers that used the eager global.
+    if name == "nlp":
+        return get_nlp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _make_doc(text: str):
+    nlp = get_nlp()
+    if _SPACY_MODE == "tokens":
+        return nlp.make_doc(text)
+    return nlp(text)
 
 DEFAULT_SKILLS_DB = [
     "python", "java", "excel", "data analysis", "sql",
@@ -14,48 +67,401 @@ DEFAULT_SKILLS_DB = [
     "fastapi", "docker", "kubernetes", "aws", "azure"
 ]
 
-def _extract_text_from_file(file_path: str) -> str:
+DEFAULT_SKILL_ALIASES = {
+    "ml": "machine learning",
+    "data analytics": "data analysis",
+    "cpp": "c++",
+    "js": "javascript",
+    "reactjs": "react",
+    "react.js": "react",
+    "mysql": "sql",
+    "postgres": "sql",
+    "postgresql": "sql",
+    "k8s": "kubernetes",
+    "amazon web services": "aws",
+    "microsoft azure": "azure",
+}
+
+_SKILLS_DB_PATH = os.getenv("SKILLS_DB_PATH")
+
+def _load_skills_taxonomy(path: str):
+    """Read a JSON taxonomy: a list of skills or a {skill: [aliases]} mapping."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return data, {}
+    aliases = {alias: skill for skill, names in data.items() for alias in names}
+    return list(data), aliases
+
+if _SKILLS_DB_PATH:
+    DEFAULT_SKILLS_DB, DEFAULT_SKILL_ALIASES = _load_skills_taxonomy(_SKILLS_DB_PATH)
+
+_default_matcher = SkillMatcher(DEFAULT_SKILLS_DB, DEFAULT_SKILL_ALIASES)
+
+@lru_cache(maxsize=8)
+def _matcher_for(skills_db: tuple) -> SkillMatcher:
+    return SkillMatcher(skills_db)
+
+# Page-level PDF extraction: at most PDF_MAX_PAGES pages and PDF_MAX_BYTES
+# bytes of text per document (0 = no limit); a parse cut short by either is
+# marked ``truncated`` in its summary. With PDF_PAGE_WORKERS > 0 pages are
+# extracted in that many worker processes, and a page still running
+# PDF_PAGE_TIMEOUT seconds after a worker started it is skipped. In-process
+# extraction cannot interrupt a page, so the timeout only applies with
+# workers.
+_PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "100"))
+_PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(2 * 1024 * 1024)))
+_PDF_PAGE_TIMEOUT = float(os.getenv("PDF_PAGE_TIMEOUT", "10"))
+_PDF_PAGE_WORKERS = int(os.getenv("PDF_PAGE_WORKERS", "0"))
+# Installed PDF_BACKENDS, in fallback order.
+_PDF_BACKEND_NAMES = tuple(available_backends())
+
+_RESUME_CACHE_SIZE = int(os.getenv("RESUME_CACHE_SIZE", "256"))
+_RESUME_CACHE_PATH = os.getenv("RESUME_CACHE_PATH")
+_RESUME_CACHE_DISK_MAX_ENTRIES = int(os.getenv("RESUME_CACHE_DISK_MAX_ENTRIES", "10000"))
+
+_parse_cache = ParseCache(
+    max_entries=_RESUME_CACHE_SIZE,
+    disk_path=_RESUME_CACHE_PATH,
+    disk_max_entries=_RESUME_CACHE_DISK_MAX_ENTRIES,
+)
+
+# Folded into every cache key so a changed taxonomy or spaCy setup never
+# serves results computed under the old one from the on-disk tier.
+_CACHE_NAMESPACE = hashlib.sha256(
+    json.dumps(
+        [
+            _SPACY_MODEL, _SPACY_MODE, DEFAULT_SKILLS_DB, DEFAULT_SKILL_ALIASES,
+            _PDF_MAX_PAGES, _PDF_MAX_BYTES, _PDF_BACKEND_NAMES,
+        ],
+        sort_keys=True,
+    ).encode("utf-8")
+).hexdigest()[:12]
+
+def _cache_key(data: bytes, ext: str) -> str:
+    return f"{hashlib.sha256(data).hexdigest()}{ext}:{_CACHE_NAMESPACE}"
+
+def get_parse_cache_stats() -> Dict[str, Any]:
+    return _parse_cache.stats()
+
+# Servers that parse in worker processes keep the cache in the parent: look
+# up there, send only misses to the pool with ``use_cache=False``, and store
+# what comes back. Otherwise every worker would hold its own split cache.
+def get_cached_parse(
+    data: bytes, ext: str, file_path: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    cached = _parse_cache.get(_cache_key(data, ext.lower()))
+    return {"file_path": file_path, **cached} if cached is not None else None
+
+def cache_parse(data: bytes, ext: str, result: Dict[str, Any]) -> None:
+    # A parse missing pages that timed out is not what the file holds;
+    # caching it would serve the truncated text to every retry.
+    if "error" not in result and not result["summary"].get("skipped_pages"):
+        _parse_cache.put(
+            _cache_key(data, ext.lower()), {k: v for k, v in result.items() if k != "file_path"}
+        )
+
+def read_resume_file(file_path: str) -> Tuple[bytes, str]:
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
 
     ext = os.path.splitext(file_path)[1].lower()
+    with stage("file_read"), open(file_path, "rb") as f:
+        return f.read(), ext
+
+class PageReport:
+    """What a budgeted PDF extraction left out of the text.
+
+    ``skipped`` holds the page ranges (1-based, inclusive) dropped after a
+    timeout or worker crash; ``truncated`` is set when PDF_MAX_PAGES or
+    PDF_MAX_BYTES cut the document short.
+    """
+
+    __slots__ = ("skipped", "truncated")
+
+    def __init__(self) -> None:
+        self.skipped: List[Tuple[int, int]] = []
+        self.truncated = False
+
+class PageTimeout(Exception):
+    """A page task ran past its deadline inside the worker."""
+
+_page_pool: Optional[ProcessPoolExecutor] = None
+_page_pool_lock = threading.Lock()
+# Per worker process: the document whose pages it is currently extracting.
+_page_document: Optional[Tuple[str, PdfDocument]] = None
+
+def _get_page_pool(workers: int) -> ProcessPoolExecutor:
+    global _page_pool
+    if _page_pool is None:
+        with _page_pool_lock:
+            if _page_pool is None:
+                _page_pool = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                )
+    return _page_pool
+
+def _recycle_page_pool(pool: ProcessPoolExecutor) -> None:
+    """Kill ``pool``'s workers so a hung page cannot hold one forever.
+
+    Only for a page the worker's own alarm could not interrupt (stuck in C
+    code): ``Future.cancel`` cannot stop a running task. Documents still
+    using the old pool see ``BrokenProcessPool`` and resubmit to the next
+    one.
+    """
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is pool:
+            _page_pool = None
+    # No public API stops a busy ProcessPoolExecutor worker.
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+# Pages per worker task: enough to amortize the IPC round trip.
+_PAGES_PER_TASK = 4
+# Resubmissions of a page task after its pool broke before it is skipped.
+_PAGE_TASK_RETRIES = 2
+# Slack for the parent's backstop: a task is marked running when it is
+# queued for a worker, possibly behind one other task, and a fresh pool
+# still has to start its processes.
+_PAGE_BACKSTOP_GRACE = 5.0
+
+def _extract_pdf_pages(
+    path: str, doc_id: str, backends: Sequence[str], start: int, stop: int
+) -> List[str]:
+    global _page_document
+    if _page_document is None or _page_document[0] != doc_id:
+        if _page_document is not None:
+            _page_document[1].close()
+            _page_document = None
+        _page_document = (doc_id, open_pdf(path, backends))
+    try:
+        return _page_document[1].extract(start, stop)
+    except BaseException:
+        # An interrupted backend may be mid-read; reopen for the next task.
+        _page_document[1].close()
+        _page_document = None
+        raise
+
+def _raise_page_timeout(signum, frame) -> None:
+    raise PageTimeout()
+
+def _call_with_deadline(fn: Callable, timeout: Optional[float], *args: Any) -> Any:
+    """Run ``fn(*args)`` in a worker, raising PageTimeout after ``timeout`` seconds.
+
+    The alarm is set when the worker picks the task up, so time spent
+    queued behind other documents' pages does not count.
+    """
+    if not timeout or not hasattr(signal, "setitimer"):
+        return fn(*args)
+    previous = signal.signal(signal.SIGALRM, _raise_page_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return fn(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+def _await_page_task(future: Future, timeout: Optional[float]) -> List[str]:
+    # The worker enforces ``timeout`` itself. The parent gives up, with
+    # FutureTimeout, only on a task the alarm failed to stop, and starts
+    # that clock once the task is running rather than while it is queued.
+    if not timeout:
+        return future.result()
+    running_since: Optional[float] = None
+    while True:
+        try:
+            return future.result(timeout=min(timeout, 0.5))
+        except FutureTimeout:
+            if running_since is None:
+                if future.running():
+                    running_since = time.monotonic()
+            elif time.monotonic() - running_since > 2 * timeout + _PAGE_BACKSTOP_GRACE:
+                raise
+
+def _iter_pages_in_workers(
+    data: bytes,
+    page_count: int,
+    workers: int,
+    page_timeout: Optional[float],
+    report: PageReport,
+) -> Iterator[str]:
+    # Workers read the document from a temp file once each instead of
+    # receiving the whole PDF with every page task.
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    doc_id = uuid.uuid4().hex
+    pending: deque = deque()
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+
+        def submit(start: int, stop: int) -> Tuple[ProcessPoolExecutor, Future]:
+            timeout = page_timeout * (stop - start) if page_timeout else None
+            for _ in range(2):
+                pool = _get_page_pool(workers)
+                try:
+                    return pool, pool.submit(
+                        _call_with_deadline, _extract_pdf_pages, timeout,
+                        path, doc_id, _PDF_BACKEND_NAMES, start, stop,
+                    )
+                except (BrokenProcessPool, RuntimeError):
+                    # Broken by a crash, or shut down by a recycle, since
+                    # it was fetched; replace it and try a fresh one.
+                    _recycle_page_pool(pool)
+            failed: Future = Future()
+            failed.set_exception(BrokenProcessPool("The PDF page pool keeps breaking"))
+            return pool, failed
+
+        next_page = 0
+        while next_page < page_count or pending:
+            while next_page < page_count and len(pending) < workers * 2:
+                stop = min(next_page + _PAGES_PER_TASK, page_count)
+                pending.append((next_page, stop, *submit(next_page, stop)))
+                next_page = stop
+            start, stop, pool, future = pending.popleft()
+            timeout = page_timeout * (stop - start) if page_timeout else None
+            pages: Optional[List[str]] = None
+            for attempt in range(_PAGE_TASK_RETRIES + 1):
+                try:
+                    pages = _await_page_task(future, timeout)
+                    break
+                except BrokenProcessPool:
+                    # A worker crashed, or another document's hung page
+                    # recycled the pool; resubmit a bounded number of times.
+                    _recycle_page_pool(pool)
+                    reason = "the page worker pool broke"
+                    if attempt < _PAGE_TASK_RETRIES:
+                        pool, future = submit(start, stop)
+                except PageTimeout:
+                    reason = f"took over {page_timeout}s per page"
+                    break
+                except FutureTimeout:
+                    _recycle_page_pool(pool)
+                    reason = "hung past the page timeout; page workers restarted"
+                    break
+            if pages is None:
+                report.skipped.append((start + 1, stop))
+                logger.warning("PDF pages %d-%d skipped: %s", start + 1, stop, reason)
+                continue
+            yield from pages
+    finally:
+        for _, _, _, future in pending:
+            future.cancel()
+        os.unlink(path)
+
+def iter_pdf_pages(
+    data: bytes,
+    max_pages: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    page_timeout: Optional[float] = None,
+    workers: Optional[int] = None,
+    report: Optional[PageReport] = None,
+) -> Iterator[str]:
+    """Yield the text of each PDF page in order, within a page/size budget.
+
+    Text comes from the first working backend in PDF_BACKENDS (see
+    ``pdf_backends``) and arguments default to the PDF_* settings.
+    Extraction stops after ``max_pages`` pages or once ``max_bytes`` of
+    UTF-8 text have been yielded (the last page is cut to fit), and closing
+    the generator early cancels the pages not yet extracted. ``report``
+    records skipped page ranges and whether the budget cut the text, so
+    callers can tell it is incomplete.
+    """
+    max_pages = _PDF_MAX_PAGES if max_pages is None else max_pages
+    max_bytes = _PDF_MAX_BYTES if max_bytes is None else max_bytes
+    page_timeout = _PDF_PAGE_TIMEOUT if page_timeout is None else page_timeout
+    workers = _PDF_PAGE_WORKERS if workers is None else workers
+
+    report = PageReport() if report is None else report
+
+    document = open_pdf(data, _PDF_BACKEND_NAMES)
+    try:
+        page_count = document.page_count
+        if 0 < max_pages < page_count:
+            page_count = max_pages
+            report.truncated = True
+        if workers > 0 and page_count > 1:
+            pages = _iter_pages_in_workers(data, page_count, workers, page_timeout, report)
+        else:
+            pages = _iter_document_pages(document, page_count)
+
+        remaining = max_bytes if max_bytes > 0 else None
+        for text in pages:
+            if not text:
+                continue
+            if remaining is not None:
+                encoded = text.encode("utf-8")
+                if len(encoded) > remaining:
+                    report.truncated = True
+                    text = encoded[:remaining].decode("utf-8", errors="ignore")
+                    if text:
+                        yield text
+                    return
+                remaining -= len(encoded)
+            yield text
+    finally:
+        document.close()
+
+def _iter_document_pages(document: PdfDocument, page_count: int) -> Iterator[str]:
+    # Subprocess backends pay per call, so ask for a few pages at a time.
+    for start in range(0, page_count, _PAGES_PER_TASK):
+        yield from document.extract(start, min(start + _PAGES_PER_TASK, page_count))
+
+def iter_resume_pages(data: bytes, **budget: Any) -> Iterator[Dict[str, Any]]:
+    """Contacts and skills page by page, for callers that can stop early.
+
+    Each item holds the page number and what was found on that page;
+    ``budget`` is passed to ``iter_pdf_pages``.
+    """
+    for number, text in enumerate(iter_pdf_pages(data, **budget), 1):
+        yield {
+            "page": number,
+            "emails": _extract_emails(text),
+            "phones": _extract_phones(text),
+            "skills": _extract_skills(text),
+        }
+
+def _extract_text_from_bytes(
+    data: bytes, ext: str, report: Optional[PageReport] = None
+) -> str:
     if ext == ".pdf":
-        reader = PdfReader(file_path)
-        texts = []
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                texts.append(page_text)
-        return "\n".join(texts)
+        with stage("pdf_extract"):
+            return "\n".join(iter_pdf_pages(data, report=report))
     elif ext in (".txt",):
-        with open(file_path, "r", encoding="utf-8") as f:
-            return f.read()
+        with stage("txt_decode"):
+            return io.TextIOWrapper(io.BytesIO(data), encoding="utf-8").read()
     else:
         raise ValueError(f"Unsupported file type: {ext}")
 
+def _extract_text_from_file(file_path: str, report: Optional[PageReport] = None) -> str:
+    data, ext = read_resume_file(file_path)
+    return _extract_text_from_bytes(data, ext, report)
+
 def _extract_emails(text: str):
     return re.findall(r"\b\S+@\S+\b", text)
 
 def _extract_phones(text: str):
     return re.findall(r"\+?\d[\d\s\-]{7,}\d", text)
 
-def _extract_skills(text: str, skills_db=None):
+def _extract_skills(text: str, skills_db=None) -> List[str]:
     if skills_db is None:
-        skills_db = DEFAULT_SKILLS_DB
-    text_lower = text.lower()
-    matched = []
-    for skill in skills_db:
-        if skill.lower() in text_lower:
-            matched.append(skill)
-    return sorted(set(matched))
-
-def parse_resume(file_path: str) -> Dict[str, Any]:
-    raw_text = _extract_text_from_file(file_path)
-    doc = nlp(raw_text)  
+        matcher = _default_matcher
+    else:
+        matcher = _matcher_for(tuple(skills_db))
+    return matcher.find(text)
 
-    emails = _extract_emails(raw_text)
-    phones = _extract_phones(raw_text)
-    skills = _extract_skills(raw_text)
+def _build_result(
+    file_path: Optional[str],
+    raw_text: str,
+    doc,
+    report: Optional[PageReport] = None,
+) -> Dict[str, Any]:
+    with stage("contacts"):
+        emails = _extract_emails(raw_text)
+        phones = _extract_phones(raw_text)
+    with stage("skill_match"):
+        skills = _extract_skills(raw_text)
 
     result: Dict[str, Any] = {
         "file_path": file_path,
@@ -64,8 +470,129 @@ def parse_resume(file_path: str) -> Dict[str, Any]:
         "skills": skills,
         "summary": {
             "num_chars": len(raw_text),
-            "num_tokens": len(list(doc)),
+            "num_tokens": len(doc),
+            "truncated": report is not None and report.truncated,
         },
         "raw_text": raw_text,
     }
-    return result
\ No newline at end of file
+    if report is not None and report.skipped:
+        result["summary"]["skipped_pages"] = [list(pages) for pages in report.skipped]
+    return result
+
+def parse_resume_bytes(
+    data: bytes, ext: str, file_path: Optional[str] = None, use_cache: bool = True
+) -> Dict[str, Any]:
+    """Parse a resume held in memory; ``ext`` is the file extension, e.g. ".pdf".
+
+    ``file_path`` is only echoed back in the result.
+    """
+    ext = ext.lower()
+    if use_cache:
+        cached = get_cached_parse(data, ext, file_path)
+        if cached is not None:
+            return cached
+
+    report = PageReport()
+    raw_text = _extract_text_from_bytes(data, ext, report)
+    with stage("spacy"):
+        doc = _make_doc(raw_text)
+    result = _build_result(file_path, raw_text, doc, report)
+    if use_cache:
+        cache_parse(data, ext, result)
+    return result
+
+def parse_resume(file_path: str) -> Dict[str, Any]:
+    data, ext = read_resume_file(file_path)
+    return parse_resume_bytes(data, ext, file_path)
+
+def _format_error(e: Exception) -> str:
+    return f"{type(e).__name__}: {e}"
+
+def parse_resume_bytes_batch(
+    items: Sequence[Tuple[bytes, str, Optional[str]]], batch_size: int = 32, use_cache: bool = True
+) -> List[Dict[str, Any]]:
+    """Parse several in-memory resumes with a single ``nlp.pipe`` call.
+
+    ``items`` are ``(data, ext, file_path)`` tuples. Cache hits skip
+    extraction and NLP; a resume that fails to extract comes back as
+    ``{"file_path": ..., "error": ...}``.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    pending = []
+    for i, (data, ext, file_path) in enumerate(items):
+        ext = ext.lower()
+        cached = get_cached_parse(data, ext, file_path) if use_cache else None
+        if cached is not None:
+            results[i] = cached
+            continue
+        report = PageReport()
+        try:
+            raw_text = _extract_text_from_bytes(data, ext, report)
+        except Exception as e:
+            results[i] = {"file_path": file_path, "error": _format_error(e)}
+            continue
+        pending.append((raw_text, (i, data, ext, file_path, report)))
+
+    if pending:
+        with stage("spacy"):
+            docs = list(get_nlp().pipe(pending, as_tuples=True, batch_size=batch_size))
+        for doc, (i, data, ext, file_path, report) in docs:
+            result = _build_result(file_path, doc.text, doc, report)
+            if use_cache:
+                cache_parse(data, ext, result)
+            results[i] = result
+    return results
+
+def _extract_or_error(file_path: str) -> Tuple[str, str, Optional[str], PageReport]:
+    report = PageReport()
+    try:
+        return file_path, _extract_text_from_file(file_path, report), None, report
+    except Exception as e:
+        return file_path, "", _format_error(e), report
+
+def _ordered_map(pool: Executor, fn: Callable, items: Iterable, window: int) -> Iterator:
+    # Like pool.map, but keeps at most `window` tasks in flight so a large
+    # input stream is not materialized up front.
+    pending: deque = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def parse_resumes(
+    paths: Iterable[str], n_process: int = 1, batch_size: int = 32
+) -> Iterator[Dict[str, Any]]:
+    """Parse many resumes, yielding results in input order as they are ready.
+
+    Text extraction runs in ``n_process`` worker processes while the main
+    process feeds the extracted texts through ``nlp.pipe`` in batches of
+    ``batch_size``. A file that cannot be read yields
+    ``{"file_path": ..., "error": ...}`` instead of stopping the stream.
+    """
+    nlp = get_nlp()
+    pool = (
+        ProcessPoolExecutor(max_workers=n_process, mp_context=multiprocessing.get_context("spawn"))
+        if n_process > 1 else None
+    )
+    try:
+        if pool is not None:
+            extracted = _ordered_map(pool, _extract_or_error, paths, n_process * batch_size)
+        else:
+            extracted = map(_extract_or_error, paths)
+
+        # Failed files go through the pipe as empty texts so output order holds.
+        docs = nlp.pipe(
+            ((raw_text, (path, error, report)) for path, raw_text, error, report in extracted),
+            as_tuples=True,
+            batch_size=batch_size,
+        )
+        for doc, (path, error, report) in docs:
+            if error is not None:
+                yield {"file_path": path, "error": error}
+            else:
+                yield _build_result(path, doc.text, doc, report)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
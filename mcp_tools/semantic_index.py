@@ -0,0 +1,261 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .job_catalog import JobCatalog
+from .job_filters import PostingSelection
+
+logger = logging.getLogger(__name__)
+
+# Any installed spaCy package or model directory with word vectors; it is
+# loaded from disk only, never downloaded.
+_SEMANTIC_MODEL = os.getenv("SEMANTIC_SPACY_MODEL", "en_core_web_md")
+_SEMANTIC_INDEX_DIR = os.getenv(
+    "SEMANTIC_INDEX_DIR", os.path.join(tempfile.gettempdir(), "job-recommender-semantic")
+)
+_SEMANTIC_NPROBE = int(os.getenv("SEMANTIC_NPROBE", "16"))
+# Index directories kept under SEMANTIC_INDEX_DIR, most recently used first;
+# each catalog version gets its own, and older ones are deleted.
+_SEMANTIC_INDEX_KEEP = max(1, int(os.getenv("SEMANTIC_INDEX_KEEP", "2")))
+_FINGERPRINT_NAME = re.compile(r"[0-9a-f]{24}")
+# Below this many postings a single list is searched exhaustively.
+_IVF_MIN_POSTINGS = 4096
+_KMEANS_ITERATIONS = 10
+
+_nlp = None
+_nlp_lock = threading.Lock()
+_build_lock = threading.Lock()
+
+def _model_meta() -> Dict[str, Any]:
+    """The vectors model's meta.json, read without loading the model."""
+    from spacy import util
+
+    if util.is_package(_SEMANTIC_MODEL):
+        return util.get_model_meta(util.get_package_path(_SEMANTIC_MODEL))
+    return util.get_model_meta(Path(_SEMANTIC_MODEL))
+
+def get_vectors_nlp():
+    """Load the vectors model on first use: tokenizer and vocab vectors only."""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+
+                # spaCy has no wildcard exclude: name every trained pipe.
+                meta = _model_meta()
+                pipes = meta.get("components") or meta.get("pipeline") or []
+                nlp = spacy.load(_SEMANTIC_MODEL, exclude=list(pipes))
+                if nlp.vocab.vectors.shape[0] == 0:
+                    raise ValueError(
+                        f"spaCy model '{_SEMANTIC_MODEL}' has no word vectors "
+                        "(set SEMANTIC_SPACY_MODEL to e.g. en_core_web_md)"
+                    )
+                _nlp = nlp
+    return _nlp
+
+def embed_texts(texts: Iterable[str], batch_size: int = 256) -> np.ndarray:
+    """Unit-length float32 rows: the mean of each text's word vectors."""
+    nlp = get_vectors_nlp()
+    rows = [
+        doc.vector
+        for doc in nlp.tokenizer.pipe((t.lower() for t in texts), batch_size=batch_size)
+    ]
+    if not rows:
+        return np.empty((0, nlp.vocab.vectors.shape[1]), dtype=np.float32)
+    matrix = np.asarray(rows, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+def posting_text(catalog: JobCatalog, posting_id: int) -> str:
+    parts = [catalog.columns["title"][posting_id] or ""]
+    parts.extend(catalog.skill_names[s] for s in catalog.posting_skill_ids(posting_id))
+    parts.append(catalog.columns["description"][posting_id] or "")
+    return " ".join(parts)
+
+def _fingerprint(catalog: JobCatalog) -> str:
+    meta = _model_meta()
+    digest = hashlib.sha256()
+    model = [_SEMANTIC_MODEL, meta.get("version"), meta.get("vectors")]
+    digest.update(json.dumps(model, sort_keys=True).encode())
+    if catalog.fingerprint is not None:
+        # Already identifies the source files; no need to read every posting.
+        digest.update(catalog.fingerprint.encode())
+        return digest.hexdigest()[:24]
+    # Catalogs built in memory: hash what gets embedded.
+    for posting_id in range(len(catalog)):
+        digest.update(posting_text(catalog, posting_id).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:24]
+
+def _train_centroids(vectors: np.ndarray, nlist: int, seed: int = 0) -> np.ndarray:
+    # Spherical k-means on a sample: centroids stay unit length, so the
+    # closest list is the one with the largest dot product.
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), nlist * 64)
+    sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))])
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+    for _ in range(_KMEANS_ITERATIONS):
+        assign = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        empty = norms[:, 0] == 0
+        sums[empty] = centroids[empty]
+        norms[empty] = 1.0
+        centroids = (sums / norms).astype(np.float32)
+    return centroids
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray, chunk: int = 65536) -> np.ndarray:
+    assign = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), chunk):
+        block = np.asarray(vectors[start:start + chunk])
+        assign[start:start + chunk] = np.argmax(block @ centroids.T, axis=1)
+    return assign
+
+class SemanticIndex:
+    """IVF index over a memory-mapped float32 matrix of posting embeddings.
+
+    Postings are clustered into ``nlist`` inverted lists around k-means
+    centroids; a query only scores the postings of its ``nprobe`` nearest
+    lists. The matrix and lists live in a directory keyed by the model and
+    the catalog's source files (its contents, for catalogs built in memory),
+    so every process (and every restart) maps the same files.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.path = path
+        self.vectors = np.memmap(
+            os.path.join(path, "vectors.f32"), dtype=np.float32, mode="r",
+            shape=(meta["postings"], meta["dim"]),
+        )
+        self.centroids = np.load(os.path.join(path, "centroids.npy"), mmap_mode="r")
+        self.list_offsets = np.load(os.path.join(path, "list_offsets.npy"), mmap_mode="r")
+        self.list_ids = np.load(os.path.join(path, "list_ids.npy"), mmap_mode="r")
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls, catalog: JobCatalog, path: str, batch_size: int = 4096) -> "SemanticIndex":
+        parent = os.path.dirname(path)
+        os.makedirs(parent, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=parent, prefix=".build-")
+        try:
+            dim = get_vectors_nlp().vocab.vectors.shape[1]
+            vectors = np.memmap(
+                os.path.join(tmp, "vectors.f32"), dtype=np.float32, mode="w+",
+                shape=(max(len(catalog), 1), dim),
+            )
+            for start in range(0, len(catalog), batch_size):
+                end = min(start + batch_size, len(catalog))
+                vectors[start:end] = embed_texts(
+                    posting_text(catalog, p) for p in range(start, end)
+                )
+            vectors.flush()
+            vectors = vectors[:len(catalog)]
+
+            if len(catalog) >= _IVF_MIN_POSTINGS:
+                nlist = min(int(np.sqrt(len(catalog))), 4096)
+                centroids = _train_centroids(vectors, nlist)
+                assign = _assign(vectors, centroids)
+            else:
+                centroids = np.zeros((1, dim), dtype=np.float32)
+                assign = np.zeros(len(catalog), dtype=np.int32)
+            # A stable sort keeps every list in posting-id order.
+            list_ids = np.argsort(assign, kind="stable").astype(np.int32)
+            list_offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(assign, minlength=len(centroids)), out=list_offsets[1:])
+
+            np.save(os.path.join(tmp, "centroids.npy"), centroids)
+            np.save(os.path.join(tmp, "list_offsets.npy"), list_offsets)
+            np.save(os.path.join(tmp, "list_ids.npy"), list_ids)
+            with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump({"postings": len(catalog), "dim": dim, "model": _SEMANTIC_MODEL}, f)
+            try:
+                os.replace(tmp, path)
+            except OSError:
+                if not os.path.isdir(path):  # else another process won the race
+                    raise
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        return cls(path)
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        nprobe: Optional[int] = None,
+        allowed: Optional[PostingSelection] = None,
+    ) -> List[Tuple[int, float]]:
+        """Top-k ``(posting_id, cosine)``; ``allowed`` restricts the result."""
+        if top_k <= 0 or not query.any():
+            return []
+        nprobe = min(nprobe or _SEMANTIC_NPROBE, self.nlist)
+        probed_size = len(self.vectors) * nprobe / self.nlist
+        if allowed is not None and len(allowed) <= probed_size:
+            # A filter this selective is cheaper (and exact) to scan directly.
+            posting_ids = allowed.ids
+        else:
+            if nprobe < self.nlist:
+                probe = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+            else:
+                probe = range(self.nlist)
+            posting_ids = np.sort(np.concatenate(
+                [self.list_ids[self.list_offsets[c]:self.list_offsets[c + 1]] for c in probe]
+            ))
+            if allowed is not None:
+                posting_ids = posting_ids[allowed.mask[posting_ids]]
+        scores = self.vectors[posting_ids] @ query
+        keep = scores > 0
+        posting_ids, scores = posting_ids[keep], scores[keep]
+        order = np.lexsort((posting_ids, -scores))[:top_k]
+        return [(int(posting_ids[i]), float(scores[i])) for i in order]
+
+def _prune_indexes(current: str) -> None:
+    """Delete all but the SEMANTIC_INDEX_KEEP most recently used indexes.
+
+    Processes still mapping a deleted index keep reading it; the files
+    only go away once the last mapping is closed.
+    """
+    try:
+        names = [n for n in os.listdir(_SEMANTIC_INDEX_DIR) if _FINGERPRINT_NAME.fullmatch(n)]
+    except OSError:
+        return
+    paths = [os.path.join(_SEMANTIC_INDEX_DIR, n) for n in names]
+    paths.sort(key=lambda p: os.stat(p).st_mtime if os.path.exists(p) else 0.0, reverse=True)
+    keep = {current, *paths[:_SEMANTIC_INDEX_KEEP]}
+    for path in paths:
+        if path not in keep:
+            logger.info("Removing stale semantic index %s", path)
+            shutil.rmtree(path, ignore_errors=True)
+
+def get_semantic_index(catalog: JobCatalog) -> SemanticIndex:
+    index = catalog.derived.get("semantic")
+    if index is None:
+        with _build_lock:
+            index = catalog.derived.get("semantic")
+            if index is None:
+                path = os.path.join(_SEMANTIC_INDEX_DIR, _fingerprint(catalog))
+                if os.path.isfile(os.path.join(path, "meta.json")):
+                    index = SemanticIndex(path)
+                else:
+                    index = SemanticIndex.build(catalog, path)
+                # The mtime marks it as recently used for pruning.
+                os.utime(path)
+                _prune_indexes(path)
+                catalog.derived["semantic"] = index
+    return index
@@ -1,16 +1,124 @@
 import asyncio
 import json
-from typing import List, Sequence
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent, ImageContent, EmbeddedResource
 
-from .resume_parser import parse_resume as core_parse_resume
-from .job_recommender import recommend_jobs as core_recommend_jobs
+from .resume_parser import (
+    cache_parse,
+    get_cached_parse,
+    parse_resume_bytes as core_parse_resume_bytes,
+    read_resume_file,
+)
+from .job_recommender import (
+    recommend_jobs as core_recommend_jobs,
+    recommend_jobs_batch as core_recommend_jobs_batch,
+    start_catalog_reloader,
+    stop_catalog_reloader,
+)
+from .metrics import (
+    MCP_TOOL_SECONDS,
+    METRICS_ENABLED,
+    collect_timings,
+    record_timings,
+    render_prometheus,
+    server_timing,
+    timed_call,
+)
+from .worker_pool import create_parse_executor, warm_up
+
+logger = logging.getLogger(__name__)
+
+# Tool calls run off the event loop so one slow PDF never stalls the session:
+# parsing in MCP_PARSE_WORKERS warm processes (spaCy preloaded), ranking in
+# MCP_THREAD_WORKERS threads sharing the preloaded in-process catalog.
+MCP_PARSE_WORKERS = int(os.getenv("MCP_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+MCP_THREAD_WORKERS = int(os.getenv("MCP_THREAD_WORKERS", "4"))
+# stdio has no HTTP side, so /metrics is served on this port when it is set.
+MCP_METRICS_PORT = os.getenv("MCP_METRICS_PORT")
+
+_parse_pool: Optional[Executor] = None
+_thread_pool: Optional[Executor] = None
 
 server = Server("resume-job-matcher")
 
+def _pools() -> tuple:
+    global _parse_pool, _thread_pool
+    if _parse_pool is None:
+        _parse_pool = create_parse_executor(MCP_PARSE_WORKERS)
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(
+            max_workers=MCP_THREAD_WORKERS, thread_name_prefix="mcp-tool"
+        )
+    return _parse_pool, _thread_pool
+
+def _shutdown_pools() -> None:
+    global _parse_pool, _thread_pool
+    for pool in (_parse_pool, _thread_pool):
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    _parse_pool = _thread_pool = None
+
+_FILTERS_SCHEMA = {
+    "type": "object",
+    "description": "Only consider postings matching every given filter",
+    "properties": {
+        "location": {
+            "type": "string",
+            "description": "Words that must all appear in the posting's location",
+        },
+        "remote": {"type": "boolean", "description": "Remote postings only (false: on-site only)"},
+        "title_keyword": {
+            "type": "string",
+            "description": "Words that must all appear in the posting's title",
+        },
+    },
+    "additionalProperties": False,
+}
+
+def _text_result(payload: Any, compact: bool = False) -> List[TextContent]:
+    if compact:
+        text = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    else:
+        text = json.dumps(payload, indent=2)
+    return [TextContent(type="text", text=text)]
+
+def _apply_raw_text_mode(parsed: dict, mode: str, max_chars: int) -> dict:
+    raw_text = parsed.get("raw_text") or ""
+    if mode == "omit":
+        parsed.pop("raw_text", None)
+    elif mode == "truncate" and len(raw_text) > max_chars:
+        parsed["raw_text"] = raw_text[:max_chars]
+        parsed["raw_text_truncated"] = True
+    return parsed
+
+async def _run(pool: Executor, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+    # If the client cancels the request, the awaiting task is cancelled and
+    # asyncio cancels the pool future with it: queued work never starts, and
+    # work already running finishes in the background with its result dropped.
+    future = pool.submit(timed_call, fn, *args, **kwargs)
+    result, timings = await asyncio.wrap_future(future)
+    record_timings(timings)
+    return result
+
+async def _parse_resume(file_path: str) -> dict:
+    # Read and look up the cache here, so every parse worker shares this
+    # process's cache; only misses are parsed in the pool.
+    parse_pool, thread_pool = _pools()
+    data, ext = await _run(thread_pool, read_resume_file, file_path)
+    parsed = await _run(thread_pool, get_cached_parse, data, ext, file_path)
+    if parsed is None:
+        parsed = await _run(parse_pool, core_parse_resume_bytes, data, ext, file_path, False)
+        await _run(thread_pool, cache_parse, data, ext, parsed)
+    return parsed
+
 @server.list_tools()
 async def list_tools() -> List[Tool]:
     """Return the list of tools this MCP server exposes."""
@@ -45,37 +153,149 @@ async def list_tools() -> List[Tool]:
                         "description": "Maximum number of jobs to return",
                         "default": 5,
                     },
+                    "filters": _FILTERS_SCHEMA,
                 },
                 "required": ["skills"],
             },
         ),
+        Tool(
+            name="recommend_jobs_batch",
+            description="Suggest jobs for many candidates at once, one skill list per candidate.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "skills_batch": {
+                        "type": "array",
+                        "items": {"type": "array", "items": {"type": "string"}},
+                        "description": "One list of skill names per candidate",
+                    },
+                    "top_k": {
+                        "type": "integer",
+                        "description": "Maximum number of jobs to return per candidate",
+                        "default": 5,
+                    },
+                    "filters": _FILTERS_SCHEMA,
+                },
+                "required": ["skills_batch"],
+            },
+        ),
+        Tool(
+            name="parse_and_recommend",
+            description="Parse a resume file (PDF/TXT) and suggest jobs for its skills in one call.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "file_path": {
+                        "type": "string",
+                        "description": "Path to the resume file (PDF/TXT)",
+                    },
+                    "top_k": {
+                        "type": "integer",
+                        "description": "Maximum number of jobs to return",
+                        "default": 5,
+                    },
+                    "raw_text": {
+                        "type": "string",
+                        "enum": ["omit", "truncate", "full"],
+                        "description": "Whether to include the extracted resume text",
+                        "default": "omit",
+                    },
+                    "raw_text_max_chars": {
+                        "type": "integer",
+                        "description": "Length kept when raw_text is 'truncate'",
+                        "default": 2000,
+                    },
+                    "compact": {
+                        "type": "boolean",
+                        "description": "Return JSON without indentation",
+                        "default": True,
+                    },
+                    "filters": _FILTERS_SCHEMA,
+                },
+                "required": ["file_path"],
+            },
+        ),
     ]
 
+_TOOL_NAMES = frozenset(
+    {"parse_resume", "recommend_jobs", "recommend_jobs_batch", "parse_and_recommend"}
+)
+
 @server.call_tool()
 async def call_tool(
     name: str, arguments: dict
+) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+    if not METRICS_ENABLED:
+        return await _call_tool(name, arguments)
+    started = time.perf_counter()
+    status = "cancelled"
+    with collect_timings() as timings:
+        try:
+            result = await _call_tool(name, arguments)
+            status = "error" if result and result[0].text.startswith("Error") else "ok"
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            # Only known names become label values, so clients cannot grow the series.
+            MCP_TOOL_SECONDS.observe(elapsed, name if name in _TOOL_NAMES else "unknown", status)
+            logger.debug("Tool %s %s: %s", name, status, server_timing(timings, elapsed))
+
+async def _call_tool(
+    name: str, arguments: dict
 ) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
     try:
         if name == "parse_resume":
-            file_path = arguments["file_path"]
-            result = core_parse_resume(file_path)
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(result, indent=2),
-                )
-            ]
+            result = await _parse_resume(arguments["file_path"])
+            return _text_result(result)
 
         elif name == "recommend_jobs":
             skills = arguments.get("skills", [])
             top_k = int(arguments.get("top_k", 5))
-            jobs = core_recommend_jobs(skills, top_k=top_k)
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(jobs, indent=2),
+            _, thread_pool = _pools()
+            jobs = await _run(
+                thread_pool,
+                core_recommend_jobs,
+                skills,
+                top_k=top_k,
+                filters=arguments.get("filters"),
+            )
+            return _text_result(jobs)
+
+        elif name == "recommend_jobs_batch":
+            skills_batch = arguments.get("skills_batch", [])
+            top_k = int(arguments.get("top_k", 5))
+            _, thread_pool = _pools()
+            jobs = await _run(
+                thread_pool,
+                core_recommend_jobs_batch,
+                skills_batch,
+                top_k=top_k,
+                filters=arguments.get("filters"),
+            )
+            return _text_result(jobs)
+
+        elif name == "parse_and_recommend":
+            file_path = arguments["file_path"]
+            top_k = int(arguments.get("top_k", 5))
+            raw_text_mode = arguments.get("raw_text", "omit")
+            if raw_text_mode not in ("omit", "truncate", "full"):
+                raise ValueError(
+                    f"raw_text must be 'omit', 'truncate' or 'full', not {raw_text_mode!r}"
                 )
-            ]
+            max_chars = int(arguments.get("raw_text_max_chars", 2000))
+            compact = bool(arguments.get("compact", True))
+            _, thread_pool = _pools()
+            parsed = await _parse_resume(file_path)
+            jobs = await _run(
+                thread_pool,
+                core_recommend_jobs,
+                parsed.get("skills", []),
+                top_k=top_k,
+                text=parsed.get("raw_text"),
+                filters=arguments.get("filters"),
+            )
+            parsed = _apply_raw_text_mode(parsed, raw_text_mode, max_chars)
+            return _text_result({"resume": parsed, "recommendations": jobs}, compact=compact)
 
         else:
             return [
@@ -93,10 +313,44 @@ async def call_tool(
             )
         ]
 
+def _start_metrics_server(port: int):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+    threading.Thread(target=httpd.serve_forever, name="mcp-metrics", daemon=True).start()
+    return httpd
+
 async def serve() -> None:
     options = server.create_initialization_options()
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, options)
+    # Warm everything before the first request: catalog in this process,
+    # spaCy in every parse worker.
+    start_catalog_reloader()
+    parse_pool, _ = _pools()
+    warm_up(parse_pool, MCP_PARSE_WORKERS)
+    metrics_server = _start_metrics_server(int(MCP_METRICS_PORT)) if MCP_METRICS_PORT else None
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, options)
+    finally:
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        stop_catalog_reloader()
+        _shutdown_pools()
 
 
 def main() -> None:
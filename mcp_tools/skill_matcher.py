@@ -0,0 +1,94 @@
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_text(text: str) -> str:
+    return _WHITESPACE.sub(" ", text.lower())
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+class SkillMatcher:
+    """Aho-Corasick automaton over skill names and their aliases.
+
+    The automaton is built once; ``find`` then scans a text in a single pass
+    regardless of vocabulary size. Matches must sit on word boundaries, so
+    "java" does not fire inside "javascript", and aliases report their
+    canonical skill name.
+    """
+
+    def __init__(
+        self,
+        skills: Iterable[str],
+        aliases: Optional[Dict[str, str]] = None,
+    ) -> None:
+        patterns: Dict[str, str] = {}
+        for skill in skills:
+            patterns.setdefault(normalize_text(skill).strip(), skill)
+        for alias, skill in (aliases or {}).items():
+            patterns.setdefault(normalize_text(alias).strip(), skill)
+        patterns.pop("", None)
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str, bool, bool]]] = [[]]
+        for pattern, skill in patterns.items():
+            self._add(pattern, skill)
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def _add(self, pattern: str, skill: str) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        # Like regex \b, a boundary is only required next to a word character,
+        # so "c++" still matches in "c++17" and ".net" in "asp.net".
+        self._out[state].append(
+            (len(pattern), skill, _is_word_char(pattern[0]), _is_word_char(pattern[-1]))
+        )
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                if self._fail[nxt] == nxt:
+                    self._fail[nxt] = 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> List[str]:
+        text = normalize_text(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        last = len(text) - 1
+        for end, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, skill, check_start, check_end in out[state]:
+                if skill in found:
+                    continue
+                start = end - length + 1
+                if check_start and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if check_end and end < last and _is_word_char(text[end + 1]):
+                    continue
+                found.add(skill)
+        return sorted(found)
@@ -0,0 +1,204 @@
+import copy
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Disk-hit access times are written back in batches of this many, or with
+# the next put, instead of one UPDATE and commit per hit.
+_TOUCH_BATCH = 64
+
+class TieredCache:
+    """Two-tier LRU cache of JSON-serializable values keyed by strings.
+
+    The first tier is an in-process LRU bounded by ``max_entries`` (``<= 0``
+    disables it). The optional second tier is table ``table`` of the SQLite
+    file at ``disk_path``, which survives restarts and is shared by every
+    process pointing at the same file. When its row count goes over
+    ``disk_max_entries``, expired rows and then the least recently used
+    ones are evicted in one batch, down to 90% of the bound. With ``ttl`` set, entries expire
+    that many seconds after they were stored, in both tiers.
+
+    The memory tier has its own lock and never waits on SQLite. Values are
+    deep-copied on the way in and out, so callers may modify what they get
+    back. ``disk_entries`` in ``stats()`` is this process's running count,
+    corrected from the table whenever eviction runs.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        max_entries: int = 256,
+        ttl: Optional[float] = None,
+        disk_path: Optional[str] = None,
+        disk_max_entries: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", table):
+            raise ValueError(f"Invalid cache table name: {table!r}")
+        self.table = table
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+        self._clock = clock
+        # key -> (expires at on ``clock``, value)
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {
+            "memory_hits": 0, "disk_hits": 0, "misses": 0,
+            "memory_evictions": 0, "disk_evictions": 0,
+            "expirations": 0, "invalidations": 0,
+        }
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+        self._disk_entries = 0
+        if disk_path:
+            self._open(disk_path)
+
+    def _open(self, path: str) -> None:
+        db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, accessed REAL NOT NULL, expires REAL)"
+        )
+        # Tables written before expiry existed lack the column.
+        columns = {row[1] for row in db.execute(f"PRAGMA table_info({self.table})")}
+        if "expires" not in columns:
+            db.execute(f"ALTER TABLE {self.table} ADD COLUMN expires REAL")
+        db.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table} (accessed)")
+        db.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_expires ON {self.table} (expires)")
+        db.commit()
+        self._disk_entries = db.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        self._db = db
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > self._clock():
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return copy.deepcopy(entry[1])
+                del self._memory[key]
+                self._counters["expirations"] += 1
+            if self._db is None:
+                self._counters["misses"] += 1
+                return None
+
+        now = time.time()
+        with self._db_lock:
+            row = self._db.execute(
+                f"SELECT value, expires FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and (row[1] is None or row[1] > now):
+                self._touched[key] = now
+                if len(self._touched) >= _TOUCH_BATCH:
+                    self._flush_touches()
+                    self._db.commit()
+            else:
+                row = None
+        if row is None:
+            with self._lock:
+                self._counters["misses"] += 1
+            return None
+
+        value = json.loads(row[0])
+        # Expire from memory when the shared row does.
+        expires = math.inf if row[1] is None else self._clock() + (row[1] - now)
+        with self._lock:
+            self._remember(key, value, expires)
+            self._counters["disk_hits"] += 1
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0 and self._db is None:
+            return
+        value = copy.deepcopy(value)
+        expires = math.inf if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            self._remember(key, value, expires)
+        if self._db is None:
+            return
+
+        payload = json.dumps(value)
+        now = time.time()
+        with self._db_lock:
+            self._flush_touches()
+            self._db.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, accessed, expires) "
+                "VALUES (?, ?, ?, ?)",
+                (key, payload, now, None if self.ttl is None else now + self.ttl),
+            )
+            self._disk_entries += 1
+            if self._disk_entries > self.disk_max_entries:
+                self._evict(now)
+            self._db.commit()
+
+    def _flush_touches(self) -> None:
+        if self._touched:
+            self._db.executemany(
+                f"UPDATE {self.table} SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self, now: float) -> None:
+        # Both deletes walk an index, and only over the rows they remove.
+        evicted = self._db.execute(
+            f"DELETE FROM {self.table} WHERE expires <= ?", (now,)
+        ).rowcount
+        count = self._db.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        # Going down to the low-water mark leaves a tenth of the bound to
+        # fill before this runs (and counts the table) again.
+        low_water = self.disk_max_entries - self.disk_max_entries // 10
+        if count > low_water:
+            evicted += self._db.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY accessed LIMIT ?)",
+                (count - low_water,),
+            ).rowcount
+            count = low_water
+        self._disk_entries = count
+        with self._lock:
+            self._counters["disk_evictions"] += evicted
+
+    def _remember(self, key: str, value: Any, expires: float) -> None:
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = (expires, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._counters["memory_evictions"] += 1
+
+    def clear(self, disk: bool = True) -> None:
+        """Drop every entry; with ``disk=False`` only this process's memory tier."""
+        with self._lock:
+            self._counters["invalidations"] += len(self._memory)
+            self._memory.clear()
+        if disk and self._db is not None:
+            with self._db_lock:
+                self._touched.clear()
+                self._db.execute(f"DELETE FROM {self.table}")
+                self._db.commit()
+                self._disk_entries = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (lookups - stats["misses"]) / lookups if lookups else 0.0
+        stats["max_entries"] = self.max_entries
+        if self.ttl is not None:
+            stats["ttl_seconds"] = self.ttl
+        if self._db is not None:
+            stats["disk_entries"] = self._disk_entries
+        return stats
@@ -0,0 +1,33 @@
+import multiprocessing
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List
+
+def _warm_worker() -> None:
+    # Pay the spaCy model load once per worker, not on its first request.
+    from .resume_parser import get_nlp
+
+    get_nlp()
+
+def create_parse_executor(max_workers: int) -> Executor:
+    """Executor for CPU-heavy resume parsing.
+
+    ``max_workers > 0`` gives a pool of warm worker processes (spawned rather
+    than forked, since callers already run threads); ``0`` falls back to a
+    single in-process thread, which is handy for debugging.
+    """
+    if max_workers <= 0:
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="parse")
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_warm_worker,
+    )
+
+def warm_up(executor: Executor, count: int) -> List[Future]:
+    """Start ``count`` workers now rather than on their first real task.
+
+    Spawned process pools only add a worker when none is idle, so submitting
+    ``count`` no-op tasks at once brings them all up (each running the
+    ``_warm_worker`` initializer). The returned futures need not be awaited.
+    """
+    return [executor.submit(int) for _ in range(max(count, 1))]
@@ -0,0 +1,31 @@
+import random
+
+import pytest
+
+from benchmarks.corpus import generate_jobs, skill_vocabulary
+from mcp_tools.job_catalog import JobCatalog
+
+from .helpers import VOCAB_SIZE
+
+@pytest.fixture(scope="module")
+def jobs():
+    return list(generate_jobs(3000, seed=7, vocab_size=VOCAB_SIZE))
+
+@pytest.fixture(scope="module")
+def catalog(jobs):
+    return JobCatalog.from_jobs(jobs)
+
+@pytest.fixture(scope="module")
+def posting_skills(jobs):
+    return [{s.lower() for s in job["skills"]} for job in jobs]
+
+@pytest.fixture(scope="module")
+def queries():
+    rng = random.Random(11)
+    vocab = skill_vocabulary(VOCAB_SIZE)
+    queries = [rng.sample(vocab, rng.randint(1, 12)) for _ in range(40)]
+    # Case, padding, duplicates and unknown skills must not change a result.
+    queries.append(["PYTHON", " sql ", "python", "no-such-skill"])
+    queries.append(["no-such-skill"])
+    queries.append([])
+    return queries
@@ -0,0 +1,43 @@
+"""Brute-force references the optimized code paths are checked against."""
+import re
+
+VOCAB_SIZE = 300
+
+FILTERS = [
+    None,
+    {"remote": True},
+    {"remote": False},
+    {"location": "pune"},
+    {"location": "remote flexible"},
+    {"title_keyword": "engineer"},
+    {"title_keyword": "senior engineer", "remote": False},
+    {"location": "berlin", "title_keyword": "data"},
+    {"location": "atlantis"},
+]
+
+def _words(text):
+    return set(re.findall(r"[\w+#]+", (text or "").lower()))
+
+def _passes(job, filters):
+    if not filters:
+        return True
+    if "remote" in filters and bool(job["remote"]) != filters["remote"]:
+        return False
+    if not set(filters.get("location", "").split()) <= _words(job["location"]):
+        return False
+    return set(filters.get("title_keyword", "").split()) <= _words(job["title"])
+
+def candidates(jobs, filters):
+    """Ids of the jobs passing ``filters``, by scanning every job."""
+    return [i for i, job in enumerate(jobs) if _passes(job, filters)]
+
+def brute_overlap(posting_skills, allowed, skills, top_k):
+    """Top-k ``(posting_id, overlap)`` over ``allowed``, ties in catalog order."""
+    query = {s.strip().lower() for s in skills}
+    scored = []
+    for i in allowed:
+        overlap = len(query & posting_skills[i])
+        if overlap:
+            scored.append((i, overlap))
+    scored.sort(key=lambda item: (-item[1], item[0]))
+    return scored[:top_k]
@@ -0,0 +1,108 @@
+"""The resume analysis queue, drained by threads into a thread pool."""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mcp_tools import job_recommender, resume_parser
+from mcp_tools.analysis_queue import AnalysisQueue, QueueFull
+from mcp_tools.job_catalog import JobCatalog
+from mcp_tools.parse_cache import ParseCache
+from mcp_tools.result_cache import ResultCache
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.batches = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.batches.append(len(args[1]))
+        return super().submit(fn, *args, **kwargs)
+
+@pytest.fixture
+def executor(monkeypatch, jobs):
+    spacy = pytest.importorskip("spacy")
+    monkeypatch.setattr(resume_parser, "_nlp", spacy.blank("en"))
+    monkeypatch.setattr(resume_parser, "_SPACY_MODE", "tokens")
+    monkeypatch.setattr(resume_parser, "_parse_cache", ParseCache())
+    monkeypatch.setattr(job_recommender, "_catalog", JobCatalog.from_jobs(jobs))
+    monkeypatch.setattr(job_recommender, "_result_cache", ResultCache())
+    with CountingExecutor() as executor:
+        yield executor
+
+@pytest.fixture
+def analyses(executor):
+    queue = AnalysisQueue(executor, workers=1, batch_size=4, max_results=8, top_k=3)
+    yield queue
+    queue.stop()
+
+def _resume(i):
+    return f"Candidate {i}\ncandidate{i}@example.com\nSkills: Python, SQL, Docker\n".encode()
+
+def _wait(queue, job_ids, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        jobs = [queue.get(job_id) for job_id in job_ids]
+        if all(job["status"] in ("done", "failed") for job in jobs):
+            return jobs
+        time.sleep(0.01)
+    raise AssertionError(f"analyses still pending: {jobs}")
+
+def test_queued_resumes_are_parsed_in_batches(analyses, executor):
+    # Queued before the worker starts, so it drains them four at a time.
+    job_ids = [analyses.submit(_resume(i), ".txt", f"cv{i}.txt") for i in range(6)]
+    assert analyses.get(job_ids[0])["status"] == "queued"
+    analyses.start()
+    jobs = _wait(analyses, job_ids)
+
+    assert executor.batches == [4, 2]
+    for i, job in enumerate(jobs):
+        assert job["status"] == "done"
+        assert job["profile"]["skills"] == ["docker", "python", "sql"]
+        assert job["profile"]["emails"] == [f"candidate{i}@example.com"]
+        assert "raw_text" not in job["profile"]
+        assert job["recommendations"] == job_recommender.recommend_jobs(
+            ["docker", "python", "sql"], top_k=3
+        )
+    stats = analyses.stats()
+    assert (stats["submitted"], stats["completed"], stats["failed"], stats["batches"]) == (6, 6, 0, 2)
+    assert stats["pending"] == 0
+
+def test_failures_stay_with_their_resume(analyses):
+    job_ids = [
+        analyses.submit(_resume(0), ".txt"),
+        analyses.submit(b"%PDF-1.4 not really", ".pdf"),
+        analyses.submit(b"", ".docx"),
+    ]
+    analyses.start()
+    done, bad_pdf, unsupported = _wait(analyses, job_ids)
+    assert done["status"] == "done"
+    assert bad_pdf["status"] == "failed" and bad_pdf["error"]
+    assert unsupported["status"] == "failed" and "Unsupported file type" in unsupported["error"]
+    assert analyses.stats()["failed"] == 2
+
+def test_cached_parses_skip_the_executor(analyses, executor):
+    analyses.start()
+    first = _wait(analyses, [analyses.submit(_resume(0), ".txt")])[0]
+    again = _wait(analyses, [analyses.submit(_resume(0), ".txt")])[0]
+    assert executor.batches == [1]
+    assert again["profile"] == first["profile"]
+
+def test_a_full_queue_rejects_submissions(executor):
+    queue = AnalysisQueue(executor, max_pending=2)
+    queue.submit(_resume(0), ".txt")
+    queue.submit(_resume(1), ".txt")
+    with pytest.raises(QueueFull):
+        queue.submit(_resume(2), ".txt")
+    assert queue.stats()["submitted"] == 2
+
+def test_only_finished_analyses_are_forgotten(analyses):
+    analyses.start()
+    finished = [analyses.submit(_resume(i), ".txt") for i in range(8)]
+    _wait(analyses, finished)
+    analyses.stop()
+    queued = [analyses.submit(_resume(i), ".txt") for i in range(8, 18)]
+    # Ten queued analyses against max_results=8: every finished one goes,
+    # none of the queued ones do.
+    assert [analyses.get(job_id) for job_id in finished] == [None] * 8
+    assert all(analyses.get(job_id)["status"] == "queued" for job_id in queued)
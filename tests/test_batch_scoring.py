@@ -0,0 +1,15 @@
+"""batch_top_postings against a brute-force overlap scan."""
+import pytest
+
+from mcp_tools.batch_scoring import batch_top_postings
+from mcp_tools.job_filters import filter_postings
+
+from .helpers import FILTERS, brute_overlap, candidates
+
+@pytest.mark.parametrize("filters", FILTERS, ids=str)
+def test_matches_brute_force(catalog, jobs, posting_skills, queries, filters):
+    allowed = filter_postings(catalog, filters)
+    # A small block size forces several candidate blocks per call.
+    results = batch_top_postings(catalog, queries, 10, max_cells=4096, allowed=allowed)
+    ids = candidates(jobs, filters)
+    assert results == [brute_overlap(posting_skills, ids, skills, 10) for skills in queries]
@@ -0,0 +1,63 @@
+"""A catalog loaded from its memory-mapped index behaves like the one written."""
+import random
+
+import pytest
+
+from benchmarks.corpus import generate_jobs, skill_vocabulary
+from mcp_tools.catalog_index import load_index, read_index_source, write_index
+from mcp_tools.job_catalog import JobCatalog
+from mcp_tools.job_filters import filter_postings, remote_flags
+from mcp_tools.ranking import ENGINES, OVERLAP_ENGINES
+
+SOURCE = (("jobs-0000.jsonl.gz", 1700000000000000000, 1234),)
+
+@pytest.fixture(scope="module")
+def catalogs(tmp_path_factory):
+    jobs = list(generate_jobs(2000, seed=3, vocab_size=400))
+    # Fields the side tables do not cover travel through the extras column.
+    jobs[0]["salary"] = {"min": 10, "max": 20, "currency": "EUR"}
+    jobs[1]["description"] = None
+    jobs[2]["title"] = "Ingénieur logiciel – Zürich"
+    jobs[3]["id"] = 3
+    built = JobCatalog.from_jobs(jobs)
+    path = str(tmp_path_factory.mktemp("index") / "catalog.idx")
+    write_index(built, path, SOURCE)
+    return built, load_index(path), path
+
+def test_source_snapshot_round_trips(catalogs):
+    _, _, path = catalogs
+    assert read_index_source(path) == SOURCE
+
+def test_postings_round_trip(catalogs):
+    built, loaded = catalogs[:2]
+    assert len(loaded) == len(built)
+    assert loaded.index_entries == built.index_entries
+    assert loaded.skill_names == built.skill_names
+    assert loaded.skill_ids == built.skill_ids
+    for skill_id in range(len(built.skill_names)):
+        assert list(loaded.postings[skill_id]) == list(built.postings[skill_id])
+    for posting_id in range(len(built)):
+        assert loaded.posting(posting_id, match_score=1) == built.posting(posting_id, match_score=1)
+
+def test_remote_flags_are_stored(catalogs):
+    built, loaded = catalogs[:2]
+    assert "remote_flags" in loaded.derived
+    expected = [built.extras[p]["remote"] for p in range(len(built))]
+    assert remote_flags(loaded).tolist() == expected
+
+@pytest.mark.parametrize("engine", ["index", "bitset", "bm25", "idf"])
+@pytest.mark.parametrize("filters", [None, {"remote": True}, {"title_keyword": "senior engineer"}], ids=str)
+def test_rankings_match(catalogs, engine, filters):
+    built, loaded = catalogs[:2]
+    rank = ENGINES[engine]
+    rng = random.Random(5)
+    vocab = skill_vocabulary(400)
+    for _ in range(30):
+        skills = rng.sample(vocab, rng.randint(1, 10))
+        got = rank(loaded, skills, 10, filter_postings(loaded, filters))
+        expected = rank(built, skills, 10, filter_postings(built, filters))
+        if engine in OVERLAP_ENGINES:
+            assert got == expected
+        else:
+            assert [p for p, _ in got] == [p for p, _ in expected]
+            assert [s for _, s in got] == pytest.approx([s for _, s in expected])
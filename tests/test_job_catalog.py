@@ -0,0 +1,20 @@
+"""JobCatalog keeps postings as they were added."""
+from mcp_tools.job_catalog import JobCatalog
+
+def test_posting_round_trips():
+    job = {
+        "id": 42,
+        "title": "Data Engineer",
+        "skills": ["Python", "SQL", "python"],
+        "location": "Pune",
+        "salary": {"min": 10},
+    }
+    catalog = JobCatalog.from_jobs([job, {"id": "job-2", "title": 7}])
+    assert catalog.posting(0, match_score=2) == {**job, "skills": ["python", "sql"], "match_score": 2}
+    # Ids keep their type; text fields are text.
+    assert catalog.posting(1) == {"id": "job-2", "title": "7", "skills": []}
+
+def test_locations_are_interned():
+    catalog = JobCatalog.from_jobs({"id": i, "location": "".join(["Re", "mote"])} for i in range(3))
+    first, *rest = catalog.columns["location"]
+    assert all(location is first for location in rest)
@@ -0,0 +1,52 @@
+"""Job filter selections against a scan of the job dicts."""
+import numpy as np
+import pytest
+
+from mcp_tools import job_filters, job_recommender
+from mcp_tools.job_catalog import JobCatalog
+from mcp_tools.job_filters import filter_postings, normalize_filters, remote_flags
+from mcp_tools.result_cache import ResultCache
+
+from .helpers import FILTERS, candidates
+
+@pytest.mark.parametrize("filters", FILTERS, ids=str)
+def test_selection_matches_brute_force(catalog, jobs, filters):
+    selection = filter_postings(catalog, filters)
+    if filters is None:
+        assert selection is None
+        return
+    expected = candidates(jobs, filters)
+    assert selection.ids.tolist() == expected
+    assert np.flatnonzero(selection.mask).tolist() == expected
+
+def test_normalize_filters():
+    assert normalize_filters({"location": "  Remote / FLEXIBLE ", "remote": "yes"}) == {
+        "location": "remote flexible", "remote": True,
+    }
+    assert normalize_filters({"location": "", "remote": None, "title_keyword": "  "}) == {}
+    with pytest.raises(ValueError):
+        normalize_filters({"salary": 10})
+
+def test_remote_falls_back_to_the_location_text():
+    catalog = JobCatalog.from_jobs([
+        {"id": "a", "location": "Remote / Flexible"},
+        {"id": "b", "location": "Remote / Flexible", "remote": "no"},
+        {"id": "c", "location": "Pune", "remote": True},
+        {"id": "d", "location": "Pune"},
+        {"id": "e"},
+    ])
+    assert remote_flags(catalog).tolist() == [True, False, True, False, False]
+    assert filter_postings(catalog, {"remote": True}).ids.tolist() == [0, 2]
+
+def test_reload_builds_the_index_before_the_swap(monkeypatch, jobs):
+    monkeypatch.setattr(job_recommender, "_catalog", JobCatalog.from_jobs(jobs[:10]))
+    monkeypatch.setattr(job_recommender, "_build_catalog", lambda: JobCatalog.from_jobs(jobs[:50]))
+    monkeypatch.setattr(job_recommender, "_reload_stats", dict(job_recommender._reload_stats))
+    monkeypatch.setattr(job_recommender, "_result_cache", ResultCache())
+    job_recommender.reload_catalog()
+
+    def fail(catalog):
+        raise AssertionError("attribute index built on the request path")
+
+    monkeypatch.setattr(job_filters, "_AttributeIndex", fail)
+    assert job_recommender.recommend_jobs(["python"], top_k=3, filters={"remote": True})
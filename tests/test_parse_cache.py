@@ -0,0 +1,108 @@
+"""The two-tier cache behind ParseCache and ResultCache."""
+import sqlite3
+import threading
+
+import pytest
+
+from mcp_tools.parse_cache import ParseCache
+from mcp_tools.tiered_cache import TieredCache
+
+def test_memory_tier_is_an_lru_of_copies():
+    cache = ParseCache(max_entries=2)
+    cache.put("a", {"skills": ["python"]})
+    cache.get("a")["skills"].append("mutated")
+    assert cache.get("a") == {"skills": ["python"]}
+    cache.put("b", {})
+    cache.get("a")
+    cache.put("c", {})
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert stats["memory_evictions"] == 1
+    assert stats["memory_entries"] == 2
+    assert "disk_entries" not in stats
+
+def test_disk_tier_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    writer = ParseCache(max_entries=0, disk_path=path)
+    reader = ParseCache(max_entries=4, disk_path=path)
+    writer.put("a", {"skills": ["sql"]})
+    assert reader.get("a") == {"skills": ["sql"]}
+    assert reader.get("a") == {"skills": ["sql"]}
+    stats = reader.stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 0)
+
+def test_disk_eviction_runs_in_batches_and_keeps_recent_rows(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ParseCache(max_entries=0, disk_path=path, disk_max_entries=20)
+    for i in range(20):
+        cache.put(f"k{i}", {"i": i})
+    assert cache.stats()["disk_evictions"] == 0
+    # A disk hit makes k0 recent once its access time is written back.
+    assert cache.get("k0") == {"i": 0}
+    cache.put("k20", {"i": 20})
+    stats = cache.stats()
+    assert stats["disk_evictions"] == 3
+    assert stats["disk_entries"] == 18
+    assert cache.get("k0") is not None
+    assert [cache.get(f"k{i}") for i in (1, 2, 3)] == [None, None, None]
+    rows = sqlite3.connect(path).execute("SELECT COUNT(*) FROM parses").fetchone()[0]
+    assert rows == 18
+
+def test_eviction_uses_indexes(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    ParseCache(disk_path=path)
+    db = sqlite3.connect(path)
+    for query in (
+        "SELECT key FROM parses ORDER BY accessed LIMIT 5",
+        "SELECT key FROM parses WHERE expires <= 0",
+    ):
+        plan = " ".join(row[-1] for row in db.execute("EXPLAIN QUERY PLAN " + query))
+        assert "USING" in plan and "INDEX" in plan, plan
+
+def test_ttl_expires_both_tiers(tmp_path):
+    now = [0.0]
+    path = str(tmp_path / "cache.sqlite3")
+    cache = TieredCache("results", max_entries=4, ttl=10, disk_path=path, clock=lambda: now[0])
+    cache.put("a", [1])
+    now[0] = 11.0
+    # Expired in memory; the disk row is still fresh on the wall clock.
+    assert cache.get("a") == [1]
+    assert cache.stats()["expirations"] == 1
+
+    quick = TieredCache("results", ttl=0, disk_path=path)
+    quick.put("b", [2])
+    assert quick.get("b") is None
+
+def test_clear_can_keep_the_shared_tier(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ParseCache(disk_path=path)
+    cache.put("a", {})
+    cache.clear(disk=False)
+    assert cache.stats()["invalidations"] == 1
+    assert cache.get("a") == {}
+    cache.clear()
+    assert cache.get("a") is None
+
+def test_opens_tables_written_before_expiry_existed(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE parses (key TEXT PRIMARY KEY, value TEXT NOT NULL, accessed REAL NOT NULL)")
+    db.execute("INSERT INTO parses VALUES ('a', '{\"x\": 1}', 0)")
+    db.commit()
+    cache = ParseCache(disk_path=path)
+    assert cache.get("a") == {"x": 1}
+    assert cache.stats()["disk_entries"] == 1
+
+def test_memory_hits_do_not_wait_for_sqlite(tmp_path):
+    cache = ParseCache(disk_path=str(tmp_path / "cache.sqlite3"))
+    cache.put("a", {})
+    with cache._db_lock:
+        result = []
+        reader = threading.Thread(target=lambda: result.append(cache.get("a")))
+        reader.start()
+        reader.join(timeout=5)
+    assert result == [{}]
+
+def test_rejects_unsafe_table_names():
+    with pytest.raises(ValueError):
+        TieredCache("parses; DROP TABLE x")
@@ -0,0 +1,84 @@
+"""The PDF backend chain, with fake backends around the real PyPDF2 one."""
+import pytest
+
+from benchmarks.corpus import make_pdf
+from mcp_tools import pdf_backends, resume_parser
+from mcp_tools.pdf_backends import BackendChain, PdfDocument, available_backends, open_pdf
+from mcp_tools.resume_parser import iter_pdf_pages
+
+PAGES = 6
+
+def _document():
+    return make_pdf([f"page{p} python sql" for p in range(1, PAGES + 1)], lines_per_page=1)
+
+class FakeDocument(PdfDocument):
+    """Extracts "<name> <page>" until page ``fail_at``, then raises."""
+
+    def __init__(self, name, log, fail_at=None):
+        self.name = name
+        self.log = log
+        self.fail_at = fail_at
+        self.page_count = PAGES
+
+    def extract(self, start, stop):
+        self.log.append((self.name, start, stop))
+        if self.fail_at is not None and stop > self.fail_at:
+            raise RuntimeError(f"{self.name} cannot read page {self.fail_at + 1}")
+        return [f"{self.name} {p + 1}" for p in range(start, stop)]
+
+    def close(self):
+        self.log.append((self.name, "closed"))
+
+@pytest.fixture
+def log(monkeypatch):
+    log = []
+
+    def unopenable(source):
+        log.append(("unopenable", "open"))
+        raise ValueError("not a PDF this backend understands")
+
+    for name, opener in {
+        "unopenable": unopenable,
+        "flaky": lambda source: FakeDocument("flaky", log, fail_at=2),
+        "broken": lambda source: FakeDocument("broken", log, fail_at=0),
+        "fake": lambda source: FakeDocument("fake", log),
+        "missing": lambda source: pytest.fail("opened a backend that is not installed"),
+    }.items():
+        installed = name != "missing"
+        monkeypatch.setitem(pdf_backends.BACKENDS, name, (lambda installed=installed: installed, opener))
+    return log
+
+def test_available_backends_keep_order_and_skip_missing(log):
+    assert available_backends(["fake", "missing", "flaky"]) == ["fake", "flaky"]
+    with pytest.raises(ValueError, match="no-such"):
+        available_backends(["fake", "no-such"])
+
+def test_unopenable_backends_are_skipped(log):
+    chain = open_pdf(b"", ["unopenable", "fake"])
+    assert (chain.backend, chain.page_count) == ("fake", PAGES)
+    assert chain.extract(0, 2) == ["fake 1", "fake 2"]
+
+def test_failed_range_is_retried_on_the_next_backend(log):
+    chain = BackendChain(b"", ["flaky", "fake"])
+    assert chain.extract(0, 2) == ["flaky 1", "flaky 2"]
+    assert chain.extract(2, 4) == ["fake 3", "fake 4"]
+    # The failed backend is closed and not tried again for this document.
+    assert chain.extract(4, 6) == ["fake 5", "fake 6"]
+    assert log == [
+        ("flaky", 0, 2), ("flaky", 2, 4), ("flaky", "closed"),
+        ("fake", 2, 4), ("fake", 4, 6),
+    ]
+
+def test_last_error_is_raised_when_no_backend_is_left(log):
+    chain = BackendChain(b"", ["broken", "flaky"])
+    with pytest.raises(RuntimeError, match="flaky cannot read page 3"):
+        chain.extract(0, 4)
+    with pytest.raises(ValueError, match="understands"):
+        BackendChain(b"", ["unopenable"])
+    with pytest.raises(RuntimeError, match="No PDF backend"):
+        BackendChain(b"", [])
+
+def test_page_extraction_falls_back_to_pypdf2(log, monkeypatch):
+    monkeypatch.setattr(resume_parser, "_PDF_BACKEND_NAMES", ("unopenable", "pypdf2"))
+    pages = list(iter_pdf_pages(_document(), max_pages=0, workers=0))
+    assert [page.split()[0] for page in pages] == [f"page{p}" for p in range(1, PAGES + 1)]
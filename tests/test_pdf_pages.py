@@ -0,0 +1,162 @@
+"""Budgeted, page-parallel PDF extraction: budget, timeouts, crashes, caching."""
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from benchmarks.corpus import make_pdf
+from mcp_tools import resume_parser
+from mcp_tools.parse_cache import ParseCache
+from mcp_tools.resume_parser import PageReport, iter_pdf_pages
+
+PAGES = 12
+
+def _document(pages=PAGES):
+    return make_pdf([f"page{p} python sql" for p in range(1, pages + 1)], lines_per_page=1)
+
+def _page_numbers(texts):
+    return [int(text.split()[0][4:]) for text in texts]
+
+# Page tasks run these in spawned workers, which import this module by name;
+# the task covering pages 5-8 misbehaves, the others extract normally.
+
+def _hang(path, doc_id, backends, start, stop):
+    if start == 4:
+        time.sleep(60)
+    return resume_parser._extract_pdf_pages(path, doc_id, backends, start, stop)
+
+def _hang_uninterruptibly(path, doc_id, backends, start, stop):
+    if start == 4:
+        # Like a backend stuck in C code: the worker's alarm never fires.
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+        time.sleep(60)
+    return resume_parser._extract_pdf_pages(path, doc_id, backends, start, stop)
+
+def _crash(path, doc_id, backends, start, stop):
+    if start == 4:
+        os._exit(1)
+    return resume_parser._extract_pdf_pages(path, doc_id, backends, start, stop)
+
+def _slow(path, doc_id, backends, start, stop):
+    time.sleep(0.3)
+    return resume_parser._extract_pdf_pages(path, doc_id, backends, start, stop)
+
+@pytest.fixture
+def page_pool(monkeypatch):
+    """A fresh page pool for the test, torn down afterwards."""
+    monkeypatch.setattr(resume_parser, "_page_pool", None)
+    yield
+    if resume_parser._page_pool is not None:
+        resume_parser._recycle_page_pool(resume_parser._page_pool)
+
+def test_page_budget_truncates():
+    data = _document()
+    report = PageReport()
+    assert _page_numbers(iter_pdf_pages(data, max_pages=3, workers=0, report=report)) == [1, 2, 3]
+    assert report.truncated
+
+    report = PageReport()
+    assert len(list(iter_pdf_pages(data, max_pages=PAGES, workers=0, report=report))) == PAGES
+    assert not report.truncated
+
+def test_byte_budget_truncates():
+    data = _document()
+    texts = list(iter_pdf_pages(data, max_pages=0, max_bytes=0, workers=0))
+    size = sum(len(t.encode("utf-8")) for t in texts)
+
+    report = PageReport()
+    cut = list(iter_pdf_pages(data, max_pages=0, max_bytes=size // 2, workers=0, report=report))
+    assert sum(len(t.encode("utf-8")) for t in cut) == size // 2
+    assert report.truncated
+
+    report = PageReport()
+    exact = list(iter_pdf_pages(data, max_pages=0, max_bytes=size, workers=0, report=report))
+    assert exact == texts
+    assert not report.truncated
+
+def test_workers_match_in_process_extraction(page_pool):
+    data = _document()
+    in_process = list(iter_pdf_pages(data, max_pages=0, workers=0))
+    report = PageReport()
+    assert list(iter_pdf_pages(data, max_pages=0, workers=2, report=report)) == in_process
+    assert report.skipped == [] and not report.truncated
+
+def test_hung_page_is_skipped_without_restarting_the_pool(page_pool, monkeypatch):
+    monkeypatch.setattr(resume_parser, "_extract_pdf_pages", _hang)
+    report = PageReport()
+    pages = list(iter_pdf_pages(_document(), max_pages=0, page_timeout=0.2, workers=2, report=report))
+    assert _page_numbers(pages) == [1, 2, 3, 4, 9, 10, 11, 12]
+    assert report.skipped == [(5, 8)]
+    # The worker's own alarm stopped the page; nothing had to be killed.
+    pool = resume_parser._page_pool
+    assert pool is not None and not pool._broken
+
+def test_uninterruptible_page_recycles_the_pool(page_pool, monkeypatch):
+    monkeypatch.setattr(resume_parser, "_PAGE_BACKSTOP_GRACE", 1.0)
+    monkeypatch.setattr(resume_parser, "_extract_pdf_pages", _hang_uninterruptibly)
+    report = PageReport()
+    pages = list(iter_pdf_pages(_document(), max_pages=0, page_timeout=0.2, workers=2, report=report))
+    assert _page_numbers(pages) == [1, 2, 3, 4, 9, 10, 11, 12]
+    assert report.skipped == [(5, 8)]
+
+def test_repeated_crashes_skip_the_pages(page_pool, monkeypatch):
+    monkeypatch.setattr(resume_parser, "_extract_pdf_pages", _crash)
+    report = PageReport()
+    pages = list(iter_pdf_pages(_document(), max_pages=0, page_timeout=5, workers=2, report=report))
+    assert _page_numbers(pages) == [1, 2, 3, 4, 9, 10, 11, 12]
+    assert report.skipped == [(5, 8)]
+
+def test_time_queued_behind_other_documents_does_not_count(page_pool, monkeypatch):
+    monkeypatch.setattr(resume_parser, "_extract_pdf_pages", _slow)
+    data = _document(8)
+    reports = [PageReport() for _ in range(3)]
+    results = [None] * len(reports)
+
+    def parse(i):
+        # One worker, three documents: each task takes 0.3 s of its 0.4 s
+        # budget, but most of them wait far longer than that in the queue.
+        results[i] = list(
+            iter_pdf_pages(data, max_pages=0, page_timeout=0.1, workers=1, report=reports[i])
+        )
+
+    threads = [threading.Thread(target=parse, args=(i,)) for i in range(len(reports))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [r.skipped for r in reports] == [[], [], []]
+    assert all(_page_numbers(pages) == list(range(1, 9)) for pages in results)
+
+@pytest.fixture
+def parser(monkeypatch):
+    spacy = pytest.importorskip("spacy")
+    monkeypatch.setattr(resume_parser, "_nlp", spacy.blank("en"))
+    monkeypatch.setattr(resume_parser, "_SPACY_MODE", "tokens")
+    monkeypatch.setattr(resume_parser, "_parse_cache", ParseCache())
+    return resume_parser
+
+def test_parses_with_skipped_pages_are_not_cached(parser, page_pool, monkeypatch):
+    monkeypatch.setattr(parser, "_PDF_PAGE_WORKERS", 2)
+    monkeypatch.setattr(parser, "_PDF_PAGE_TIMEOUT", 0.2)
+    monkeypatch.setattr(parser, "_PDF_MAX_PAGES", 0)
+    monkeypatch.setattr(parser, "_extract_pdf_pages", _hang)
+    data = _document()
+    result = parser.parse_resume_bytes(data, ".pdf")
+    assert result["summary"]["skipped_pages"] == [[5, 8]]
+    assert result["skills"] == ["python", "sql"]
+    assert parser.get_cached_parse(data, ".pdf") is None
+
+def test_truncated_parses_are_cached_and_flagged(parser, monkeypatch):
+    monkeypatch.setattr(parser, "_PDF_PAGE_WORKERS", 0)
+    monkeypatch.setattr(parser, "_PDF_MAX_PAGES", 2)
+    data = _document()
+    result = parser.parse_resume_bytes(data, ".pdf")
+    assert result["summary"]["truncated"] is True
+    assert "skipped_pages" not in result["summary"]
+    # The budget is part of the cache key, so the cut is reproducible.
+    assert parser.get_cached_parse(data, ".pdf")["summary"]["truncated"] is True
+
+    whole = parser.parse_resume_bytes(_document(2), ".pdf")
+    assert whole["summary"]["truncated"] is False
@@ -0,0 +1,60 @@
+"""Every ranking engine against a brute-force scan of the same postings."""
+import math
+
+import pytest
+
+from mcp_tools.job_filters import filter_postings
+from mcp_tools.ranking import BM25_B, BM25_K1, ENGINES
+
+from .helpers import FILTERS, brute_overlap, candidates
+
+def brute_bm25(posting_skills, allowed, skills, k1=BM25_K1, b=BM25_B):
+    """Every allowed posting's BM25 score, computed straight from the job dicts."""
+    avg_length = sum(map(len, posting_skills)) / len(posting_skills)
+    query = {s.strip().lower() for s in skills}
+    idf = {
+        skill: math.log1p((len(posting_skills) - df + 0.5) / (df + 0.5))
+        for skill in query
+        for df in [sum(skill in s for s in posting_skills)]
+    }
+    scores = {}
+    for i in allowed:
+        norm = (k1 + 1) / (1 + k1 * (1 - b + b * len(posting_skills[i]) / avg_length))
+        score = sum(idf[skill] * norm for skill in query & posting_skills[i])
+        if score:
+            scores[i] = score
+    return scores
+
+@pytest.mark.parametrize("engine", ["index", "bitset"])
+@pytest.mark.parametrize("filters", FILTERS, ids=str)
+def test_overlap_engines_match_brute_force(catalog, jobs, posting_skills, queries, engine, filters):
+    rank = ENGINES[engine]
+    allowed = filter_postings(catalog, filters)
+    ids = candidates(jobs, filters)
+    for skills in queries:
+        for top_k in (1, 5, 50):
+            assert rank(catalog, skills, top_k, allowed) == brute_overlap(
+                posting_skills, ids, skills, top_k
+            ), (skills, top_k)
+
+@pytest.mark.parametrize("engine, b", [("bm25", BM25_B), ("idf", 0.0)])
+@pytest.mark.parametrize("filters", FILTERS, ids=str)
+def test_maxscore_matches_exhaustive_bm25(
+    catalog, jobs, posting_skills, queries, engine, b, filters
+):
+    rank = ENGINES[engine]
+    allowed = filter_postings(catalog, filters)
+    ids = candidates(jobs, filters)
+    for skills in queries[::4]:
+        expected = brute_bm25(posting_skills, ids, skills, b=b)
+        for top_k in (1, 10, 100):
+            got = rank(catalog, skills, top_k, allowed)
+            assert len(got) == min(top_k, len(expected))
+            # Pruning must never drop a posting that scores above the k-th.
+            kth = got[-1][1] if got else 0.0
+            for posting_id, score in got:
+                assert score == pytest.approx(expected[posting_id])
+            missed = set(expected) - {posting_id for posting_id, _ in got}
+            assert all(expected[p] <= kth + 1e-9 for p in missed)
+            top = sorted(expected.values(), reverse=True)[:top_k]
+            assert [score for _, score in got] == pytest.approx(top)
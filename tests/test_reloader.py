@@ -0,0 +1,82 @@
+"""Hot reload of the jobs DB and the gauges that report it."""
+import json
+import os
+import time
+
+import pytest
+
+from benchmarks.corpus import generate_jobs, write_jobs_db
+from mcp_tools import job_recommender
+from mcp_tools.catalog_index import build_index
+from mcp_tools.catalog_reloader import CatalogReloader
+from mcp_tools.metrics import render_prometheus
+from mcp_tools.result_cache import ResultCache
+
+def _gauge(name):
+    for line in render_prometheus().splitlines():
+        if line.startswith(f"job_recommender_catalog_{name} "):
+            return float(line.split()[1])
+    raise AssertionError(f"no sample for {name}")
+
+@pytest.fixture
+def db_dir(tmp_path, monkeypatch):
+    db_dir = str(tmp_path / "jobs_db")
+    write_jobs_db(db_dir, 200, seed=1, vocab_size=100)
+    monkeypatch.setattr(job_recommender, "_JOBS_DB_DIR", db_dir)
+    monkeypatch.setattr(job_recommender, "_JOBS_INDEX_PATH", os.path.join(db_dir, ".catalog.idx"))
+    monkeypatch.setattr(job_recommender, "_JOBS_DB_WORKERS", "1")
+    monkeypatch.setattr(job_recommender, "_catalog", None)
+    monkeypatch.setattr(job_recommender, "_reload_stats", dict(job_recommender._reload_stats))
+    monkeypatch.setattr(job_recommender, "_result_cache", ResultCache())
+    return db_dir
+
+def _add_shard(db_dir, name, count):
+    with open(os.path.join(db_dir, name), "w") as f:
+        for job in generate_jobs(count, seed=2, vocab_size=100):
+            f.write(json.dumps({**job, "id": f"new-{job['id']}"}) + "\n")
+
+def test_changed_shards_are_swapped_in(db_dir):
+    before = job_recommender.get_catalog()
+    assert _gauge("postings") == 200
+    reloader = CatalogReloader(db_dir, job_recommender.reload_catalog, mode="poll", interval=0.05)
+    reloader.start()
+    try:
+        _add_shard(db_dir, "jobs-00001.jsonl", 50)
+        deadline = time.monotonic() + 10
+        while job_recommender.get_catalog() is before and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        reloader.stop()
+
+    after = job_recommender.get_catalog()
+    assert (len(before), len(after)) == (200, 250)
+    assert after.version == before.version + 1
+    assert after.fingerprint != before.fingerprint
+    assert _gauge("reloads_total") == 1
+    assert _gauge("reload_failures_total") == 0
+    assert _gauge("last_reload_seconds") > 0
+    assert _gauge("last_reload_timestamp_seconds") == pytest.approx(time.time(), abs=60)
+    assert (_gauge("version"), _gauge("postings")) == (after.version, 250)
+    assert _gauge("index_entries") == after.index_entries
+
+def test_failed_reload_keeps_the_previous_catalog(db_dir):
+    before = job_recommender.get_catalog()
+    reloader = CatalogReloader(db_dir, job_recommender.reload_catalog, mode="poll")
+    with open(os.path.join(db_dir, "broken.jsonl"), "w") as f:
+        f.write('{"id": "x", "skills": [\n')
+    # One poll, run here instead of on the reloader thread.
+    reloader._check()
+    assert job_recommender.get_catalog() is before
+    assert _gauge("reload_failures_total") == 1
+    assert _gauge("reloads_total") == 0
+    assert _gauge("postings") == 200
+
+def test_a_current_index_file_is_used(db_dir):
+    build_index(db_dir, job_recommender._JOBS_INDEX_PATH, workers=1)
+    catalog = job_recommender.reload_catalog()
+    assert job_recommender.get_catalog_stats()["source"] == "index"
+    assert len(catalog) == 200
+    # A shard written afterwards makes the index stale: back to the shards.
+    _add_shard(db_dir, "jobs-00001.jsonl", 10)
+    assert len(job_recommender.reload_catalog()) == 210
+    assert job_recommender.get_catalog_stats()["source"] == "shards"
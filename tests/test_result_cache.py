@@ -0,0 +1,60 @@
+"""recommend_jobs caching through ResultCache."""
+import pytest
+
+from mcp_tools import job_recommender
+from mcp_tools.job_catalog import JobCatalog
+from mcp_tools.result_cache import ResultCache
+
+@pytest.fixture
+def recommender(monkeypatch, jobs):
+    catalog = JobCatalog.from_jobs(jobs)
+    catalog.fingerprint = "a" * 24
+    monkeypatch.setattr(job_recommender, "_catalog", catalog)
+    monkeypatch.setattr(job_recommender, "_result_cache", ResultCache(max_entries=16))
+    return job_recommender
+
+def test_equivalent_skill_lists_share_an_entry(recommender):
+    first = recommender.recommend_jobs(["Python", "sql", "docker"], top_k=5)
+    again = recommender.recommend_jobs([" docker", "SQL", "python", "python"], top_k=5)
+    assert again == first
+    stats = recommender.get_result_cache_stats()
+    assert (stats["misses"], stats["memory_hits"]) == (1, 1)
+    # A hit is a copy; changing it does not change the cache.
+    again[0]["title"] = "changed"
+    assert recommender.recommend_jobs(["python", "sql", "docker"], top_k=5) == first
+
+def test_hits_match_a_fresh_ranking(recommender):
+    skills = ["java", "react", "aws", "kubernetes"]
+    cached = recommender.recommend_jobs(skills, top_k=10, engine="bm25")
+    recommender.recommend_jobs(skills[::-1], top_k=10, engine="bm25")
+    recommender._result_cache.clear()
+    assert recommender.recommend_jobs(skills[::-1], top_k=10, engine="bm25") == cached
+
+@pytest.mark.parametrize(
+    "changed",
+    [{"top_k": 6}, {"engine": "bitset"}, {"filters": {"remote": True}}],
+    ids=str,
+)
+def test_other_arguments_miss(recommender, changed):
+    recommender.recommend_jobs(["python", "sql"], top_k=5)
+    recommender.recommend_jobs(["python", "sql"], **{"top_k": 5, **changed})
+    assert recommender.get_result_cache_stats()["misses"] == 2
+
+def test_a_new_catalog_misses(recommender, monkeypatch, jobs):
+    recommender.recommend_jobs(["python"], top_k=3)
+    reloaded = JobCatalog.from_jobs(jobs[:100])
+    reloaded.fingerprint = "b" * 24
+    monkeypatch.setattr(recommender, "_catalog", reloaded)
+    assert all(
+        int(job["id"].split("-")[1]) < 100 for job in recommender.recommend_jobs(["python"], top_k=3)
+    )
+    assert recommender.get_result_cache_stats()["misses"] == 2
+
+def test_processes_share_the_disk_tier(recommender, monkeypatch, tmp_path):
+    path = str(tmp_path / "results.sqlite3")
+    monkeypatch.setattr(recommender, "_result_cache", ResultCache(disk_path=path))
+    first = recommender.recommend_jobs(["python", "sql"], top_k=5)
+    # Another process: its own memory tier, the same file and catalog files.
+    monkeypatch.setattr(recommender, "_result_cache", ResultCache(disk_path=path))
+    assert recommender.recommend_jobs(["sql", "python"], top_k=5) == first
+    assert recommender.get_result_cache_stats()["disk_hits"] == 1
@@ -0,0 +1,92 @@
+"""The semantic engine with a small vectors model built for the test."""
+import numpy as np
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from mcp_tools import semantic_index
+from mcp_tools.job_catalog import JobCatalog
+from mcp_tools.job_filters import filter_postings
+from mcp_tools.ranking import rank_semantic
+
+WORDS = ["python", "sql", "java", "docker", "react", "aws", "data", "engineer", "analyst", "cloud"]
+
+@pytest.fixture
+def vectors_model(tmp_path, monkeypatch):
+    nlp = spacy.blank("en")
+    # Trained pipes the semantic engine has no use for and must not load.
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("entity_ruler")
+    rng = np.random.default_rng(0)
+    for word in WORDS:
+        nlp.vocab.set_vector(word, rng.standard_normal(16).astype(np.float32))
+    nlp.meta["version"] = "1.0.0"
+    nlp.to_disk(tmp_path / "model")
+    monkeypatch.setattr(semantic_index, "_SEMANTIC_MODEL", str(tmp_path / "model"))
+    monkeypatch.setattr(semantic_index, "_SEMANTIC_INDEX_DIR", str(tmp_path / "indexes"))
+    monkeypatch.setattr(semantic_index, "_nlp", None)
+
+@pytest.fixture
+def small_catalog():
+    rng = np.random.default_rng(1)
+    return JobCatalog.from_jobs(
+        {
+            "id": f"job-{i}",
+            "title": f"{WORDS[i % 3 + 7]}",
+            "skills": list(rng.choice(WORDS[:7], size=3, replace=False)),
+            "location": "Remote" if i % 2 else "Pune",
+        }
+        for i in range(200)
+    )
+
+def test_loads_without_trained_pipes(vectors_model):
+    nlp = semantic_index.get_vectors_nlp()
+    assert nlp.pipe_names == []
+    assert nlp.vocab.vectors.n_keys == len(WORDS)
+    assert nlp.vocab.has_vector("python")
+
+def test_fingerprinted_catalogs_are_not_read_to_name_the_index(vectors_model, small_catalog, monkeypatch):
+    unread = JobCatalog()
+    unread.fingerprint = "a" * 24
+
+    def fail(catalog, posting_id):
+        raise AssertionError("posting text read")
+
+    monkeypatch.setattr(semantic_index, "posting_text", fail)
+    name = semantic_index._fingerprint(unread)
+    assert semantic_index._FINGERPRINT_NAME.fullmatch(name)
+    small_catalog.fingerprint = "b" * 24
+    assert semantic_index._fingerprint(small_catalog) != name
+
+def test_in_memory_catalogs_are_named_by_content(vectors_model, small_catalog):
+    same = JobCatalog.from_jobs(small_catalog.posting(i) for i in range(len(small_catalog)))
+    assert semantic_index._fingerprint(same) == semantic_index._fingerprint(small_catalog)
+    fewer = JobCatalog.from_jobs(small_catalog.posting(i) for i in range(10))
+    assert semantic_index._fingerprint(fewer) != semantic_index._fingerprint(small_catalog)
+
+def test_reloaded_catalog_reuses_the_index_on_disk(vectors_model, small_catalog, monkeypatch):
+    small_catalog.fingerprint = "c" * 24
+    built = semantic_index.get_semantic_index(small_catalog)
+
+    reloaded = JobCatalog.from_jobs(small_catalog.posting(i) for i in range(len(small_catalog)))
+    reloaded.fingerprint = small_catalog.fingerprint
+
+    def fail(*args, **kwargs):
+        raise AssertionError("index rebuilt")
+
+    monkeypatch.setattr(semantic_index.SemanticIndex, "build", fail)
+    assert semantic_index.get_semantic_index(reloaded).path == built.path
+
+@pytest.mark.parametrize("filters", [None, {"remote": True}], ids=str)
+def test_exhaustive_search_matches_brute_force_cosine(vectors_model, small_catalog, filters):
+    allowed = filter_postings(small_catalog, filters)
+    got = rank_semantic(small_catalog, ["python", "sql"], 10, allowed)
+
+    vectors = semantic_index.embed_texts(
+        semantic_index.posting_text(small_catalog, p) for p in range(len(small_catalog))
+    )
+    scores = vectors @ semantic_index.embed_texts(["python sql"])[0]
+    ids = np.arange(len(small_catalog)) if allowed is None else allowed.ids
+    expected = sorted(ids.tolist(), key=lambda p: (-scores[p], p))[:10]
+    assert [p for p, _ in got] == expected
+    assert [s for _, s in got] == pytest.approx([float(scores[p]) for p in expected], abs=1e-5)
@@ -0,0 +1,60 @@
+"""The Aho-Corasick skill matcher against one word-bounded regex per pattern."""
+import random
+import re
+
+import pytest
+
+from mcp_tools.resume_parser import DEFAULT_SKILL_ALIASES, DEFAULT_SKILLS_DB
+from mcp_tools.skill_matcher import SkillMatcher, normalize_text
+
+def naive_find(text, skills, aliases):
+    patterns = {}
+    for skill in skills:
+        patterns.setdefault(normalize_text(skill).strip(), skill)
+    for alias, skill in aliases.items():
+        patterns.setdefault(normalize_text(alias).strip(), skill)
+    text = normalize_text(text)
+    found = set()
+    for pattern, skill in patterns.items():
+        # Like regex \b: a boundary only next to a word character.
+        before = r"(?<!\w)" if re.match(r"\w", pattern[0]) else ""
+        after = r"(?!\w)" if re.match(r"\w", pattern[-1]) else ""
+        if re.search(before + re.escape(pattern) + after, text):
+            found.add(skill)
+    return sorted(found)
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("JavaScript and Java", ["java", "javascript"]),
+        ("javascripting", []),
+        ("Modern C++17, cpp and ASP.NET", ["c++"]),
+        ("Data   Analytics\nwith MySQL", ["data analysis", "sql"]),
+        ("reactjs / React", ["react"]),
+        ("react.js", ["javascript", "react"]),
+        ("ml_ops, ML-ops", ["machine learning"]),
+    ],
+)
+def test_examples(text, expected):
+    matcher = SkillMatcher(DEFAULT_SKILLS_DB, DEFAULT_SKILL_ALIASES)
+    assert matcher.find(text) == expected
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_naive_matcher(seed):
+    rng = random.Random(seed)
+    # Overlapping patterns (prefixes, suffixes, shared words, symbols) are
+    # where failure links and boundary checks go wrong.
+    skills = list(DEFAULT_SKILLS_DB) + [
+        "go", "golang", "r", "c", "c#", ".net", "asp.net", "node.js", "node",
+        "sql server", "server", "data", "data science", "big data analysis",
+    ]
+    aliases = dict(DEFAULT_SKILL_ALIASES, **{"ms sql": "sql server", "dotnet": ".net"})
+    matcher = SkillMatcher(skills, aliases)
+    pieces = list({p for p in skills + list(aliases) for p in (p, p.upper(), p[:-1], p[1:])})
+    pieces += ["script", "ing", "x", "_", "17", "and", "the", "pro"]
+    separators = [" ", "  ", "\n", ",", ".", "-", "/", "_", "", "(", ")"]
+    for _ in range(300):
+        text = "".join(
+            rng.choice(pieces) + rng.choice(separators) for _ in range(rng.randint(1, 25))
+        )
+        assert matcher.find(text) == naive_find(text, skills, aliases), text
@@ -1,719 +1,331 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import gzip
+import hashlib
+import logging
 from pathlib import Path
 import os
-import shutil
-from typing import List
-import html
-
-from fastapi import FastAPI, UploadFile, File
-from fastapi.responses import HTMLResponse
-
-from mcp_tools.resume_parser import parse_resume as core_parse_resume
-from mcp_tools.job_recommender import recommend_jobs as core_recommend_jobs
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+try:
+    import brotli
+except ImportError:  # optional: static assets are then served gzip-only
+    brotli = None
+
+from mcp_tools.resume_parser import (
+    cache_parse,
+    get_cached_parse,
+    get_parse_cache_stats,
+    parse_resume_bytes as core_parse_resume_bytes,
+)
+from mcp_tools.job_recommender import (
+    get_catalog_stats,
+    get_result_cache_stats,
+    recommend_jobs as core_recommend_jobs,
+    start_catalog_reloader,
+    stop_catalog_reloader,
+)
+from mcp_tools.analysis_queue import AnalysisQueue, QueueFull
+from mcp_tools.metrics import (
+    HTTP_REQUEST_SECONDS,
+    METRICS_ENABLED,
+    collect_timings,
+    record_timings,
+    render_prometheus,
+    server_timing,
+    stage,
+    timed_call,
+)
+from mcp_tools.worker_pool import create_parse_executor, warm_up
+
+logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 UPLOAD_FOLDER = BASE_DIR / "uploads"
 UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
-
-app = FastAPI(title="Job Recommender")
+# Uploads are parsed straight from memory; set PERSIST_UPLOADS=1 to also keep
+# a copy in UPLOAD_FOLDER, named by content hash and written in the background.
+PERSIST_UPLOADS = os.getenv("PERSIST_UPLOADS", "0") == "1"
+
+WEB_DIR = Path(__file__).resolve().parent
+TEMPLATE_CACHE_DIR = Path(
+    os.getenv("TEMPLATE_CACHE_DIR", Path(tempfile.gettempdir()) / "job-recommender-jinja")
+)
+TEMPLATE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+class _Asset:
+    """A response body prepared once: ETag plus pre-compressed variants."""
+
+    def __init__(self, body: bytes, media_type: str) -> None:
+        self.body = body
+        self.media_type = media_type
+        self.version = hashlib.sha256(body).hexdigest()[:32]
+        self.etag = f'"{self.version}"'
+        self.encoded: Dict[str, bytes] = {"gzip": gzip.compress(body, compresslevel=9)}
+        if brotli is not None:
+            self.encoded["br"] = brotli.compress(body)
+
+def _asset_response(request: Request, asset: _Asset, cache_control: str) -> Response:
+    headers = {"ETag": asset.etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if asset.etag in [t.strip() for t in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+    accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+    # Highest q wins; on a tie, the order here (smallest body first).
+    candidates = [
+        (accepted.get(encoding, accepted.get("*", 0.0)), -rank, encoding)
+        for rank, encoding in enumerate(("br", "gzip"))
+        if encoding in asset.encoded
+    ]
+    q, _, encoding = max(candidates)
+    if q > 0:
+        headers["Content-Encoding"] = encoding
+        return Response(asset.encoded[encoding], media_type=asset.media_type, headers=headers)
+    return Response(asset.body, media_type=asset.media_type, headers=headers)
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    """Accept-Encoding as {coding: q}; ``q=0`` means the client refuses it."""
+    accepted: Dict[str, float] = {}
+    for item in header.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.lower()] = q
+    return accepted
+
+_STATIC_ASSETS: Dict[str, _Asset] = {
+    path.name: _Asset(path.read_bytes(), "text/css; charset=utf-8")
+    for path in (WEB_DIR / "static").glob("*.css")
+}
+
+def static_url(name: str) -> str:
+    return f"/static/{name}?v={_STATIC_ASSETS[name].version[:12]}"
+
+_templates = Environment(
+    loader=FileSystemLoader(str(WEB_DIR / "templates")),
+    autoescape=select_autoescape(["html"]),
+    bytecode_cache=FileSystemBytecodeCache(str(TEMPLATE_CACHE_DIR)),
+)
+_templates.globals["static_url"] = static_url
+_RESULTS_TEMPLATE = _templates.get_template("results.html")
+_HOME_PAGE = _Asset(
+    _templates.get_template("home.html").render().encode("utf-8"), "text/html; charset=utf-8"
+)
+
+# Parsing runs in PARSE_WORKERS warm processes, file I/O in IO_THREADS threads.
+# At most PARSE_MAX_CONCURRENCY parses run at once and PARSE_MAX_QUEUE more may
+# wait; anything beyond that is rejected with 503 instead of piling up.
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+PARSE_MAX_CONCURRENCY = int(os.getenv("PARSE_MAX_CONCURRENCY", str(max(1, PARSE_WORKERS))))
+PARSE_MAX_QUEUE = int(os.getenv("PARSE_MAX_QUEUE", "32"))
+IO_THREADS = int(os.getenv("IO_THREADS", "4"))
+# Background analysis queue behind /api/resumes.
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "2"))
+ANALYSIS_BATCH_SIZE = int(os.getenv("ANALYSIS_BATCH_SIZE", "8"))
+ANALYSIS_MAX_PENDING = int(os.getenv("ANALYSIS_MAX_PENDING", "256"))
+
+_parse_pool: Optional[Executor] = None
+_io_pool: Optional[Executor] = None
+_analysis_queue: Optional[AnalysisQueue] = None
+_parse_slots = asyncio.Semaphore(PARSE_MAX_CONCURRENCY)
+_pipeline_stats: Dict[str, int] = {"in_flight": 0, "waiting": 0, "completed": 0, "rejected": 0}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _parse_pool, _io_pool, _analysis_queue
+    _parse_pool = create_parse_executor(PARSE_WORKERS)
+    warm_up(_parse_pool, PARSE_WORKERS)
+    _io_pool = ThreadPoolExecutor(max_workers=IO_THREADS, thread_name_prefix="upload-io")
+    _analysis_queue = AnalysisQueue(
+        _parse_pool,
+        workers=ANALYSIS_WORKERS,
+        batch_size=ANALYSIS_BATCH_SIZE,
+        max_pending=ANALYSIS_MAX_PENDING,
+    )
+    _analysis_queue.start()
+    start_catalog_reloader()
+    try:
+        yield
+    finally:
+        stop_catalog_reloader()
+        _analysis_queue.stop()
+        _io_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+
+async def _run_parse(fn: Callable, *args: Any) -> Any:
+    if _pipeline_stats["in_flight"] + _pipeline_stats["waiting"] >= PARSE_MAX_CONCURRENCY + PARSE_MAX_QUEUE:
+        _pipeline_stats["rejected"] += 1
+        raise HTTPException(
+            status_code=503,
+            detail="Too many resumes are being analyzed, please retry shortly.",
+            headers={"Retry-After": "1"},
+        )
+    _pipeline_stats["waiting"] += 1
+    waiting = True
+    try:
+        async with _parse_slots:
+            _pipeline_stats["waiting"] -= 1
+            waiting = False
+            _pipeline_stats["in_flight"] += 1
+            try:
+                result, timings = await asyncio.get_running_loop().run_in_executor(
+                    _parse_pool, timed_call, fn, *args
+                )
+                record_timings(timings)
+            finally:
+                _pipeline_stats["in_flight"] -= 1
+            _pipeline_stats["completed"] += 1
+            return result
+    finally:
+        if waiting:
+            _pipeline_stats["waiting"] -= 1
+
+def _save_upload(data: bytes, ext: str) -> Path:
+    file_path = UPLOAD_FOLDER / f"{hashlib.sha256(data).hexdigest()}{ext}"
+    if file_path.exists():
+        return file_path
+    # Write then rename, so concurrent uploads of the same file never interleave.
+    with stage("disk_write"):
+        fd, tmp_path = tempfile.mkstemp(dir=UPLOAD_FOLDER, suffix=".part")
+        with os.fdopen(fd, "wb") as buffer:
+            buffer.write(data)
+        os.replace(tmp_path, file_path)
+    return file_path
+
+def _log_persist_failure(future: "asyncio.Future[Path]") -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Persisting upload failed", exc_info=future.exception())
+
+def _persist_upload(data: bytes, ext: str) -> None:
+    future = asyncio.get_running_loop().run_in_executor(_io_pool, _save_upload, data, ext)
+    future.add_done_callback(_log_persist_failure)
+
+app = FastAPI(title="Job Recommender", lifespan=lifespan)
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+if METRICS_ENABLED:
+    @app.middleware("http")
+    async def record_request_timings(request: Request, call_next):
+        started = time.perf_counter()
+        with collect_timings() as timings:
+            response = await call_next(request)
+        elapsed = time.perf_counter() - started
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        HTTP_REQUEST_SECONDS.observe(elapsed, request.method, route, str(response.status_code))
+        response.headers["Server-Timing"] = server_timing(timings, elapsed)
+        return response
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+@app.get("/stats")
+async def stats():
+    return {
+        "catalog": get_catalog_stats(),
+        "parse_cache": get_parse_cache_stats(),
+        "result_cache": get_result_cache_stats(),
+        "upload_pipeline": {
+            **_pipeline_stats,
+            "parse_workers": PARSE_WORKERS,
+            "max_concurrency": PARSE_MAX_CONCURRENCY,
+            "max_queue": PARSE_MAX_QUEUE,
+        },
+        "analysis_queue": _analysis_queue.stats() if _analysis_queue is not None else None,
+    }
+
+@app.post("/api/resumes", status_code=202)
+async def submit_resume(file: UploadFile = File(...)):
+    data = await file.read()
+    ext = os.path.splitext(file.filename or "")[1].lower()
+    try:
+        job_id = _analysis_queue.submit(data, ext, file.filename)
+    except QueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    if PERSIST_UPLOADS:
+        _persist_upload(data, ext)
+    return {"id": job_id, "status": "queued", "url": f"/api/resumes/{job_id}"}
+
+@app.get("/api/resumes/{job_id}")
+async def get_resume_analysis(job_id: str):
+    job = _analysis_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown resume analysis '{job_id}'")
+    return job
+
+@app.get("/static/{name}")
+async def static_asset(name: str, request: Request):
+    asset = _STATIC_ASSETS.get(name)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    # URLs carry the content hash (see static_url), so they can be cached forever.
+    return _asset_response(request, asset, "public, max-age=31536000, immutable")
 
 @app.get("/", response_class=HTMLResponse)
-async def home():
-    return """
-    <html lang="en">
-      <head>
-        <meta charset="utf-8" />
-        <title>Job Recommender</title>
-        <style>
-          :root {
-            --bg: #0b1120;
-            --bg-card: #020617;
-            --bg-soft: #111827;
-            --primary: #6366f1;
-            --primary-soft: rgba(99, 102, 241, 0.18);
-            --accent: #22c55e;
-            --text-main: #f9fafb;
-            --text-muted: #9ca3af;
-            --border-subtle: #1f2937;
-            --danger: #ef4444;
-            --radius-lg: 18px;
-            --radius-pill: 999px;
-          }
-
-          * {
-            box-sizing: border-box;
-          }
-
-          body {
-            margin: 0;
-            min-height: 100vh;
-            font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI",
-                         sans-serif;
-            background: radial-gradient(circle at top, #111827, #020617 55%, #000 100%);
-            color: var(--text-main);
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            padding: 24px;
-          }
-
-          .shell {
-            width: 100%;
-            max-width: 920px;
-          }
-
-          .card {
-            background: radial-gradient(circle at top left, #111827, #020617);
-            border-radius: 28px;
-            padding: 28px 32px 26px;
-            border: 1px solid rgba(148, 163, 184, 0.18);
-            box-shadow:
-              0 24px 80px rgba(15, 23, 42, 0.9),
-              0 0 0 1px rgba(15, 23, 42, 0.85);
-          }
-
-          .heading-row {
-            display: flex;
-            justify-content: space-between;
-            gap: 16px;
-            align-items: center;
-            margin-bottom: 20px;
-          }
-
-          .title-block h1 {
-            font-size: 1.6rem;
-            margin: 0 0 4px;
-            letter-spacing: 0.02em;
-          }
-
-          .title-block p {
-            margin: 0;
-            font-size: 0.9rem;
-            color: var(--text-muted);
-          }
-
-          .chip {
-            display: inline-flex;
-            align-items: center;
-            gap: 6px;
-            padding: 5px 11px;
-            border-radius: var(--radius-pill);
-            background: rgba(15, 23, 42, 0.85);
-            border: 1px solid rgba(148, 163, 184, 0.35);
-            font-size: 0.78rem;
-            color: var(--text-muted);
-            white-space: nowrap;
-          }
-
-          .chip-dot {
-            width: 7px;
-            height: 7px;
-            border-radius: 999px;
-            background: var(--accent);
-            box-shadow: 0 0 0 5px rgba(34, 197, 94, 0.25);
-          }
-
-          .upload-zone {
-            margin-top: 18px;
-            padding: 18px 18px 16px;
-            border-radius: 20px;
-            border: 1px dashed rgba(148, 163, 184, 0.5);
-            background: linear-gradient(
-              120deg,
-              rgba(15, 23, 42, 0.9),
-              rgba(15, 23, 42, 0.96)
-            );
-          }
-
-          .upload-row {
-            display: flex;
-            flex-wrap: wrap;
-            gap: 16px;
-            align-items: center;
-            justify-content: space-between;
-          }
-
-          .upload-info {
-            flex: 1 1 220px;
-          }
-
-          .upload-info h2 {
-            margin: 0 0 6px;
-            font-size: 1rem;
-          }
-
-          .upload-info p {
-            margin: 0;
-            font-size: 0.8rem;
-            color: var(--text-muted);
-          }
-
-          .upload-controls {
-            display: flex;
-            flex-wrap: wrap;
-            gap: 10px;
-            justify-content: flex-end;
-            align-items: center;
-          }
-
-          .file-input-wrapper {
-            position: relative;
-            overflow: hidden;
-            border-radius: var(--radius-pill);
-            border: 1px solid rgba(148, 163, 184, 0.4);
-            padding: 6px 10px;
-            font-size: 0.82rem;
-            background: rgba(15, 23, 42, 0.9);
-            cursor: pointer;
-            display: inline-flex;
-            align-items: center;
-            gap: 8px;
-          }
-
-          .file-input-wrapper span.label-text {
-            opacity: 0.9;
-          }
-
-          .file-input-wrapper input[type="file"] {
-            position: absolute;
-            inset: 0;
-            opacity: 0;
-            cursor: pointer;
-          }
-
-          .file-name {
-            font-size: 0.78rem;
-            color: var(--text-muted);
-            max-width: 220px;
-            white-space: nowrap;
-            text-overflow: ellipsis;
-            overflow: hidden;
-          }
-
-          .btn-primary {
-            border: none;
-            border-radius: var(--radius-pill);
-            padding: 9px 18px;
-            font-size: 0.86rem;
-            font-weight: 500;
-            letter-spacing: 0.02em;
-            background: linear-gradient(135deg, #6366f1, #22c55e);
-            color: #0b1120;
-            cursor: pointer;
-            box-shadow: 0 10px 30px rgba(79, 70, 229, 0.45);
-            display: inline-flex;
-            align-items: center;
-            gap: 6px;
-          }
-
-          .btn-primary:hover {
-            filter: brightness(1.04);
-          }
-
-          .btn-primary:active {
-            transform: translateY(1px);
-            box-shadow: 0 5px 16px rgba(79, 70, 229, 0.6);
-          }
-
-          .btn-primary span.dot {
-            width: 7px;
-            height: 7px;
-            border-radius: 999px;
-            background: #0b1120;
-          }
-
-          .helper-row {
-            margin-top: 12px;
-            display: flex;
-            justify-content: space-between;
-            font-size: 0.78rem;
-            color: var(--text-muted);
-            opacity: 0.9;
-          }
-
-          .helper-row span {
-            display: inline-flex;
-            align-items: center;
-            gap: 6px;
-          }
-
-          .helper-row .pill-soft {
-            padding: 3px 9px;
-            border-radius: var(--radius-pill);
-            background: rgba(15, 23, 42, 0.9);
-            border: 1px solid rgba(148, 163, 184, 0.3);
-            font-size: 0.74rem;
-          }
-
-          @media (max-width: 640px) {
-            .card {
-              padding: 20px 18px 18px;
-            }
-            .heading-row {
-              flex-direction: column;
-              align-items: flex-start;
-            }
-            .upload-row {
-              flex-direction: column;
-              align-items: flex-start;
-            }
-            .upload-controls {
-              justify-content: flex-start;
-            }
-          }
-        </style>
-      </head>
-      <body>
-        <div class="shell">
-          <div class="card">
-            <div class="heading-row">
-              <div class="title-block">
-                <h1>Job Recommender</h1>
-                <p>Upload a resume (PDF) and get skill-based job matches.</p>
-              </div>
-              <div class="chip">
-                <span class="chip-dot"></span>
-                MCP-ready · FastAPI
-              </div>
-            </div>
-
-            <form action="/upload_resume/" enctype="multipart/form-data" method="post">
-              <div class="upload-zone">
-                <div class="upload-row">
-                  <div class="upload-info">
-                    <h2>Upload your resume</h2>
-                    <p>We’ll extract skills and recommend matching roles.</p>
-                  </div>
-                  <div class="upload-controls">
-                    <label class="file-input-wrapper">
-                      <span class="label-text">Choose file (PDF)</span>
-                      <span id="file-name" class="file-name"></span>
-                      <input name="file" type="file" accept=".pdf" required />
-                    </label>
-                    <button type="submit" class="btn-primary">
-                      <span class="dot"></span>
-                      <span>Analyze & Recommend</span>
-                    </button>
-                  </div>
-                </div>
-                <div class="helper-row">
-                  <span>
-                    Supported: <span class="pill-soft">PDF</span>
-                  </span>
-                </div>
-              </div>
-            </form>
-          </div>
-        </div>
-
-        <script>
-          document.addEventListener("DOMContentLoaded", function () {{
-            const fileInput = document.querySelector('input[name="file"]');
-            const fileNameSpan = document.getElementById("file-name");
-
-            if (fileInput && fileNameSpan) {{
-              fileInput.addEventListener("change", function () {{
-                if (fileInput.files && fileInput.files.length > 0) {{
-                  fileNameSpan.textContent = fileInput.files[0].name;
-                }} else {{
-                  fileNameSpan.textContent = "";
-                }}
-              }});
-            }}
-          }});
-        </script>
-      </body>
-    </html>
-    """
+async def home(request: Request):
+    return _asset_response(request, _HOME_PAGE, "no-cache")
 
 @app.post("/upload_resume/", response_class=HTMLResponse)
-async def upload_resume(file: UploadFile = File(...)):
-    file_path = UPLOAD_FOLDER / file.filename
-    with file_path.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    parsed = core_parse_resume(str(file_path))
+async def upload_resume(
+    file: UploadFile = File(...),
+    location: Optional[str] = Form(None),
+    title_keyword: Optional[str] = Form(None),
+    remote: bool = Form(False),
+):
+    with stage("upload_read"):
+        data = await file.read()
+    ext = os.path.splitext(file.filename or "")[1].lower()
+    # The parse cache lives here, not in the workers (see get_cached_parse).
+    with stage("parse_cache"):
+        parsed = await run_in_threadpool(get_cached_parse, data, ext, file.filename)
+    if parsed is None:
+        try:
+            parsed = await _run_parse(core_parse_resume_bytes, data, ext, file.filename, False)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        await run_in_threadpool(cache_parse, data, ext, parsed)
+    if PERSIST_UPLOADS:
+        _persist_upload(data, ext)
     skills: List[str] = parsed.get("skills", [])
-    jobs = core_recommend_jobs(skills, top_k=5)
-
-    emails = parsed.get("emails", [])
-    phones = parsed.get("phones", [])
-    summary = parsed.get("summary", {}) or {}
-    num_chars = summary.get("num_chars", 0)
-    num_tokens = summary.get("num_tokens", 0)
-
-    def pills(items, extra_class: str = "") -> str:
-        if not items:
-            return f"<span class='muted'>None detected</span>"
-        return "".join(
-            f"<span class='pill {extra_class}'>{html.escape(str(x))}</span>"
-            for x in items
-        )
-
-    emails_html = pills(emails)
-    phones_html = pills(phones)
-    skills_html = pills(skills, "pill-soft")
-
-    job_cards = []
+    filters = {"location": location, "title_keyword": title_keyword}
+    if remote:
+        filters["remote"] = True
+    jobs = await run_in_threadpool(
+        core_recommend_jobs, skills, top_k=5, text=parsed.get("raw_text"), filters=filters
+    )
+
+    job_views = []
     for job in jobs:
-        title = html.escape(str(job.get("title", "Untitled role")))
-        location = html.escape(str(job.get("location", "N/A")))
-        description = html.escape(str(job.get("description", "")))
-        job_skills = [str(s) for s in job.get("skills", [])]
         match_score = int(job.get("match_score", 0))
-        bar_width = min(100, match_score * 25)
-
-        job_skills_html = (
-            "".join(
-                f"<span class='pill pill-soft'>{html.escape(s)}</span>"
-                for s in job_skills
-            )
-            if job_skills
-            else "<span class='muted'>No specific skills listed</span>"
-        )
-
-        job_cards.append(
-            f"""
-            <div class="job-card">
-              <div class="job-header">
-                <div>
-                  <h3>{title}</h3>
-                  <p class="job-location">{location}</p>
-                </div>
-                <div class="match-score">
-                  <span>Match score: {match_score}</span>
-                  <div class="bar-outer">
-                    <div class="bar-inner" style="width: {bar_width}%;"></div>
-                  </div>
-                </div>
-              </div>
-              <p class="job-description">{description}</p>
-              <div class="job-skills">
-                {job_skills_html}
-              </div>
-            </div>
-            """
+        job_views.append({
+            "title": job.get("title", "Untitled role"),
+            "location": job.get("location", "N/A"),
+            "description": job.get("description", ""),
+            "skills": [str(s) for s in job.get("skills", [])],
+            "match_score": match_score,
+            "bar_width": min(100, match_score * 25),
+        })
+
+    with stage("render"):
+        return _RESULTS_TEMPLATE.render(
+            emails=parsed.get("emails", []),
+            phones=parsed.get("phones", []),
+            skills=skills,
+            jobs=job_views,
         )
-
-    jobs_html = "".join(job_cards) if job_cards else "<p class='muted'>No jobs matched.</p>"
-
-    return f"""
-    <html lang="en">
-      <head>
-        <meta charset="utf-8" />
-        <title>Results · Job Recommender</title>
-        <style>
-          :root {{
-            --bg: #020617;
-            --bg-card: #020617;
-            --bg-soft: #020617;
-            --primary: #6366f1;
-            --accent: #22c55e;
-            --text-main: #f9fafb;
-            --text-muted: #9ca3af;
-            --border-subtle: #1f2937;
-            --radius-lg: 18px;
-            --radius-pill: 999px;
-          }}
-
-          * {{
-            box-sizing: border-box;
-          }}
-
-          body {{
-            margin: 0;
-            min-height: 100vh;
-            font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI",
-                         sans-serif;
-            background: radial-gradient(circle at top, #111827, #020617 55%, #000 100%);
-            color: var(--text-main);
-            display: flex;
-            align-items: flex-start;
-            justify-content: center;
-            padding: 24px;
-          }}
-
-          .shell {{
-            width: 100%;
-            max-width: 1120px;
-          }}
-
-          .header-row {{
-            display: flex;
-            justify-content: space-between;
-            gap: 16px;
-            align-items: center;
-            margin-bottom: 18px;
-          }}
-
-          .header-row h1 {{
-            margin: 0;
-            font-size: 1.5rem;
-          }}
-
-          .header-row p {{
-            margin: 4px 0 0;
-            font-size: 0.86rem;
-            color: var(--text-muted);
-          }}
-
-          .back-link {{
-            font-size: 0.82rem;
-            text-decoration: none;
-            color: var(--text-muted);
-            padding: 6px 11px;
-            border-radius: var(--radius-pill);
-            border: 1px solid rgba(148, 163, 184, 0.5);
-            background: rgba(15, 23, 42, 0.9);
-          }}
-
-          .back-link:hover {{
-            color: var(--text-main);
-            border-color: rgba(148, 163, 184, 0.8);
-          }}
-
-          .layout {{
-            display: grid;
-            grid-template-columns: minmax(0, 0.9fr) minmax(0, 1.1fr);
-            gap: 18px;
-          }}
-
-          .panel {{
-            background: radial-gradient(circle at top left, #111827, #020617);
-            border-radius: 24px;
-            border: 1px solid rgba(148, 163, 184, 0.18);
-            padding: 18px 18px 16px;
-            box-shadow:
-              0 20px 70px rgba(15, 23, 42, 0.9),
-              0 0 0 1px rgba(15, 23, 42, 0.85);
-          }}
-
-          .panel-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 10px;
-          }}
-
-          .panel-header h2 {{
-            margin: 0;
-            font-size: 1rem;
-          }}
-
-          .panel-header span {{
-            font-size: 0.76rem;
-            color: var(--text-muted);
-          }}
-
-          .grid-two {{
-            display: grid;
-            grid-template-columns: repeat(2, minmax(0, 1fr));
-            gap: 10px;
-            margin-top: 4px;
-          }}
-
-          .field {{
-            padding: 9px 10px;
-            border-radius: 14px;
-            background: rgba(15, 23, 42, 0.96);
-            border: 1px solid rgba(148, 163, 184, 0.2);
-          }}
-
-          .field-label {{
-            font-size: 0.75rem;
-            text-transform: uppercase;
-            letter-spacing: 0.05em;
-            color: var(--text-muted);
-            margin-bottom: 3px;
-            display: block;
-          }}
-
-          .field-value {{
-            font-size: 0.85rem;
-          }}
-
-          .pill {{
-            display: inline-flex;
-            align-items: center;
-            padding: 3px 10px;
-            border-radius: var(--radius-pill);
-            background: rgba(15, 23, 42, 0.98);
-            border: 1px solid rgba(148, 163, 184, 0.45);
-            font-size: 0.78rem;
-            margin: 2px 4px 2px 0;
-            white-space: nowrap;
-          }}
-
-          .pill-soft {{
-            border-color: rgba(79, 70, 229, 0.6);
-            background: rgba(15, 23, 42, 0.95);
-          }}
-
-          .muted {{
-            font-size: 0.8rem;
-            color: var(--text-muted);
-          }}
-
-          .metrics-row {{
-            display: flex;
-            gap: 10px;
-            margin-top: 10px;
-          }}
-
-          .metric-pill {{
-            flex: 1;
-            padding: 7px 10px;
-            border-radius: 16px;
-            border: 1px solid rgba(148, 163, 184, 0.35);
-            background: rgba(15, 23, 42, 0.96);
-            font-size: 0.78rem;
-            display: flex;
-            justify-content: space-between;
-          }}
-
-          .metric-label {{
-            color: var(--text-muted);
-          }}
-
-          .metric-value {{
-            font-variant-numeric: tabular-nums;
-          }}
-
-          .job-card {{
-            border-radius: 18px;
-            border: 1px solid rgba(148, 163, 184, 0.28);
-            padding: 12px 13px 11px;
-            background: rgba(15, 23, 42, 0.96);
-            margin-bottom: 10px;
-          }}
-
-          .job-header {{
-            display: flex;
-            justify-content: space-between;
-            gap: 8px;
-            align-items: flex-start;
-            margin-bottom: 6px;
-          }}
-
-          .job-header h3 {{
-            margin: 0;
-            font-size: 0.98rem;
-          }}
-
-          .job-location {{
-            margin: 2px 0 0;
-            font-size: 0.8rem;
-            color: var(--text-muted);
-          }}
-
-          .match-score {{
-            font-size: 0.78rem;
-            text-align: right;
-          }}
-
-          .bar-outer {{
-            width: 120px;
-            height: 6px;
-            border-radius: 999px;
-            background: rgba(30, 64, 175, 0.3);
-            overflow: hidden;
-            margin-top: 4px;
-          }}
-
-          .bar-inner {{
-            height: 100%;
-            border-radius: inherit;
-            background: linear-gradient(90deg, #6366f1, #22c55e);
-          }}
-
-          .job-description {{
-            margin: 0 0 6px;
-            font-size: 0.82rem;
-            color: var(--text-muted);
-          }}
-
-          .job-skills {{
-            margin-top: 2px;
-          }}
-
-          .footer-row {{
-            margin-top: 12px;
-            display: flex;
-            justify-content: space-between;
-            font-size: 0.75rem;
-            color: var(--text-muted);
-          }}
-
-          @media (max-width: 860px) {{
-            .layout {{
-              grid-template-columns: minmax(0, 1fr);
-            }}
-          }}
-
-          @media (max-width: 640px) {{
-            body {{
-              padding: 18px 12px;
-            }}
-            .panel {{
-              padding: 16px 14px 14px;
-            }}
-            .header-row {{
-              flex-direction: column;
-              align-items: flex-start;
-              gap: 8px;
-            }}
-          }}
-        </style>
-      </head>
-      <body>
-        <div class="shell">
-          <div class="header-row">
-            <div>
-              <h1>Resume analysis report</h1>
-              <p>Skill-based job recommendations below.</p>
-            </div>
-            <a class="back-link" href="/">← Upload another resume</a>
-          </div>
-
-          <div class="layout">
-            <!-- Left: Candidate snapshot -->
-            <section class="panel">
-              <div class="panel-header">
-                <h2>Candidate snapshot</h2>
-                <span>Extracted contact & skill profile</span>
-              </div>
-
-              <div class="grid-two">
-                <div class="field">
-                  <span class="field-label">Emails</span>
-                  <div class="field-value">{emails_html}</div>
-                </div>
-                <div class="field">
-                  <span class="field-label">Phones</span>
-                  <div class="field-value">{phones_html}</div>
-                </div>
-              </div>
-
-              <div class="field" style="margin-top:10px;">
-                <span class="field-label">Skills detected</span>
-                <div class="field-value">{skills_html}</div>
-              </div>
-            </section>
-
-            <!-- Right: Job recommendations -->
-            <section class="panel">
-              <div class="panel-header">
-                <h2>Job recommendations</h2>
-                <span>Ranked by skill overlap & match score</span>
-              </div>
-              {jobs_html}
-            </section>
-          </div>
-
-          <div class="footer-row">
-            <span>Local processing only · spaCy + rule-based skill extraction</span>
-            <span>This is a prototype; do not use for automated hiring decisions.</span>
-          </div>
-        </div>
-      </body>
-    </html>
-    """  
\ No newline at end of file